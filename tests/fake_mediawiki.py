@@ -0,0 +1,140 @@
+'''
+a local stand-in for the MediaWiki action API to test bulk requests without a wiki
+'''
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeMediaWiki(object):
+    """
+    serves a minimal subset of the MediaWiki action API (formatversion=2) for the given pages
+    """
+
+    LOGIN_TOKEN="login+\\"
+    CSRF_TOKEN="csrf+\\"
+
+    def __init__(self, pages:dict=None, failures:dict=None, users:dict=None, editDelay:float=0.0):
+        """
+        constructor
+
+        Args:
+            pages(dict): wikiText by pageTitle
+            failures(dict): number of edits of a page that fail with a maxlag error by pageTitle
+            users(dict): passwords by user name - if given edits need a login
+            editDelay(float): seconds each edit takes
+        """
+        self.pages=pages if pages is not None else {}
+        self.failures=failures if failures is not None else {}
+        self.users=users
+        self.editDelay=editDelay
+        self.requests=[]
+        self.edits={}
+        self.loggedIn=False
+        self.lock=threading.Lock()
+        self.activeEdits=0
+        self.maxActiveEdits=0
+        fakeWiki=self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_POST(self):
+                length=int(self.headers.get("Content-Length", 0))
+                params={key:values[0] for key, values in parse_qs(self.rfile.read(length).decode()).items()}
+                self.reply(params)
+
+            def do_GET(self):
+                params={key:values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+                self.reply(params)
+
+            def reply(self, params:dict):
+                fakeWiki.requests.append(params)
+                result=fakeWiki.handle(params)
+                body=json.dumps(result).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server=ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.apiUrl=f"http://127.0.0.1:{self.server.server_port}/api.php"
+        self.thread=threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @staticmethod
+    def normalize(pageTitle:str) -> str:
+        title=pageTitle.replace("_", " ").strip()
+        return title[:1].upper()+title[1:]
+
+    def handle(self, params:dict) -> dict:
+        """
+        handle the api request with the given parameters
+        """
+        if params.get("action") == "query" and params.get("prop") == "revisions":
+            titles=params.get("titles", "").split("|")
+            if len(titles) > 50:
+                return {"error":{"code":"toomanyvalues", "info":"Too many values supplied for parameter \"titles\""}}
+            normalized=[]
+            pages=[]
+            for title in titles:
+                normalizedTitle=FakeMediaWiki.normalize(title)
+                if normalizedTitle != title:
+                    normalized.append({"fromencoded":False, "from":title, "to":normalizedTitle})
+                if normalizedTitle in self.pages:
+                    pages.append({"ns":0, "title":normalizedTitle, "revisions":[{"slots":{"main":{"contentmodel":"wikitext", "content":self.pages[normalizedTitle]}}}]})
+                else:
+                    pages.append({"ns":0, "title":normalizedTitle, "missing":True})
+            query={"pages":pages}
+            if normalized:
+                query["normalized"]=normalized
+            return {"batchcomplete":True, "query":query}
+        if params.get("action") == "query" and params.get("meta") == "tokens":
+            tokenType=params.get("type", "csrf")
+            return {"batchcomplete":True, "query":{"tokens":{f"{tokenType}token":self.LOGIN_TOKEN if tokenType == "login" else self.CSRF_TOKEN}}}
+        if params.get("action") == "login":
+            if params.get("lgtoken") != self.LOGIN_TOKEN:
+                return {"login":{"result":"WrongToken"}}
+            if self.users is None or self.users.get(params.get("lgname")) != params.get("lgpassword"):
+                return {"login":{"result":"Failed", "reason":"Incorrect username or password entered."}}
+            self.loggedIn=True
+            return {"login":{"result":"Success", "lgusername":params.get("lgname")}}
+        if params.get("action") == "edit":
+            return self.edit(params)
+        return {"error":{"code":"badvalue", "info":f"unsupported request {params}"}}
+
+    def edit(self, params:dict) -> dict:
+        """
+        handle an edit request
+        """
+        if params.get("token") != self.CSRF_TOKEN:
+            return {"error":{"code":"badtoken", "info":"Invalid CSRF token."}}
+        if self.users is not None and not self.loggedIn:
+            return {"error":{"code":"permissiondenied", "info":"You do not have permission to edit this page."}}
+        title=FakeMediaWiki.normalize(params.get("title", ""))
+        with self.lock:
+            self.activeEdits+=1
+            self.maxActiveEdits=max(self.maxActiveEdits, self.activeEdits)
+            failures=self.failures.get(title, 0)
+            if failures > 0:
+                self.failures[title]=failures-1
+        time.sleep(self.editDelay)
+        with self.lock:
+            self.activeEdits-=1
+        if failures > 0:
+            return {"error":{"code":"maxlag", "info":"Waiting for a database server"}}
+        self.pages[title]=params.get("text")
+        self.edits[title]=(params.get("text"), params.get("summary"))
+        return {"edit":{"result":"Success", "title":title}}
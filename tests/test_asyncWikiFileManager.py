@@ -0,0 +1,138 @@
+import asyncio
+import tempfile
+import unittest
+import warnings
+
+from tests.fake_mediawiki import FakeMediaWiki
+from wikifile.asyncWikiFileManager import AsyncWikiFileManager, AsyncMediaWikiApi
+from wikifile.wikiFile import WikiFile
+
+
+class TestAsyncWikiFileManager(unittest.TestCase):
+    """
+    test the asyncio wiki client layer against a local stand-in of the MediaWiki api
+    """
+
+    def setUp(self):
+        self.pages={f"Event {i}":f"{{{{Event|Acronym=E{i}}}}}" for i in range(120)}
+
+    def testGetWikiFiles(self):
+        '''
+        test retrieving the pages from the backup and concurrently from the wiki
+        '''
+        async def getWikiFiles(apiUrl:str, wikiTextPath:str) -> dict:
+            async with AsyncWikiFileManager(apiUrl, wikiTextPath=wikiTextPath) as wikiFileManager:
+                wikiFiles=await wikiFileManager.getWikiFiles(list(self.pages.keys())+["Not existing page"])
+                self.assertEqual(3, wikiFileManager.sourceApi.requestCount)
+                wikiFile=await wikiFileManager.getWikiFile("Event 5", checkWiki=False)
+                self.assertEqual("", wikiFile.wikiText)
+                return wikiFiles
+
+        with tempfile.TemporaryDirectory() as wikiTextPath, FakeMediaWiki(self.pages) as fakeWiki:
+            WikiFile.write_to_file(wikiTextPath, "Event 0", "{{Event|Acronym=Backup}}", overwrite=True)
+            wikiFiles=asyncio.run(getWikiFiles(fakeWiki.apiUrl, wikiTextPath))
+        self.assertEqual(121, len(wikiFiles))
+        self.assertEqual([{"Acronym":"Backup"}], wikiFiles["Event 0"].extractTemplate("Event"))
+        self.assertEqual([{"Acronym":"E99"}], wikiFiles["Event 99"].extractTemplate("Event"))
+        self.assertEqual("", wikiFiles["Not existing page"].wikiText)
+        self.assertFalse(wikiFiles["Event 99"].isModified())
+
+    def testPushWikiFiles(self):
+        '''
+        test pushing pages concurrently with retries of failed edits
+        '''
+        async def push(apiUrl:str) -> list:
+            async with AsyncWikiFileManager(apiUrl) as wikiFileManager:
+                await wikiFileManager.login("Bot", "secret")
+                wikiFiles=list((await wikiFileManager.getWikiFilesFromWiki([f"Event {i}" for i in range(20)])).values())
+                for wikiFile in wikiFiles[:10]:
+                    wikiFile.updateTemplate("Event", {"year":"2022"}, overwrite=True)
+                return await wikiFileManager.pushWikiFilesToWiki(wikiFiles, "set year", concurrency=4, retries=2, backoff=0.01)
+
+        failures={"Event 1":2, "Event 2":5}
+        with FakeMediaWiki(self.pages, failures=failures, users={"Bot":"secret"}, editDelay=0.02) as fakeWiki:
+            with warnings.catch_warnings(record=True) as caughtWarnings:
+                warnings.simplefilter("always")
+                report=asyncio.run(push(fakeWiki.apiUrl))
+        results={result["pageTitle"]:result for result in report}
+        self.assertEqual([f"Event {i}" for i in range(20)], [result["pageTitle"] for result in report])
+        self.assertEqual("skipped", results["Event 15"]["status"])
+        self.assertEqual(("success", 3), (results["Event 1"]["status"], results["Event 1"]["attempts"]))
+        self.assertEqual(("failed", 3), (results["Event 2"]["status"], results["Event 2"]["attempts"]))
+        self.assertIn("maxlag", results["Event 2"]["error"])
+        self.assertEqual(9, len(fakeWiki.edits))
+        self.assertEqual("set year", fakeWiki.edits["Event 3"][1])
+        self.assertIn("year=2022", fakeWiki.pages["Event 3"])
+        self.assertTrue(1 < fakeWiki.maxActiveEdits <= 4)
+        self.assertEqual(1, len(caughtWarnings))
+
+    def testPushWithoutPermission(self):
+        '''
+        test that edits failing with a permanent error are not retried
+        '''
+        async def push(apiUrl:str) -> list:
+            async with AsyncWikiFileManager(apiUrl) as wikiFileManager:
+                wikiFile=WikiFile("Event 1", wikiText="{{Event|Acronym=changed}}")
+                return await wikiFileManager.pushWikiFilesToWiki([wikiFile], "no login", retries=3, backoff=0.01)
+
+        with FakeMediaWiki(self.pages, users={"Bot":"secret"}) as fakeWiki:
+            with warnings.catch_warnings(record=True):
+                warnings.simplefilter("always")
+                report=asyncio.run(push(fakeWiki.apiUrl))
+        self.assertEqual(("failed", 1), (report[0]["status"], report[0]["attempts"]))
+        self.assertIn("permissiondenied", report[0]["error"])
+        self.assertEqual({}, fakeWiki.edits)
+
+    def testUpdatePageWikiSON(self):
+        '''
+        test updating a WikiSON entity of a page
+        '''
+        async def update(apiUrl:str) -> dict:
+            async with AsyncMediaWikiApi(apiUrl) as api:
+                with self.assertRaises(Exception):
+                    await api.login("Bot", "wrong")
+            async with AsyncWikiFileManager(apiUrl) as wikiFileManager:
+                await wikiFileManager.login("Bot", "secret")
+                return await wikiFileManager.updatePageWikiSON("Event 7", "Event", {"City":"Aachen"}, updateMsg="add city")
+
+        with FakeMediaWiki(self.pages, users={"Bot":"secret"}) as fakeWiki:
+            result=asyncio.run(update(fakeWiki.apiUrl))
+        self.assertEqual("success", result["status"])
+        wikiFile=WikiFile("Event 7", wikiText=fakeWiki.pages["Event 7"])
+        self.assertEqual([{"Acronym":"E7", "City":"Aachen"}], wikiFile.extractTemplate("Event"))
+
+    def testUpdatePageWikiSONCreate(self):
+        '''
+        test creating a WikiSON entity on a missing page and skipping an update that does not change the page
+        '''
+        async def update(apiUrl:str) -> list:
+            async with AsyncWikiFileManager(apiUrl) as wikiFileManager:
+                await wikiFileManager.login("Bot", "secret")
+                created=await wikiFileManager.updatePageWikiSON("Event 1000", "Event", {"Acronym":"E1000"})
+                # deleting a property the entity does not have leaves the page unchanged
+                unchanged=await wikiFileManager.updatePageWikiSON("Event 1000", "Event", {"City":None})
+                return [created, unchanged]
+
+        with FakeMediaWiki(self.pages, users={"Bot":"secret"}) as fakeWiki:
+            created, unchanged=asyncio.run(update(fakeWiki.apiUrl))
+        self.assertEqual("success", created["status"])
+        self.assertEqual("skipped", unchanged["status"])
+        self.assertEqual(["Event 1000"], list(fakeWiki.edits.keys()))
+        wikiFile=WikiFile("Event 1000", wikiText=fakeWiki.pages["Event 1000"])
+        self.assertEqual([{"Acronym":"E1000"}], wikiFile.extractTemplate("Event"))
+
+    def testWithoutSourceWiki(self):
+        '''
+        test that retrieving pages without a source wiki fails with a clear error
+        '''
+        async def getWikiFiles() -> dict:
+            async with AsyncWikiFileManager(wikiTextPath=None) as wikiFileManager:
+                return await wikiFileManager.getWikiFilesFromWiki(["Event 1"])
+
+        with self.assertRaises(Exception) as context:
+            asyncio.run(getWikiFiles())
+        self.assertIn("no source wiki", str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from wikifile.benchmark import Benchmark, main
+from wikifile.syntheticWiki import SyntheticWiki
+
+
+class TestBenchmark(unittest.TestCase):
+    """
+    test the benchmark suite
+    """
+
+    def testRun(self):
+        '''
+        test running the benchmark stages
+        '''
+        stdout=StringIO()
+        with redirect_stdout(stdout):
+            results=main(["--pages", "20", "--topics", "2"])
+        self.assertEqual(["generateBackup"]+Benchmark.STAGES, [result["stage"] for result in results])
+        self.assertEqual(20, results[1]["items"])
+        # 6 pages and the property pages of each topic
+        self.assertEqual(2*6+2*6, results[-1]["items"])
+        self.assertIn("items/s", stdout.getvalue())
+        benchmark=Benchmark(SyntheticWiki(pages=1))
+        self.assertEqual("Entity0", benchmark.templateName)
+        with self.assertRaises(Exception):
+            benchmark.run(["unknown"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import csv
+import importlib.util
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from wikifile.columnarTable import ColumnarTable
+from wikifile.wikiExtract import WikiExtract
+from wikifile.wikiFile import WikiFile
+from wikifile.wikiFileManager import WikiFileManager
+
+
+class TestColumnarTable(unittest.TestCase):
+    """
+    test the columnar export of WikiSon entities
+    """
+
+    def setUp(self):
+        self.tempDir=tempfile.TemporaryDirectory()
+        self.wikiTextPath=self.tempDir.name
+        self.pageTitles=[]
+        for i in range(10):
+            pageTitle=f"Event {i}"
+            wikiText=f"{{{{Event|Acronym=E{i}|ordinal={i}}}}}"
+            if i % 3 == 0:
+                wikiText=f"{{{{Event|Acronym=E{i}|City=Aachen}}}}"
+            WikiFile.write_to_file(self.wikiTextPath, pageTitle, wikiText, overwrite=True)
+            self.pageTitles.append(pageTitle)
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def testAddRecord(self):
+        '''
+        test that missing values are filled in the columns
+        '''
+        table=ColumnarTable(["name"])
+        table.addRecord({"name":"a", "x":1})
+        table.addRecord({"y":2})
+        self.assertEqual(2, len(table))
+        self.assertEqual(["name", "x", "y"], table.getColumnNames())
+        self.assertEqual(["a", None], table.getColumn("name"))
+        self.assertEqual([None, 2], table.getColumn("y"))
+        self.assertEqual([{"name":"a", "x":1, "y":None}, {"name":None, "x":None, "y":2}], list(table.getRecords()))
+        limitedTable=ColumnarTable(["name"], limitColumns=True)
+        limitedTable.addRecord({"name":"a", "x":1})
+        self.assertEqual(["name"], limitedTable.getColumnNames())
+
+    def testExportWikiSonToColumns(self):
+        '''
+        test that the columnar export contains the same records as the LoD export
+        '''
+        wikiFileManager=WikiFileManager(sourceWikiId=None, wikiTextPath=self.wikiTextPath, login=False)
+        table=wikiFileManager.exportWikiSonToColumns(self.pageTitles, "Event", properties=["Acronym"])
+        lod=wikiFileManager.exportWikiSonToLOD(self.pageTitles, "Event", properties=["Acronym"])
+        self.assertEqual(lod, list(table.getRecords()))
+        self.assertEqual("Acronym", table.getColumnNames()[0])
+        table=wikiFileManager.exportWikiSonToColumns(self.pageTitles, "Event", properties=["Acronym"], limitProperties=True)
+        self.assertEqual(["Acronym", "pageTitle"], table.getColumnNames())
+
+    def testWrite(self):
+        '''
+        test writing the table as csv and json file with the command line
+        '''
+        with tempfile.TemporaryDirectory() as outputPath:
+            for extension in ["csv", "json"]:
+                with redirect_stdout(StringIO()):
+                    WikiExtract().maininstance(["-s", "test", "-m", "extract", "-t", "Event", "--wikiTextPath", self.wikiTextPath, "-id", "pageTitle", "--columnar", f"{outputPath}/events.{extension}"])
+            with open(f"{outputPath}/events.csv", newline="") as file:
+                rows=list(csv.reader(file))
+            self.assertEqual(11, len(rows))
+            self.assertEqual(["Acronym", "City", "ordinal", "pageTitle"], sorted(rows[0]))
+            with open(f"{outputPath}/events.json") as file:
+                columnarJson=json.load(file)
+            self.assertEqual(10, columnarJson["rowCount"])
+            self.assertEqual(4, columnarJson["columns"]["City"].count("Aachen"))
+            with self.assertRaises(Exception):
+                ColumnarTable().write(f"{outputPath}/events.xlsx")
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def testParquet(self):
+        '''
+        test writing the table as parquet file
+        '''
+        import pyarrow.parquet
+        table=WikiExtract.extract_columns("Event", self.pageTitles, self.wikiTextPath, add_file_name="pageTitle")
+        with tempfile.TemporaryDirectory() as outputPath:
+            table.write(f"{outputPath}/events.parquet")
+            parquetTable=pyarrow.parquet.read_table(f"{outputPath}/events.parquet")
+            self.assertEqual(10, parquetTable.num_rows)
+            self.assertEqual(table.getColumn("Acronym"), parquetTable.column("Acronym").to_pylist())
+
+
+if __name__ == "__main__":
+    unittest.main()
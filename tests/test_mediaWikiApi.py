@@ -0,0 +1,58 @@
+import tempfile
+import unittest
+
+from tests.fake_mediawiki import FakeMediaWiki
+from wikifile.mediaWikiApi import MediaWikiApi
+from wikifile.wikiFile import WikiFile
+from wikifile.wikiFileManager import WikiFileManager
+
+
+class TestMediaWikiApi(unittest.TestCase):
+    """
+    test bulk requests to the MediaWiki api against a local stand-in
+    """
+
+    def setUp(self):
+        self.pages={f"Event {i}":f"{{{{Event|Acronym=E{i}}}}}" for i in range(120)}
+
+    def testGetPageTexts(self):
+        '''
+        test retrieving many pages with few requests
+        '''
+        with FakeMediaWiki(self.pages) as fakeWiki:
+            api=MediaWikiApi(fakeWiki.apiUrl)
+            pageTitles=list(self.pages.keys())+["Not existing page"]
+            pageTexts=api.getPageTexts(pageTitles)
+            self.assertEqual(3, api.requestCount)
+            self.assertEqual(121, len(pageTexts))
+            self.assertEqual("{{Event|Acronym=E42}}", pageTexts["Event 42"])
+            self.assertIsNone(pageTexts["Not existing page"])
+
+    def testNormalizedTitles(self):
+        '''
+        test that the results are returned for the requested titles
+        '''
+        with FakeMediaWiki(self.pages) as fakeWiki:
+            api=MediaWikiApi(fakeWiki.apiUrl)
+            pageTexts=api.getPageTexts(["Event_1", "event 2"])
+            self.assertEqual({"Event_1":"{{Event|Acronym=E1}}", "event 2":"{{Event|Acronym=E2}}"}, pageTexts)
+
+    def testGetWikiFiles(self):
+        '''
+        test getting the WikiFiles from the backup and the wiki
+        '''
+        with tempfile.TemporaryDirectory() as wikiTextPath, FakeMediaWiki(self.pages) as fakeWiki:
+            WikiFile.write_to_file(wikiTextPath, "Event 0", "{{Event|Acronym=Backup}}", overwrite=True)
+            wikiFileManager=WikiFileManager(sourceWikiId=None, wikiTextPath=wikiTextPath, login=False)
+            wikiFileManager.mediaWikiApi=MediaWikiApi(fakeWiki.apiUrl)
+            wikiFiles=wikiFileManager.getWikiFiles(list(self.pages.keys()))
+            self.assertEqual(120, len(wikiFiles))
+            self.assertEqual(3, wikiFileManager.mediaWikiApi.requestCount)
+            self.assertEqual([{"Acronym":"Backup"}], wikiFiles["Event 0"].extractTemplate("Event"))
+            self.assertEqual([{"Acronym":"E99"}], wikiFiles["Event 99"].extractTemplate("Event"))
+            wikiFiles=wikiFileManager.getWikiFiles(["Not existing page"], checkWiki=False)
+            self.assertEqual("", wikiFiles["Not existing page"].wikiText)
+
+
+if __name__ == "__main__":
+    unittest.main()
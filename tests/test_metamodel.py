@@ -7,7 +7,7 @@ import json
 import unittest
 from unittest import TestCase
 
-from wikifile.metamodel import Context, Topic, Property, UML, MetaModelElement
+from wikifile.metamodel import Context, Topic, Property, PropertyIndex, MetaModelGraph, UML, MetaModelElement, CompactTopic, CompactProperty
 
 
 class TestMetaModel(unittest.TestCase):
@@ -181,6 +181,37 @@ class TestTopic(TestCase):
         self.assertEqual(exp_template_oneliner, topic.render_entity(oneliner=True))
         self.assertEqual(exp_template_pretty, topic.render_entity(oneliner=False))
 
+    def test_compact_topic(self):
+        """
+        test that the slot based compact records provide the same attribute API
+        """
+        topic_json = '{"data": [{"pageTitle": "Concept:Task", "name": "Task", "pluralName": "Tasks"}, {"pageTitle": "Concept:Goal", "name": "Goal", "pluralName": "Goals"}]}'
+        prop_json = '{"data": [{"pageTitle": "Property:Task goal", "name": "Task goal", "label": "Goal", "sortPos": null, "values_from": "concept=Goal", "topic": "Concept:Task"}]}'
+        topics = Topic.list_from_wiki_json(topic_json, prop_json)
+        compact_topics = Topic.list_from_wiki_json(topic_json, prop_json, compact=True)
+        self.assertIsInstance(compact_topics[0], CompactTopic)
+        self.assertIsInstance(compact_topics[0].properties[0], CompactProperty)
+        self.assertFalse(hasattr(compact_topics[0], "__dict__"))
+        self.assertFalse(hasattr(compact_topics[0].properties[0], "__dict__"))
+        for topic, compact_topic in zip(topics, compact_topics):
+            self.assertEqual(topic.get_pageTitle(withNamespace=False), compact_topic.get_pageTitle(withNamespace=False))
+            self.assertEqual(topic.get_page_link(), compact_topic.get_page_link())
+            self.assertEqual(topic.render_entity(), compact_topic.render_entity())
+            self.assertEqual(topic.templateParamMapping, compact_topic.templateParamMapping)
+        prop = topics[0].properties[0]
+        compact_prop = compact_topics[0].properties[0]
+        self.assertEqual(prop.render_entity(), compact_prop.render_entity())
+        self.assertEqual("Property:Task goal", compact_prop.get_pageTitle())
+        self.assertEqual(["Concept:Task"], compact_prop.is_used_for())
+        self.assertEqual("[[Property:Task goal|Goal]]", compact_prop.get_page_link())
+        # missing attributes behave like missing attributes of a Topic
+        self.assertFalse(hasattr(compact_topics[0], "icon"))
+        with self.assertRaises(AttributeError):
+            compact_topics[0].unknownAttribute = "value"
+        self.assertEqual("Tasks", CompactTopic({"name": "Task", "pluralName": "Tasks"}).pluralName)
+        self.assertIsNone(CompactProperty({"name": "Task goal"}).label)
+
+
 
 class TestProperty(TestCase):
 
@@ -197,6 +228,35 @@ class TestProperty(TestCase):
         self.assertEqual("label", property_properties[1].name)
         self.assertEqual("type", property_properties[2].name)
 
+    def test_metamodel_cache(self):
+        """test that the metamodel definitions are loaded once and shared read-only and the created objects are not shared"""
+        MetaModelElement.clear_metamodel_cache()
+        property_properties = Property.get_property_properties()
+        self.assertIn("Property_properties.json", MetaModelElement.metamodel_definitions)
+        self.assertIsInstance(property_properties, list)
+        property_properties[0].name = "Changed"
+        property_properties.pop()
+        self.assertEqual("name", Property.get_property_properties()[0].name)
+        self.assertEqual(18, len(Property.get_property_properties()))
+        definition = MetaModelElement.get_metamodel_definition("Topic.json")
+        self.assertIs(definition, MetaModelElement.get_metamodel_definition("Topic.json"))
+        with self.assertRaises(TypeError):
+            definition["name"] = "Changed"
+        properties_definition = MetaModelElement.get_metamodel_definition("Topic_properties.json")
+        self.assertIsInstance(properties_definition, tuple)
+        with self.assertRaises(TypeError):
+            properties_definition[0]["name"] = "Changed"
+        # callers copy what they change
+        record = dict(definition)
+        record["name"] = "Changed"
+        self.assertNotEqual("Changed", MetaModelElement.get_metamodel_definition("Topic.json")["name"])
+        topic = Topic.get_metamodel()
+        topic.name = "Changed"
+        topic.properties[0].name = "Changed"
+        self.assertIsNot(topic, Topic.get_metamodel())
+        self.assertNotEqual("Changed", Topic.get_metamodel().name)
+        self.assertNotEqual("Changed", Topic.get_metamodel().properties[0].name)
+
     def test_get_entity_properties(self):
         data = [{
             "name": "Property text",
@@ -565,3 +625,52 @@ class TestMetaModelElement(TestCase):
         self.assertTrue(len(expected_prop_list), len(actual_prop_list))
         for prop in actual_prop_list:
             self.assertTrue(prop in expected_prop_list)
+
+    def test_property_index(self):
+        data = [
+            {"name": "Task goals", "type": "Special:Types/Page", "values_from": "concept=Goal", "topic": "Concept:Task"},
+            {"name": "Task name", "type": "Special:Types/Text", "topic": "Concept:Task", "usedFor": "Concept:Goal"},
+            {"name": "Goal task", "type": "Special:Types/Page", "values_from": "concept=Task", "topic": "Concept:Goal"}
+        ]
+        properties = [Property(x) for x in data]
+        index = PropertyIndex(properties)
+        self.assertIs(index, PropertyIndex.of(index))
+        self.assertEqual(["Task goals", "Task name"], [p.name for p in index.get_topic_properties("Task")])
+        self.assertEqual(["Task name", "Goal task"], [p.name for p in index.get_topic_properties("Goal")])
+        self.assertEqual(["Goal task"], [p.name for p in index.get_values_from_properties("Task")])
+        self.assertEqual(["Task goals", "Goal task"], [p.name for p in index.get_type_properties("Special:Types/Page")])
+        # the index and the list give the same results
+        for entity_name in ["Task", "Goal"]:
+            self.assertEqual(Property.get_entity_properties(entity_name, properties), Property.get_entity_properties(entity_name, index))
+            self.assertEqual(UML.get_outgoing_edges(entity_name, properties), UML.get_outgoing_edges(entity_name, index))
+        # changes of the list require a refresh of the index
+        properties.append(Property({"name": "Task goal", "type": "Special:Types/Page", "values_from": "concept=Goal", "topic": "Concept:Task"}))
+        self.assertEqual(2, len(UML.get_outgoing_edges("Task", properties)))
+        self.assertEqual(1, len(UML.get_outgoing_edges("Task", index)))
+        graph = index.get_graph()
+        index.refresh()
+        self.assertIsNot(graph, index.get_graph())
+        self.assertEqual(["Task goals", "Task goal"], [edge["property"].name for edge in UML.get_incoming_edges("Goal", index)])
+        properties[0].values_from = "concept=Person"
+        index.refresh()
+        self.assertEqual(["Person", "Goal"], [edge["target"] for edge in UML.get_outgoing_edges("Task", index)])
+
+    def test_metamodel_graph(self):
+        data = [
+            {"name": "Task goals", "type": "Special:Types/Page", "values_from": "concept=Goal", "inputType": "tokens", "topic": "Concept:Task"},
+            {"name": "Task main goal", "type": "Special:Types/Page", "values_from": "concept=Goal", "topic": "Concept:Task"},
+            {"name": "Goal project", "type": "Special:Types/Page", "values_from": "concept=Project", "topic": "Concept:Goal"},
+            {"name": "Goal name", "type": "Special:Types/Text", "topic": "Concept:Goal"}
+        ]
+        properties = [Property(x) for x in data]
+        graph = MetaModelGraph.of(properties)
+        index = PropertyIndex(properties)
+        self.assertIs(index.get_graph(), MetaModelGraph.of(index))
+        self.assertEqual(["Goal", "Goal"], [edge["target"] for edge in graph.get_outgoing_edges("Task")])
+        self.assertEqual(["*", "1"], [edge["target_cardinality"] for edge in graph.get_outgoing_edges("Task")])
+        reduced = graph.get_incoming_edges_reduced("Goal")
+        self.assertEqual(1, len(reduced))
+        self.assertEqual(["Task goals", "Task main goal"], reduced[0]["properties"])
+        self.assertEqual({"Task", "Project"}, graph.get_related_topics("Goal"))
+        self.assertEqual({"Task", "Project"}, Topic({"name": "Goal"}).get_related_topics(properties))
+        self.assertEqual(3, len(graph.get_edges()))
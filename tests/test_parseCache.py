@@ -0,0 +1,134 @@
+import tempfile
+import unittest
+
+import wikitextparser as wtp
+
+from wikifile.parseCache import ParseCache
+from wikifile.syntheticWiki import SyntheticWiki
+from wikifile.wikiExtract import WikiExtract
+from wikifile.wikiFile import WikiFile
+
+
+class TestParseCache(unittest.TestCase):
+    """
+    test the cache of the parsed wikiTexts
+    """
+
+    def setUp(self):
+        syntheticWiki=SyntheticWiki(pages=5, subobjects=3, nesting=3)
+        self.wikiTexts=[syntheticWiki.getWikiText(index) for index in range(syntheticWiki.pages)]
+
+    @staticmethod
+    def parse(parseCache:ParseCache, wikiText:str) -> wtp.WikiText:
+        return parseCache.parse(wikiText, WikiFile.getContentHash(wikiText))
+
+    def assertSameParse(self, expected:wtp.WikiText, actual:wtp.WikiText):
+        self.assertEqual(str(expected), str(actual))
+        for attribute in ["templates", "parser_functions", "wikilinks", "comments"]:
+            self.assertEqual([str(part) for part in getattr(expected, attribute)], [str(part) for part in getattr(actual, attribute)])
+        self.assertEqual([[(arg.name, arg.value) for arg in template.arguments] for template in expected.templates],
+                         [[(arg.name, arg.value) for arg in template.arguments] for template in actual.templates])
+
+    def testParse(self):
+        '''
+        test that cached parses equal fresh parses, are independent objects and are evicted least recently used first
+        '''
+        parseCache=ParseCache(maxSize=3)
+        for wikiText in self.wikiTexts:
+            self.assertSameParse(wtp.parse(wikiText), self.parse(parseCache, wikiText))
+        self.assertEqual((0, 5, 3), (parseCache.hits, parseCache.misses, len(parseCache)))
+        first=self.parse(parseCache, self.wikiTexts[4])
+        second=self.parse(parseCache, self.wikiTexts[4])
+        self.assertSameParse(wtp.parse(self.wikiTexts[4]), second)
+        self.assertEqual(2, parseCache.hits)
+        # modifications do not leak into the cache
+        first.templates[0].set_arg("City", "Aachen")
+        self.assertNotIn("Aachen", str(second))
+        self.assertNotIn("Aachen", str(self.parse(parseCache, self.wikiTexts[4])))
+        self.parse(parseCache, self.wikiTexts[0])
+        self.assertEqual(6, parseCache.misses)
+
+    def testRebuiltTree(self):
+        '''
+        guard against changes of the wikitextparser internals the cache depends on: the rebuilt tree has to equal
+        a fresh parse in its spans and all of its parts
+        '''
+        wikiText="""== Section ==
+{{Event|Acronym=E1|City={{Link|target=Aachen}}}} <!-- comment --> [[Page|label]] [https://example.org link]
+{| class="wikitable"
+|-
+| {{#if:x|{{{1|default}}}|}} || ''italic'' '''bold'''
+|}
+<ref name="a">reference</ref>
+=== Subsection ===
+* item {{#subobject:|Event name=E1}}
+"""
+        parseCache=ParseCache()
+        for text in self.wikiTexts+[wikiText]:
+            self.parse(parseCache, text)
+            fresh=wtp.parse(text)
+            rebuilt=self.parse(parseCache, text)
+            # compare the spans before accessing the parts as wikitextparser adds spans of some parts lazily
+            self.assertEqual(ParseCache.getSpans(fresh), ParseCache.getSpans(rebuilt))
+            self.assertSameParse(fresh, rebuilt)
+            for attribute in ["sections", "tables", "external_links", "parameters", "get_tags", "get_lists"]:
+                parts=getattr(fresh, attribute)
+                rebuiltParts=getattr(rebuilt, attribute)
+                if callable(parts):
+                    parts, rebuiltParts=parts(), rebuiltParts()
+                self.assertEqual([str(part) for part in parts], [str(part) for part in rebuiltParts], attribute)
+        self.assertEqual(len(self.wikiTexts)+1, parseCache.hits)
+
+    def testPersistence(self):
+        '''
+        test reusing the parses of an other run from the cache directory
+        '''
+        with tempfile.TemporaryDirectory() as cacheDir:
+            for wikiText in self.wikiTexts:
+                self.parse(ParseCache(cacheDir=cacheDir), wikiText)
+            parseCache=ParseCache(cacheDir=cacheDir)
+            for wikiText in self.wikiTexts:
+                self.assertSameParse(wtp.parse(wikiText), self.parse(parseCache, wikiText))
+            self.assertEqual((5, 0), (parseCache.hits, parseCache.misses))
+
+    def testWikiFile(self):
+        '''
+        test that WikiFiles of the same content share the parse but not the parsed object
+        '''
+        parseCache=WikiFile.parseCache
+        # the cache is opt-in
+        self.assertIsNone(parseCache)
+        try:
+            WikiFile.parseCache=ParseCache()
+            wikiFile=WikiFile("Event 1", wikiText="{{Event|Acronym=E1}} text")
+            self.assertEqual([{"Acronym":"E1"}], wikiFile.extractTemplate("Event", fastScan=False))
+            other=WikiFile("Event 1", wikiText="{{Event|Acronym=E1}} text")
+            other.updateTemplate("Event", {"City":"Aachen"})
+            self.assertEqual(1, WikiFile.parseCache.hits)
+            self.assertEqual([{"Acronym":"E1", "City":"Aachen"}], other.extractTemplate("Event"))
+            self.assertEqual("{{Event|Acronym=E1}} text", str(wikiFile))
+        finally:
+            WikiFile.parseCache=parseCache
+
+    def testCommandLine(self):
+        '''
+        test enabling the cache with --parseCache
+        '''
+        wikiExtract=WikiExtract()
+        wikiExtract.getParser()
+        parseArgs=lambda args: wikiExtract.parser.parse_args(["-s", "test", "-m", "extract"]+args)
+        try:
+            wikiExtract.initParseCache(parseArgs(["--parseCache"]))
+            self.assertIsNone(WikiFile.parseCache.cacheDir)
+            with tempfile.TemporaryDirectory() as cacheDir:
+                wikiExtract.initParseCache(parseArgs(["--parseCache", cacheDir]))
+                self.assertEqual(cacheDir, WikiFile.parseCache.cacheDir)
+            WikiFile.parseCache=None
+            wikiExtract.initParseCache(parseArgs([]))
+            self.assertIsNone(WikiFile.parseCache)
+        finally:
+            WikiFile.parseCache=None
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+import tempfile
+import threading
+import time
+import unittest
+import warnings
+
+import requests
+
+from wikifile.mediaWikiApi import MediaWikiApi
+from wikifile.rateLimiter import RateLimiter
+from wikifile.wikiFile import WikiFile
+from wikifile.wikiFileManager import WikiFileManager
+
+
+class FakeTargetWiki(object):
+    """
+    records the edits instead of pushing them to a wiki
+    """
+
+    class WikiUser(object):
+        user="Tester"
+
+    class Page(object):
+
+        def __init__(self, wiki, pageTitle:str):
+            self.wiki=wiki
+            self.pageTitle=pageTitle
+
+        def edit(self, text:str, summary:str):
+            if self.pageTitle in self.wiki.protectedPages:
+                self.wiki.attempts[self.pageTitle]=self.wiki.attempts.get(self.pageTitle, 0)+1
+                raise Exception(f"protectedpage: {self.pageTitle} has been protected to prevent editing")
+            with self.wiki.lock:
+                self.wiki.active+=1
+                self.wiki.maxActive=max(self.wiki.maxActive, self.wiki.active)
+                failures=self.wiki.failures.get(self.pageTitle, 0)
+                if failures > 0:
+                    self.wiki.failures[self.pageTitle]=failures-1
+            time.sleep(0.02)
+            with self.wiki.lock:
+                self.wiki.active-=1
+            if failures > 0:
+                raise Exception("maxlag: Waiting for a database server")
+            self.wiki.edits[self.pageTitle]=(text, summary)
+
+    def __init__(self, failures:dict=None, protectedPages:list=None):
+        self.wikiUser=FakeTargetWiki.WikiUser()
+        self.failures=failures if failures is not None else {}
+        self.protectedPages=protectedPages if protectedPages is not None else []
+        self.attempts={}
+        self.edits={}
+        self.lock=threading.Lock()
+        self.active=0
+        self.maxActive=0
+
+    def getPage(self, pageTitle:str):
+        return FakeTargetWiki.Page(self, pageTitle)
+
+
+class TestPushWikiFiles(unittest.TestCase):
+    """
+    test the concurrent push of WikiFiles
+    """
+
+    def getWikiFileManager(self, targetWiki:FakeTargetWiki) -> WikiFileManager:
+        wikiFileManager=WikiFileManager(sourceWikiId=None, wikiTextPath="/tmp", login=False)
+        wikiFileManager.targetWikiId="fake"
+        wikiFileManager.wikiPush.toWiki=targetWiki
+        return wikiFileManager
+
+    def testPushConcurrently(self):
+        '''
+        test pushing pages with multiple workers
+        '''
+        targetWiki=FakeTargetWiki()
+        wikiFileManager=self.getWikiFileManager(targetWiki)
+        wikiFiles=[WikiFile(f"Page {i}", wikiFileManager, wikiText=f"text {i}") for i in range(20)]
+        report=wikiFileManager.pushWikiFilesToWiki(wikiFiles, workers=4)
+        self.assertEqual(20, len(report))
+        self.assertEqual(["Page 0", "Page 1"], [result["pageTitle"] for result in report[:2]])
+        self.assertTrue(all(result["status"] == "success" for result in report))
+        self.assertEqual(("text 7", "modified through WikiFileManager by Tester"), targetWiki.edits["Page 7"])
+        self.assertTrue(1 < targetWiki.maxActive <= 4)
+
+    def testRetry(self):
+        '''
+        test that failed edits are retried and reported
+        '''
+        targetWiki=FakeTargetWiki(failures={"Lagging":2, "Broken":10})
+        wikiFileManager=self.getWikiFileManager(targetWiki)
+        wikiFiles=[WikiFile(pageTitle, wikiFileManager, wikiText="text") for pageTitle in ["Lagging", "Broken", "Fine"]]
+        with warnings.catch_warnings(record=True) as caughtWarnings:
+            warnings.simplefilter("always")
+            report=wikiFileManager.pushWikiFilesToWiki(wikiFiles, workers=3, retries=2, backoff=0.01)
+        results={result["pageTitle"]:result for result in report}
+        self.assertEqual("success", results["Lagging"]["status"])
+        self.assertEqual(3, results["Lagging"]["attempts"])
+        self.assertEqual("failed", results["Broken"]["status"])
+        self.assertEqual(3, results["Broken"]["attempts"])
+        self.assertIn("maxlag", results["Broken"]["error"])
+        self.assertEqual(1, results["Fine"]["attempts"])
+        self.assertEqual(1, len(caughtWarnings))
+
+    def testNoRetryOfPermanentErrors(self):
+        '''
+        test that edits failing with a permanent error are not retried
+        '''
+        targetWiki=FakeTargetWiki(failures={"Lagging":1}, protectedPages=["Protected"])
+        wikiFileManager=self.getWikiFileManager(targetWiki)
+        wikiFiles=[WikiFile(pageTitle, wikiFileManager, wikiText="text") for pageTitle in ["Lagging", "Protected"]]
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter("always")
+            report=wikiFileManager.pushWikiFilesToWiki(wikiFiles, workers=2, retries=3, backoff=0.01)
+        results={result["pageTitle"]:result for result in report}
+        self.assertEqual(("success", 2), (results["Lagging"]["status"], results["Lagging"]["attempts"]))
+        self.assertEqual(("failed", 1), (results["Protected"]["status"], results["Protected"]["attempts"]))
+        self.assertIn("protectedpage", results["Protected"]["error"])
+        self.assertEqual(1, targetWiki.attempts["Protected"])
+
+    def testIsTransientError(self):
+        '''
+        test the classification of the errors of an edit
+        '''
+        response=requests.Response()
+        for status, expected in [(429, True), (503, True), (500, True), (403, False), (404, False)]:
+            response.status_code=status
+            self.assertEqual(expected, MediaWikiApi.isTransientError(requests.HTTPError(response=response)), status)
+        self.assertTrue(MediaWikiApi.isTransientError(requests.ConnectionError("connection refused")))
+        self.assertTrue(MediaWikiApi.isTransientError(TimeoutError()))
+        for code in ["maxlag", "ratelimited", "readonly"]:
+            self.assertTrue(MediaWikiApi.isTransientError(Exception(f"MediaWiki api error {code}: try again later")))
+        for code in ["protectedpage", "permissiondenied", "badtoken"]:
+            self.assertFalse(MediaWikiApi.isTransientError(Exception(f"MediaWiki api error {code}: not allowed")))
+        self.assertFalse(MediaWikiApi.isTransientError(Exception("login of Bot at https://wiki/api.php failed: Failed")))
+
+    def testSkipUnchanged(self):
+        '''
+        test that unmodified WikiFiles are not pushed
+        '''
+        targetWiki=FakeTargetWiki()
+        wikiFileManager=self.getWikiFileManager(targetWiki)
+        wikiFiles=[]
+        for i in range(4):
+            wikiFile=WikiFile(f"Page {i}", wikiFileManager, wikiText=f"{{{{Event|year=202{i}}}}}")
+            wikiFile.markAsLoaded()
+            wikiFiles.append(wikiFile)
+        wikiFiles[1].updateTemplate("Event", {"year":"2031"}, overwrite=True)
+        wikiFiles[2].updateTemplate("Event", {"year":"2022"}, overwrite=True)
+        self.assertFalse(wikiFiles[0].isModified())
+        self.assertTrue(wikiFiles[1].isModified())
+        report=wikiFileManager.pushWikiFilesToWiki(wikiFiles, workers=2)
+        self.assertEqual({"success":1, "skipped":3, "failed":0}, WikiFileManager.getPushSummary(report))
+        self.assertEqual(["Page 1"], list(targetWiki.edits.keys()))
+        # pushed content is the new loaded state
+        self.assertFalse(wikiFiles[1].isModified())
+        self.assertFalse(wikiFiles[0].pushToWiki())
+        self.assertTrue(wikiFiles[0].pushToWiki(force=True))
+        # content of unknown origin is always pushed
+        self.assertTrue(WikiFile("New page", wikiFileManager, wikiText="new").isModified())
+
+    def testSkipUnchangedLazy(self):
+        '''
+        test that lazy WikiFiles of a backup are only pushed if they were modified
+        '''
+        targetWiki=FakeTargetWiki()
+        with tempfile.TemporaryDirectory() as wikiTextPath:
+            for i in range(3):
+                WikiFile.write_to_file(wikiTextPath, f"Page {i}", f"text {i}", overwrite=True)
+            wikiFileManager=self.getWikiFileManager(targetWiki)
+            wikiFileManager.wikiTextPath=wikiTextPath
+            wikiFiles=wikiFileManager.getAllWikiFiles()
+            wikiFiles["Page 1"].wikiText="changed"
+            report=wikiFileManager.pushWikiFilesToWiki(wikiFiles.values(), workers=2)
+        results={result["pageTitle"]:result["status"] for result in report}
+        self.assertEqual({"Page 0":"skipped", "Page 1":"success", "Page 2":"skipped"}, results)
+        self.assertEqual(["Page 1"], list(targetWiki.edits.keys()))
+        self.assertFalse(wikiFiles["Page 0"].isLoaded)
+
+    def testRateLimiter(self):
+        '''
+        test that the requests are spaced out
+        '''
+        rateLimiter=RateLimiter(requestsPerSecond=50)
+        start=time.monotonic()
+        for _i in range(6):
+            rateLimiter.wait()
+        self.assertGreaterEqual(time.monotonic()-start, 0.09)
+
+
+if __name__ == "__main__":
+    unittest.main()
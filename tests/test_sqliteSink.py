@@ -0,0 +1,99 @@
+import sqlite3
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from wikifile.sqliteSink import SQLiteSink
+from wikifile.wikiExtract import WikiExtract
+from wikifile.wikiFile import WikiFile
+from wikifile.wikiFileManager import WikiFileManager
+
+
+class TestSQLiteSink(unittest.TestCase):
+    """
+    test streaming extracted records into SQLite
+    """
+
+    def setUp(self):
+        self.tempDir=tempfile.TemporaryDirectory()
+        self.wikiTextPath=f"{self.tempDir.name}/backup"
+        self.dbFile=f"{self.tempDir.name}/wiki.db"
+        self.pageTitles=[]
+        for i in range(25):
+            pageTitle=f"Event {i}"
+            wikiText=f"{{{{Event|Acronym=E{i}|ordinal={i}}}}}"
+            if i == 20:
+                wikiText+="{{Event series|Acronym=ES|Start year=2000}}"
+            WikiFile.write_to_file(self.wikiTextPath, pageTitle, wikiText, overwrite=True)
+            self.pageTitles.append(pageTitle)
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def query(self, sql:str) -> list:
+        connection=sqlite3.connect(self.dbFile)
+        rows=connection.execute(sql).fetchall()
+        connection.close()
+        return rows
+
+    def testStore(self):
+        '''
+        test the batched inserts with the columns of the first records and later added columns
+        '''
+        records=[{"name":f"n{i}", "year":str(2000+i), "zip":"0049"} for i in range(10)]
+        records.append({"name":"late", "year":"2021", "country with blank":"Germany"})
+        # values that only look numeric in later records have to be kept as they are
+        records.append({"name":"Dresden", "year":"2022", "zip":"01067", "fee":"1.50"})
+        with SQLiteSink(self.dbFile, "Event", batchSize=3, sampleSize=5) as sink:
+            self.assertEqual(12, sink.store(records))
+        self.assertEqual([(12,)], self.query("SELECT COUNT(*) FROM Event"))
+        self.assertEqual([(2009,)], self.query("SELECT MAX(CAST(year AS INTEGER)) FROM Event WHERE zip='0049'"))
+        self.assertEqual([("0049",), ("01067",)], self.query("SELECT DISTINCT zip FROM Event WHERE zip IS NOT NULL ORDER BY zip"))
+        self.assertEqual([("01067", "1.50", "2022")], self.query("SELECT zip, fee, year FROM Event WHERE name='Dresden'"))
+        self.assertEqual([("late", "Germany")], self.query('SELECT name, "country with blank" FROM Event WHERE "country with blank" IS NOT NULL'))
+        types={name:columnType for _cid, name, columnType, *_rest in self.query("PRAGMA table_info(Event)")}
+        self.assertEqual({"name":"TEXT", "year":"TEXT", "zip":"TEXT", "country with blank":"TEXT", "fee":"TEXT"}, types)
+        # an existing table is extended
+        with SQLiteSink(self.dbFile, "Event") as sink:
+            sink.addRecord({"name":"again"})
+        self.assertEqual([(13,)], self.query("SELECT COUNT(*) FROM Event"))
+
+    def testCaseInsensitiveColumns(self):
+        '''
+        test that keys which only differ in case share a column within a record and across records
+        '''
+        records=[{"Year":"2020", "year":"", "name":"a"}, {"Year":"", "year":"2021", "name":"b"}]
+        with SQLiteSink(self.dbFile, "Event", sampleSize=2) as sink:
+            sink.store(records)
+            sink.store([{"YEAR":"2022", "Name":"c", "City":"Bonn"}, {"city":"Aachen", "NAME":"d"}])
+        self.assertEqual(["Year", "name", "City"], [row[1] for row in self.query("PRAGMA table_info(Event)")])
+        self.assertEqual([("a", "2020", None), ("b", "2021", None), ("c", "2022", "Bonn"), ("d", None, "Aachen")],
+                         self.query("SELECT name, year, city FROM Event ORDER BY name"))
+        # an existing table keeps the spelling of its columns
+        with SQLiteSink(self.dbFile, "Event") as sink:
+            sink.addRecord({"year":"2023", "name":"e", "CITY":"Berlin"})
+        self.assertEqual([("2023", "Berlin")], self.query("SELECT Year, City FROM Event WHERE name='e'"))
+
+    def testExportWikiSonsToSQLite(self):
+        '''
+        test streaming the entities of a backup into SQLite
+        '''
+        wikiFileManager=WikiFileManager(sourceWikiId=None, wikiTextPath=self.wikiTextPath, login=False)
+        counts=wikiFileManager.exportWikiSonsToSQLite(self.pageTitles, ["Event", "Event series"], self.dbFile, batchSize=10)
+        self.assertEqual({"Event":25, "Event series":1}, counts)
+        self.assertEqual([("Event 7", "7")], self.query("SELECT pageTitle, ordinal FROM Event WHERE Acronym='E7'"))
+        self.assertEqual([("Event 20", "2000")], self.query('SELECT pageTitle, "Start year" FROM "Event series"'))
+
+    def testCommandLine(self):
+        '''
+        test the sqlite option of wikiextract
+        '''
+        with redirect_stdout(StringIO()):
+            WikiExtract().maininstance(["-s", "test", "-m", "extract", "-t", "Event", "-t", "Event series", "--wikiTextPath", self.wikiTextPath, "-id", "pageTitle", "--sqlite", self.dbFile, "--workers", "2"])
+        self.assertEqual([(25,)], self.query("SELECT COUNT(*) FROM Event"))
+        self.assertEqual([("Event 20",)], self.query('SELECT pageTitle FROM "Event series"'))
+
+
+if __name__ == "__main__":
+    unittest.main()
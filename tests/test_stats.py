@@ -0,0 +1,97 @@
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout, redirect_stderr
+from io import StringIO
+
+from wikifile.stats import Stats
+from wikifile.syntheticWiki import SyntheticWiki
+from wikifile.wikiExtract import WikiExtract
+from wikifile.wikiFile import WikiFile
+from wikifile.wikiRender import WikiRender
+
+
+class TestStats(unittest.TestCase):
+    """
+    test the timers and counters of the instrumentation layer
+    """
+
+    def tearDown(self):
+        stats=Stats.getInstance()
+        stats.enable(False)
+        stats.reset()
+
+    def testStats(self):
+        '''
+        test recording and merging timers and counters
+        '''
+        stats=Stats()
+        stats.count("read.files")
+        with stats.timer("parse"):
+            pass
+        self.assertEqual({"counters":{}, "timers":{}}, stats.asDict())
+        stats.enable()
+        stats.count("read.files")
+        stats.count("read.bytes", 100)
+        for _i in range(2):
+            with stats.timer("parse"):
+                pass
+        stats.merge({"counters":{"read.files":2}, "timers":{"parse":{"seconds":1.5, "calls":3}}})
+        result=stats.asDict()
+        self.assertEqual({"read.bytes":100, "read.files":3}, result["counters"])
+        self.assertEqual(5, result["timers"]["parse"]["calls"])
+        self.assertGreaterEqual(result["timers"]["parse"]["seconds"], 1.5)
+        self.assertIs(Stats.getInstance(), WikiRender().stats)
+
+    def testExtractStats(self):
+        '''
+        test the statistics of an extraction with worker processes dumped by the stats option
+        '''
+        with tempfile.TemporaryDirectory() as tempDir:
+            wikiTextPath=f"{tempDir}/backup"
+            for i in range(10):
+                wikiText=f"{{{{Event|Acronym=E{i}}}}}" if i < 6 else "no template"
+                WikiFile.write_to_file(wikiTextPath, f"Event {i}", wikiText, overwrite=True)
+            statsFile=f"{tempDir}/stats.json"
+            with redirect_stdout(StringIO()):
+                WikiExtract().maininstance(["-s", "test", "-m", "extract", "-t", "Event", "--wikiTextPath", wikiTextPath, "--ndjson", "--workers", "2", "--stats", statsFile])
+            with open(statsFile) as file:
+                result=json.load(file)
+        self.assertEqual(6, result["counters"]["read.files"])
+        self.assertEqual(4, result["counters"]["read.skipped"])
+        self.assertEqual(6, result["counters"]["templates.matched"])
+        self.assertEqual(6, result["timers"]["scan"]["calls"])
+        self.assertFalse(Stats.getInstance().enabled)
+
+    def testStatsWithNdjson(self):
+        '''
+        test that the statistics printed with "--stats -" do not mix with the ndjson records on stdout
+        '''
+        with tempfile.TemporaryDirectory() as wikiTextPath:
+            for i in range(3):
+                WikiFile.write_to_file(wikiTextPath, f"Event {i}", f"{{{{Event|Acronym=E{i}}}}}", overwrite=True)
+            stdout=StringIO()
+            stderr=StringIO()
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                WikiExtract().maininstance(["-s", "test", "-m", "extract", "-t", "Event", "--wikiTextPath", wikiTextPath, "--ndjson", "--stats", "-"])
+        records=[json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual(["E0", "E1", "E2"], sorted(record["Acronym"] for record in records))
+        self.assertEqual(3, json.loads(stderr.getvalue())["counters"]["templates.matched"])
+
+    def testRenderStats(self):
+        '''
+        test the render and write statistics of the generation with worker processes
+        '''
+        stats=Stats.getInstance()
+        stats.enable()
+        topics=SyntheticWiki.getTopics(count=3, propertiesPerTopic=2)
+        with tempfile.TemporaryDirectory() as tempDir:
+            pageCount=WikiRender().generateTopics(topics, path=tempDir, overwrite=True, workers=2)
+        result=stats.asDict()
+        self.assertEqual(pageCount, result["counters"]["write.files"])
+        self.assertEqual(3, result["timers"]["render.form_page.jinja"]["calls"])
+        self.assertEqual(3*2, result["timers"]["render.property_page.jinja"]["calls"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from wikifile.cmdline import CmdLineAble
+from wikifile.syntheticWiki import SyntheticWiki, main
+from wikifile.wikiFile import WikiFile
+from wikifile.wikiFileManager import WikiFileManager
+
+
+class TestSyntheticWiki(unittest.TestCase):
+    """
+    test the generator of synthetic wikiText backups
+    """
+
+    def testGetWikiText(self):
+        '''
+        test that the pages are reproducible and hold the entity, subobjects, parser functions and free text
+        '''
+        syntheticWiki=SyntheticWiki(pages=30, subobjects=3, nesting=2)
+        self.assertEqual(syntheticWiki.getWikiText(4), SyntheticWiki(pages=30, subobjects=3, nesting=2).getWikiText(4))
+        self.assertNotEqual(syntheticWiki.getWikiText(4), SyntheticWiki(pages=30, subobjects=3, nesting=2, seed=1).getWikiText(4))
+        subobjects=0
+        for index in range(syntheticWiki.pages):
+            wikiText=syntheticWiki.getWikiText(index)
+            wikiFile=WikiFile(syntheticWiki.getPageTitle(index), wikiText=wikiText)
+            topic=syntheticWiki.getTopic(index)
+            records=wikiFile.extractTemplate(topic.name)
+            self.assertEqual(1, len(records))
+            self.assertEqual([property.name for property in topic.properties], list(records[0].keys()))
+            self.assertRegex(records[0]["property2"], r"^\d+$")
+            self.assertIn(records[0]["property1"], syntheticWiki.getPageTitles())
+            self.assertGreaterEqual(len(wikiFile.parsedWikiText.parser_functions), 2)
+            subobjects+=wikiText.count("{{#subobject:|")
+        self.assertTrue(0 < subobjects < 3*syntheticWiki.pages)
+
+    def testWrite(self):
+        '''
+        test writing the pages distributed over a directory tree and extracting them again
+        '''
+        with tempfile.TemporaryDirectory() as wikiTextPath:
+            with redirect_stdout(StringIO()):
+                pageTitles=main(["--wikiTextPath", wikiTextPath, "--pages", "40", "--topics", "2", "--pagesPerDirectory", "5"])
+            self.assertEqual("Entity1/1/Entity1 11", pageTitles[11])
+            self.assertEqual(sorted(pageTitles), sorted(CmdLineAble.getPageTitlesForWikiTextPath(wikiTextPath)))
+            wikiFileManager=WikiFileManager(sourceWikiId=None, wikiTextPath=wikiTextPath, login=False)
+            lod=wikiFileManager.exportWikiSonToLOD(pageTitles, "Entity0")
+            self.assertEqual(20, len(lod))
+            self.assertEqual("Entity0/0/Entity0 0", lod[0]["pageTitle"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import time
+import unittest
+
+from wikifile.templateIndex import TemplateIndex
+from wikifile.wikiFile import WikiFile
+from wikifile.wikiFileManager import WikiFileManager
+
+
+class TestTemplateIndex(unittest.TestCase):
+    """
+    test the persistent template index
+    """
+
+    def setUp(self):
+        self.tempDir=tempfile.TemporaryDirectory()
+        self.wikiTextPath=f"{self.tempDir.name}/backup"
+        self.dbFile=f"{self.tempDir.name}/index.db"
+        pages={
+            "3DUI 2020":"{{Event\n|Acronym=3DUI 2020\n}}",
+            "3DUI":"{{Event series\n|Acronym=3DUI\n}}",
+            "Main Page":"Welcome {{Info|text=Hello}}",
+            "sub/Nested Event":"{{Event|Acronym=Nested}} {{Info|text=nested}}"
+        }
+        for pageTitle, wikiText in pages.items():
+            os.makedirs(os.path.dirname(WikiFile.get_wiki_path(self.wikiTextPath, pageTitle)), exist_ok=True)
+            WikiFile.write_to_file(self.wikiTextPath, pageTitle, wikiText, overwrite=True)
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def testUpdateAndQuery(self):
+        '''
+        test building the index and querying it
+        '''
+        index=TemplateIndex(self.wikiTextPath, dbFile=self.dbFile)
+        counts=index.update()
+        self.assertEqual(4, counts["added"])
+        self.assertEqual(["3DUI 2020", "sub/Nested Event"], index.getPageTitlesForTemplate("Event"))
+        self.assertEqual(["3DUI"], index.getPageTitlesForTemplate(" Event series\n"))
+        self.assertEqual([], index.getPageTitlesForTemplate("Unknown"))
+        index.close()
+
+    def testIncrementalUpdate(self):
+        '''
+        test that only changed files are reparsed and that the index is persistent
+        '''
+        index=TemplateIndex(self.wikiTextPath, dbFile=self.dbFile)
+        index.update()
+        index.close()
+        index=TemplateIndex(self.wikiTextPath, dbFile=self.dbFile)
+        counts=index.update()
+        self.assertEqual({"added":0, "updated":0, "removed":0}, counts)
+        # ensure a different modification time
+        time.sleep(0.01)
+        WikiFile.write_to_file(self.wikiTextPath, "Main Page", "{{Event|Acronym=Main}}", overwrite=True)
+        os.remove(WikiFile.get_wiki_path(self.wikiTextPath, "3DUI"))
+        counts=index.update()
+        self.assertEqual({"added":0, "updated":1, "removed":1}, counts)
+        self.assertEqual(["3DUI 2020", "Main Page", "sub/Nested Event"], index.getPageTitlesForTemplate("Event"))
+        self.assertEqual(["sub/Nested Event"], index.getPageTitlesForTemplate("Info"))
+        self.assertEqual([], index.getPageTitlesForTemplate("Event series"))
+        index.close()
+
+    def testFilterPageTitles(self):
+        '''
+        test filtering pageTitles - pages unknown to the index are kept
+        '''
+        index=TemplateIndex(self.wikiTextPath, dbFile=self.dbFile)
+        index.update()
+        pageTitles=index.filterPageTitles(["Main Page", "Only in wiki", "3DUI 2020"], "Event")
+        self.assertEqual(["Only in wiki", "3DUI 2020"], pageTitles)
+        index.close()
+
+    def testWikiFileManagerWithTemplateIndex(self):
+        '''
+        test the template lookup of the WikiFileManager using the index
+        '''
+        wikiFileManager=WikiFileManager(sourceWikiId=None, wikiTextPath=self.wikiTextPath, login=False, withTemplateIndex=True)
+        wikiFiles=wikiFileManager.getWikiFilesForTemplate("Event")
+        self.assertEqual({"3DUI 2020", "sub/Nested Event"}, set(wikiFiles.keys()))
+        self.assertTrue(os.path.isfile(TemplateIndex.getDefaultDbFile(self.wikiTextPath)))
+        wikiFileManager.getTemplateIndex().close()
+
+
+if __name__ == "__main__":
+    unittest.main()
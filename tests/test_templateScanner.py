@@ -0,0 +1,99 @@
+import tempfile
+import unittest
+
+import wikitextparser as wtp
+
+from wikifile.templateScanner import TemplateScanner
+from wikifile.wikiFile import WikiFile
+
+
+class TestTemplateScanner(unittest.TestCase):
+    """
+    test the lightweight template scanner
+    """
+
+    def setUp(self):
+        self.flatMarkups=[
+            "{{Event\n|Acronym=3DUI 2020\n|Title=IEEE Symposium on 3D User Interfaces\n|Homepage=http://ieeevr.org/2020/\n}}\nfree text",
+            "{{Event|ordinal =1}}{{Event|ordinal=2\n}}{{Event|ordinal=3}}{{Event|ordinal=4|year=2021\n}}",
+            "{{SomeEntity\n|a=1\n|b=a=c\n|b\n|a='\n}}{{Event|x|y| z = 1 }}",
+            "{{Event}}{{Event|}}{{ Event \n|a=[http://example.org link]}}",
+            "[[Category:Event]] {{Other|q=1}} no match",
+            "{| class=\"wikitable\"\n|a\n|}\n{{Event|a=1}}"
+        ]
+        self.ambiguousMarkups=[
+            "{{Event|a={{!}}}}",
+            "{{Other|x={{Event|a=1}}}}",
+            "{{Event|a=[[Link|label]]}}",
+            "{{Event|a=1<!-- |b=2 -->}}",
+            "<nowiki>{{Event|a=1}}</nowiki>",
+            "{{Event|a={{{1}}}}}",
+            "{{Event|a=1"
+        ]
+
+    def testExtractTemplateFlat(self):
+        '''
+        test that flat templates are extracted like wikitextparser does
+        '''
+        for markup in self.flatMarkups:
+            for templateName in ["Event", "SomeEntity", "Other"]:
+                expected=WikiFile("test", wikiText=markup).extractTemplate(templateName, fastScan=False)
+                actual=TemplateScanner.extractTemplate(markup, templateName)
+                self.assertEqual(expected, actual, markup)
+
+    def testExtractTemplateAmbiguous(self):
+        '''
+        test that nested or ambiguous markup is left to wikitextparser
+        '''
+        for markup in self.ambiguousMarkups:
+            self.assertIsNone(TemplateScanner.extractTemplate(markup, "Event"), markup)
+            expected=WikiFile("test", wikiText=markup).extractTemplate("Event", fastScan=False)
+            self.assertEqual(expected, WikiFile("test", wikiText=markup).extractTemplate("Event"))
+
+    def testUnparsableTags(self):
+        '''
+        test that the templates within the extension tags wikitextparser does not parse are extracted like wikitextparser does
+        '''
+        tags=set(wtp._spans._unparsable_tag_extensions)|{"chem", "ce"}
+        for tag in sorted(tags):
+            for markup in [f"<{tag}>{{{{Event|a=b}}}}</{tag}>", f"<{tag.upper()} id=1>{{{{Event|a=b}}}}</{tag.upper()}>"]:
+                expected=WikiFile("test", wikiText=markup).extractTemplate("Event", fastScan=False)
+                self.assertIsNone(TemplateScanner.extractTemplate(markup, "Event"), markup)
+                self.assertEqual(expected, WikiFile("test", wikiText=markup).extractTemplate("Event"), markup)
+        # tags that only start like an unparsable tag are scanned
+        markup="<center>{{Event|a=b}}</center>"
+        self.assertEqual(WikiFile("test", wikiText=markup).extractTemplate("Event", fastScan=False), TemplateScanner.extractTemplate(markup, "Event"))
+
+    def testGetTemplateNames(self):
+        '''
+        test that all template names found by wikitextparser are found
+        '''
+        for markup in self.flatMarkups:
+            expected={WikiFile.get_template_name(template.name) for template in wtp.parse(markup).templates}
+            self.assertTrue(expected <= TemplateScanner.getTemplateNames(markup))
+        self.assertIsNone(TemplateScanner.getTemplateNames("{{Event|a=1"))
+
+    def testFileMayContainTemplates(self):
+        """
+        test rejecting files by scanning their raw bytes
+        """
+        with tempfile.TemporaryDirectory() as path:
+            pages={"Match": "{{ Event \n|Acronym=Zürich 2021}}", "Other": "{{Other|Acronym=Zürich}}", "Empty": ""}
+            for pageTitle, wikiText in pages.items():
+                WikiFile.write_to_file(path, pageTitle, wikiText, overwrite=True)
+            filePath=lambda pageTitle: WikiFile.get_wiki_path(path, pageTitle)
+            self.assertTrue(TemplateScanner.fileMayContainTemplates(filePath("Match"), ["Event"]))
+            self.assertFalse(TemplateScanner.fileMayContainTemplates(filePath("Other"), ["Event"]))
+            self.assertTrue(TemplateScanner.fileMayContainTemplates(filePath("Other"), ["Event", "Other"]))
+            self.assertFalse(TemplateScanner.fileMayContainTemplates(filePath("Empty"), ["Event"]))
+            self.assertTrue(TemplateScanner.fileMayContainTemplates(filePath("Missing"), ["Event"]))
+            # rejected files are not parsed but result in the same records
+            for pageTitle in pages.keys():
+                expected=WikiFile(pageTitle, wikiText=pages[pageTitle]).extractTemplate("Event")
+                self.assertEqual(expected, WikiFile.extractTemplateFromFile(path, pageTitle, "Event"))
+            self.assertIsNone(WikiFile.extractTemplateFromFile(path, "Missing", "Event"))
+
+
+
+if __name__ == "__main__":
+    unittest.main()
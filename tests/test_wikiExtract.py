@@ -0,0 +1,106 @@
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout, redirect_stderr
+from io import StringIO
+
+from wikifile.wikiExtract import WikiExtract
+from wikifile.wikiFile import WikiFile
+from wikifile.wikiFileManager import WikiFileManager
+
+
+class TestWikiExtract(unittest.TestCase):
+    """
+    test the extraction of template data from wikiText files
+    """
+
+    def setUp(self):
+        self.tempDir=tempfile.TemporaryDirectory()
+        self.wikiTextPath=self.tempDir.name
+        self.pageTitles=[]
+        for i in range(20):
+            pageTitle=f"Event {i}"
+            wikiText=f"{{{{Event\n|Acronym=E{i}\n|ordinal={i}\n}}}}\nsome text"
+            if i % 5 == 0:
+                wikiText="No event on this page"
+            WikiFile.write_to_file(self.wikiTextPath, pageTitle, wikiText, overwrite=True)
+            self.pageTitles.append(pageTitle)
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def testExtractTemplates(self):
+        '''
+        test extracting the template data with and without worker processes
+        '''
+        serial=WikiExtract.extract_templates("Event", stdIn=False, page_titles=self.pageTitles, file_list=None,
+                                             backup_path=self.wikiTextPath, add_file_name="pageTitle")
+        parallel=WikiExtract.extract_templates("Event", stdIn=False, page_titles=self.pageTitles, file_list=None,
+                                               backup_path=self.wikiTextPath, add_file_name="pageTitle", workers=3)
+        self.assertEqual(serial, parallel)
+        records=json.loads(parallel)["data"]
+        self.assertEqual(16, len(records))
+        self.assertEqual([f"Event {i}" for i in range(20) if i % 5 != 0], [record["pageTitle"] for record in records])
+
+    def testIterateTemplates(self):
+        '''
+        test that the records are yielded one by one
+        '''
+        records=WikiExtract.iterate_templates("Event", self.pageTitles, self.wikiTextPath)
+        self.assertEqual({"Acronym":"E1", "ordinal":"1"}, next(records))
+        self.assertEqual(15, len(list(records)))
+
+    def testNdjson(self):
+        '''
+        test the newline delimited json output of the command line
+        '''
+        stdout=StringIO()
+        with redirect_stdout(stdout):
+            WikiExtract().maininstance(["-s", "test", "-m", "extract", "-t", "Event", "--wikiTextPath", self.wikiTextPath, "-p", "Event 1", "Event 2", "--ndjson"])
+        lines=stdout.getvalue().splitlines()
+        self.assertEqual([{"Acronym":"E1", "ordinal":"1"}, {"Acronym":"E2", "ordinal":"2"}], [json.loads(line) for line in lines])
+
+    def testMainInstance(self):
+        '''
+        test the command line usage
+        '''
+        stdout=StringIO()
+        with redirect_stdout(stdout):
+            WikiExtract().maininstance(["-s", "test", "-m", "extract", "-t", "Event", "--wikiTextPath", self.wikiTextPath, "--workers", "2"])
+        records=json.loads(stdout.getvalue())["data"]
+        self.assertEqual(16, len(records))
+        # the template is required
+        with redirect_stderr(StringIO()), self.assertRaises(SystemExit):
+            WikiExtract().maininstance(["-s", "test", "-m", "extract", "--wikiTextPath", self.wikiTextPath])
+
+    def testExtractMultipleTemplates(self):
+        '''
+        test extracting several templates in one scan
+        '''
+        WikiFile.write_to_file(self.wikiTextPath, "Proceedings 1", "{{Proceedings|Title=P1}}{{Event|Acronym=E1P}}", overwrite=True)
+        WikiFile.write_to_file(self.wikiTextPath, "Nested", "{{Proceedings|Title={{PAGENAME}}}}", overwrite=True)
+        templateNames=["Event", "Proceedings"]
+        pageTitles=self.pageTitles+["Proceedings 1", "Nested"]
+        for pageTitle in ["Event 1", "Proceedings 1", "Nested"]:
+            wikiFile=WikiFile(pageTitle, wikiText=WikiFile.readWikiText(self.wikiTextPath, pageTitle))
+            expected={templateName:wikiFile.extractTemplate(templateName, fastScan=False) for templateName in templateNames}
+            self.assertEqual(expected, wikiFile.extractTemplates(templateNames))
+            self.assertEqual(expected, wikiFile.extractTemplates(templateNames, fastScan=False))
+        for workers in [1, 2]:
+            records=json.loads(WikiExtract.extract_multiple_templates(templateNames, pageTitles, self.wikiTextPath, workers=workers))["data"]
+            self.assertEqual(17, len(records["Event"]))
+            self.assertEqual([{"Title":"P1"}, {"Title":"{{PAGENAME}}"}], records["Proceedings"])
+        wikiFileManager=WikiFileManager(sourceWikiId=None, wikiTextPath=self.wikiTextPath, login=False)
+        lods=wikiFileManager.exportWikiSonsToLOD(pageTitles, templateNames)
+        self.assertEqual({"Title":"P1", "pageTitle":"Proceedings 1"}, lods["Proceedings"][0])
+        self.assertEqual(wikiFileManager.exportWikiSonToLOD(pageTitles, "Event", properties=[]), lods["Event"])
+        stdout=StringIO()
+        with redirect_stdout(stdout):
+            WikiExtract().maininstance(["-s", "test", "-m", "extract", "-t", "Event", "-t", "Proceedings", "--wikiTextPath", self.wikiTextPath, "-p", "Event 1", "Proceedings 1", "--ndjson"])
+        lines=[json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual([{"Event":{"Acronym":"E1", "ordinal":"1"}}, {"Event":{"Acronym":"E1P"}}, {"Proceedings":{"Title":"P1"}}], lines)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import tempfile
 import unittest
 import uuid
 from pathlib import Path
@@ -247,5 +248,43 @@ class TestWikiFile(TestCase):
         self.assertEqual(pageTitle, page.text())
 
 
+class TestWikiFileOffline(TestCase):
+    """
+    tests of WikiFile that do not need a wiki
+    """
+
+    def testLazyLoading(self):
+        """tests that the wikiText of lazy WikiFiles is only read on access and can be released"""
+        with tempfile.TemporaryDirectory() as wikiTextPath:
+            for i in range(3):
+                WikiFile.write_to_file(wikiTextPath, f"Event {i}", f"{{{{Event|Acronym=E{i}}}}}", overwrite=True)
+            WikiFile.write_to_file(wikiTextPath, "Event/Sub", "{{Event|Acronym=Sub}}", overwrite=True)
+            wikiFileManager = WikiFileManager(sourceWikiId=None, wikiTextPath=wikiTextPath, login=False)
+            wikiFiles = wikiFileManager.getAllWikiFiles()
+            self.assertEqual({"Event 0", "Event 1", "Event 2", "Event/Sub"}, set(wikiFiles.keys()))
+            wikiFile = wikiFiles["Event 1"]
+            self.assertFalse(wikiFile.isLoaded)
+            self.assertEqual([{"Acronym": "E1"}], wikiFile.extractTemplate("Event"))
+            self.assertTrue(wikiFile.isLoaded)
+            self.assertTrue(wikiFile.release())
+            self.assertFalse(wikiFile.isLoaded)
+            self.assertEqual("{{Event|Acronym=E1}}", str(wikiFiles["Event 1"].parsedWikiText))
+            # modified WikiFiles keep their wikiText
+            wikiFile.updateTemplate("Event", {"Acronym": "changed"}, overwrite=True)
+            self.assertFalse(wikiFile.release())
+            self.assertIn("changed", wikiFile.wikiText)
+            acronyms = []
+            for wikiFile in wikiFileManager.iterWikiFiles():
+                acronyms.extend(record["Acronym"] for record in wikiFile.extractTemplate("Event"))
+            self.assertFalse(wikiFile.isLoaded)
+            self.assertEqual(["E0", "E1", "E2", "Sub"], sorted(acronyms))
+            # lazy WikiFiles that were not read are unmodified
+            self.assertFalse(wikiFileManager.getAllWikiFiles()["Event 2"].isModified())
+            lazyWikiFile = wikiFileManager.getAllWikiFiles()["Event 0"]
+            lazyWikiFile.wikiText = "{{Event|Acronym=replaced}}"
+            self.assertTrue(lazyWikiFile.isModified())
+
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -2,10 +2,12 @@ import unittest
 import uuid
 import warnings
 import getpass
+import tempfile
 from pathlib import Path
 
 from wikibot3rd.wikiuser import WikiUser
 
+from wikifile.stats import Stats
 from wikifile.wikiFile import WikiFile
 from wikifile.wikiFileManager import WikiFileManager
 from wikibot3rd.wikipush import WikiPush
@@ -277,6 +279,77 @@ Help:Topic"""
 
 
 
+class TestWikiFileManagerOffline(unittest.TestCase):
+    """
+    test the WikiFileManager on a temporary wikiText backup without a wiki
+    """
+
+    def setUp(self):
+        self.tempDir=tempfile.TemporaryDirectory()
+        self.wikiTextPath=self.tempDir.name
+        for i in range(5):
+            wikiText=f"{{{{Event|Acronym=E{i}|ordinal={i}}}}}" if i % 2 == 0 else f"{{{{Event series|Acronym=ES{i}}}}}"
+            WikiFile.write_to_file(self.wikiTextPath, f"Page {i}", wikiText, overwrite=True)
+        self.wikiFileManager=WikiFileManager(sourceWikiId=None, wikiTextPath=self.wikiTextPath, login=False)
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def testExportWikiSonToLODWithWorkers(self):
+        '''
+        test that exporting with worker processes yields the same LoD as the serial export
+        '''
+        pageTitles=[f"Page {i}" for i in range(5)]
+        serialLod=self.wikiFileManager.exportWikiSonToLOD(pageTitles, "Event", properties=[])
+        parallelLod=self.wikiFileManager.exportWikiSonToLOD(pageTitles, "Event", properties=[], workers=2)
+        self.assertEqual(3, len(serialLod))
+        self.assertEqual(serialLod, parallelLod)
+
+    def testGetWikiFilesWithRecords(self):
+        '''
+        test filtering the WikiFiles by template and extracting the records of the template in one pass
+        '''
+        self.wikiFileManager.getParser()
+        args=self.wikiFileManager.parser.parse_args(["--source", "test", "--wikiTextPath", self.wikiTextPath, "--template", "Event"])
+        wikiFiles, records=self.wikiFileManager.getWikiFilesWithRecordsForArgs(args)
+        self.assertEqual(["Page 0", "Page 2", "Page 4"], sorted(wikiFiles.keys()))
+        self.assertEqual([{"Acronym":"E2", "ordinal":"2"}], records["Page 2"])
+        self.assertEqual(sorted(wikiFiles.keys()), sorted(self.wikiFileManager.getAllWikiFilesForArgs(args).keys()))
+        lod=self.wikiFileManager.convertWikiFilesToLOD(wikiFiles.values(), "Event", records=records)
+        self.assertEqual(3, len(lod))
+        self.assertEqual({"Acronym":"E2", "ordinal":"2", "pageTitle":"Page 2"}, [record for record in lod if record["Acronym"] == "E2"][0])
+        # the given records are not modified
+        self.assertEqual([{"Acronym":"E2", "ordinal":"2"}], records["Page 2"])
+
+    def testGetWikiFileStats(self):
+        '''
+        test that getWikiFile records the reading of the backup and the requests to the wiki
+        '''
+        class FakePage(object):
+            def text(self):
+                return "{{Event|Acronym=Wiki}}"
+
+        class FakeWiki(object):
+            def getPage(self, pageTitle:str):
+                return FakePage()
+
+        stats=Stats.getInstance()
+        stats.reset()
+        stats.enable()
+        try:
+            self.wikiFileManager.wikiPush.fromWiki=FakeWiki()
+            self.assertEqual("{{Event|Acronym=E0|ordinal=0}}", self.wikiFileManager.getWikiFile("Page 0").wikiText)
+            self.assertEqual("{{Event|Acronym=Wiki}}", self.wikiFileManager.getWikiFile("Page 9").wikiText)
+            self.assertEqual("", self.wikiFileManager.getWikiFile("Page 9", checkWiki=False).wikiText)
+            result=stats.asDict()
+        finally:
+            stats.enable(False)
+            stats.reset()
+        self.assertEqual(1, result["counters"]["read.files"])
+        self.assertEqual(1, result["counters"]["http.calls"])
+        self.assertEqual(1, result["timers"]["http"]["calls"])
+
+
 if __name__ == "__main__":
     # import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
\ No newline at end of file
@@ -3,11 +3,14 @@ Created on 2021-04-06
 
 @author: wf
 '''
+import os
 import tempfile
 import unittest
 import getpass
 from wikifile.wikiRender import WikiRender
 from wikifile.metamodel import Topic
+from wikifile.buildManifest import BuildManifest
+from wikifile.wikiFile import WikiFile
 
 class TestWikiRender(unittest.TestCase):
     '''
@@ -147,6 +150,114 @@ class TestWikiRender(unittest.TestCase):
                 generatedPage=f.read()
                 self.assertTrue(f"name={prop.name}" in generatedPage)
 
+    def testSharedTemplateEnv(self):
+        '''test that the template environment is shared by the WikiRender instances'''
+        self.assertIs(WikiRender().template_env, WikiRender().template_env)
+        self.assertIsNot(WikiRender.getTemplateEnv(), WikiRender.getTemplateEnv(bytecode_cache=False))
+
+    def testCompiledTemplates(self):
+        '''test rendering with the precompiled templates'''
+        topic = Topic.from_wiki_json(self.topicJson, self.propJson)
+        with tempfile.TemporaryDirectory() as tempDir:
+            compiledTemplates=WikiRender.compileTemplates(f"{tempDir}/compiled")
+            templateEnv=WikiRender.getTemplateEnv(compiled_templates=compiledTemplates)
+            template=templateEnv.get_template("macros/utils.jinja")
+            self.assertTrue(template.filename.startswith(compiledTemplates))
+            pages={}
+            for wikiRender in [WikiRender(), WikiRender(template_env=templateEnv)]:
+                outputPath=f"{tempDir}/{len(pages)}"
+                wikiRender.generateTopic(topic, path=outputPath, overwrite=True)
+                with open(f"{outputPath}/Template:Task.wiki") as f:
+                    pages[len(pages)]=f.read()
+            self.assertEqual(pages[0], pages[1])
+
+    def testGenerateTopics(self):
+        '''test generating the pages of multiple topics in one run'''
+        topicJson="""{"data": [{"pageTitle": "Concept:Task", "name": "Task", "pluralName": "Tasks", "documentation": "Problem or issue that needs to be solved"},
+                               {"pageTitle": "Concept:Workpackage", "name": "Workpackage", "pluralName": "Workpackages", "documentation": "Group of tasks"}]}"""
+        propJson=self.propJson.replace('"topic": "Concept:Task",\n                "regexp": null\n                }]', '"topic": "Concept:Workpackage",\n                "regexp": null\n                }]')
+        topics=Topic.list_from_wiki_json(topicJson, propJson)
+        self.assertEqual(["Task", "Workpackage"], [topic.name for topic in topics])
+        self.assertEqual(3, len(topics[0].properties))
+        self.assertEqual(["Task workpackage"], [prop.name for prop in topics[1].properties])
+        generatedPages={}
+        for workers in [1, 2]:
+            with tempfile.TemporaryDirectory() as tempDir:
+                pageCount=WikiRender().generateTopics(topics, path=tempDir, overwrite=True, workers=workers)
+                self.assertEqual(2*6+4, pageCount)
+                generatedPages[workers]={}
+                for fileName in os.listdir(tempDir):
+                    with open(f"{tempDir}/{fileName}") as f:
+                        generatedPages[workers][fileName]=f.read()
+        self.assertIn("Form:Workpackage.wiki", generatedPages[1])
+        self.assertEqual(generatedPages[1], generatedPages[2])
+
+    def testCompactGeneration(self):
+        '''test that the compact topics and properties generate the same pages'''
+        generatedPages={}
+        for compact in [False, True]:
+            topics=Topic.list_from_wiki_json(self.topicJson, self.propJson, compact=compact)
+            with tempfile.TemporaryDirectory() as tempDir:
+                WikiRender().generateTopics(topics, path=tempDir, overwrite=True)
+                generatedPages[compact]={}
+                for fileName in os.listdir(tempDir):
+                    with open(f"{tempDir}/{fileName}") as f:
+                        generatedPages[compact][fileName]=f.read()
+        self.assertEqual(6+4, len(generatedPages[True]))
+        self.assertEqual(generatedPages[False], generatedPages[True])
+
+    def testIncrementalGeneration(self):
+        '''test that only the pages with changed inputs are regenerated'''
+        topics=Topic.list_from_wiki_json(self.topicJson, self.propJson)
+        wikiRender=WikiRender()
+        with tempfile.TemporaryDirectory() as tempDir:
+            manifest=BuildManifest(tempDir)
+            self.assertEqual(6+4, wikiRender.generateTopics(topics, path=tempDir, overwrite=True, manifest=manifest))
+            manifest=BuildManifest(tempDir)
+            self.assertEqual(0, wikiRender.generateTopics(topics, path=tempDir, overwrite=True, manifest=manifest))
+            # freshly loaded topics have the same fingerprint as the rendered ones
+            self.assertEqual(0, wikiRender.generateTopics(Topic.list_from_wiki_json(self.topicJson, self.propJson), path=tempDir, overwrite=True, manifest=manifest))
+            topics[0].properties[1].label="Changed label"
+            os.remove(f"{tempDir}/Help:Task.wiki")
+            self.assertEqual(6+1, wikiRender.generateTopics(topics, path=tempDir, overwrite=True, manifest=manifest))
+            with open(f"{tempDir}/Property:Task procedure.wiki") as f:
+                self.assertIn("Changed label", f.read())
+            self.assertTrue(os.path.isfile(f"{tempDir}/Help:Task.wiki"))
+            # existing files are only replaced if overwrite is set
+            self.assertFalse(WikiFile.write_to_file(tempDir, "Help:Task", "replaced", overwrite=False))
+            self.assertTrue(WikiFile.write_to_file(tempDir, "Help:Task", "replaced", overwrite=True))
+            with open(f"{tempDir}/Help:Task.wiki") as f:
+                self.assertEqual("replaced", f.read())
+
+    def testIncrementalGenerateTopic(self):
+        '''test that generateTopic and generateTopics record the same fingerprints'''
+        topics=Topic.list_from_wiki_json(self.topicJson, self.propJson)
+        wikiRender=WikiRender()
+        with tempfile.TemporaryDirectory() as tempDir:
+            manifest=BuildManifest(tempDir)
+            for topic in topics:
+                wikiRender.generateTopic(topic, path=tempDir, overwrite=True, manifest=manifest)
+            self.assertEqual(0, wikiRender.generateTopics(topics, path=tempDir, overwrite=True, manifest=manifest))
+            self.assertEqual(0, wikiRender.generateTopics(Topic.list_from_wiki_json(self.topicJson, self.propJson), path=tempDir, overwrite=True, manifest=manifest))
+
+    def testIncrementalGenerationWithoutOverwrite(self):
+        '''test that kept existing pages are only rendered again if overwrite is set'''
+        topics=Topic.list_from_wiki_json(self.topicJson, self.propJson)
+        wikiRender=WikiRender()
+        with tempfile.TemporaryDirectory() as tempDir:
+            WikiFile.write_to_file(tempDir, "Help:Task", "customized", overwrite=True)
+            manifest=BuildManifest(tempDir)
+            self.assertEqual(6+4, wikiRender.generateTopics(topics, path=tempDir, overwrite=False, manifest=manifest))
+            manifest=BuildManifest(tempDir)
+            self.assertEqual(0, wikiRender.generateTopics(topics, path=tempDir, overwrite=False, manifest=manifest))
+            with open(f"{tempDir}/Help:Task.wiki") as f:
+                self.assertEqual("customized", f.read())
+            # the kept page is replaced by a run with overwrite
+            self.assertEqual(6, wikiRender.generateTopics(topics, path=tempDir, overwrite=True, manifest=manifest))
+            with open(f"{tempDir}/Help:Task.wiki") as f:
+                self.assertNotEqual("customized", f.read())
+            self.assertEqual(0, wikiRender.generateTopics(topics, path=tempDir, overwrite=True, manifest=manifest))
+
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
\ No newline at end of file
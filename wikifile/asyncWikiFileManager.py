@@ -0,0 +1,465 @@
+import asyncio
+import os
+import warnings
+
+import aiohttp
+from wikibot3rd.wikiuser import WikiUser
+
+from wikifile.mediaWikiApi import MediaWikiApi
+from wikifile.stats import Stats
+from wikifile.wikiFile import WikiFile
+from wikifile.wikiFileManager import WikiFileManager
+from wikifile.wikiRender import WikiRender
+
+
+class AsyncMediaWikiApi(object):
+    """
+    asyncio client for the MediaWiki action API (api.php) based on an aiohttp session with a connection pool.
+    see MediaWikiApi for the blocking variant
+    """
+
+    def __init__(self, apiUrl:str, maxConnections:int=10, debug:bool=False):
+        """
+        constructor
+
+        Args:
+            apiUrl(str): url of the api.php of the wiki e.g. https://www.openresearch.org/mediawiki/api.php
+            maxConnections(int): maximum number of concurrent connections to the wiki
+            debug(bool): True if debugging should be switched on
+        """
+        self.apiUrl=apiUrl
+        self.maxConnections=maxConnections
+        self.debug=debug
+        self.session=None
+        self.requestCount=0
+        self.csrfToken=None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def getSession(self) -> aiohttp.ClientSession:
+        """
+        get the session of this client - the session is created on first use as it has to be created within the event loop
+
+        Returns:
+            aiohttp.ClientSession
+        """
+        if self.session is None:
+            connector=aiohttp.TCPConnector(limit=self.maxConnections)
+            self.session=aiohttp.ClientSession(connector=connector)
+        return self.session
+
+    async def close(self):
+        """
+        close the session and its connections
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session=None
+
+    async def post(self, params:dict) -> dict:
+        """
+        post the given parameters to the api
+
+        Args:
+            params(dict): api parameters
+
+        Returns:
+            dict: the json response
+        """
+        self.requestCount+=1
+        stats=Stats.getInstance()
+        stats.count("http.calls")
+        with stats.timer("http"):
+            async with self.getSession().post(self.apiUrl, data={**params, "format":"json", "formatversion":"2"}) as response:
+                response.raise_for_status()
+                result=await response.json(content_type=None)
+        return MediaWikiApi.checkResult(result)
+
+    async def query(self, params:dict) -> list:
+        """
+        query the api and follow the continuation of the results
+
+        Args:
+            params(dict): query parameters (without action)
+
+        Returns:
+            list: the query parts of the responses
+        """
+        queryResults=[]
+        continueParams={}
+        while True:
+            result=await self.post({"action":"query", **params, **continueParams})
+            if "query" in result:
+                queryResults.append(result["query"])
+            if "continue" not in result:
+                break
+            continueParams=result["continue"]
+        return queryResults
+
+    async def getPageTexts(self, pageTitles:list, batchSize:int=None) -> dict:
+        """
+        get the wikiText of the given pages - the batches of titles are requested concurrently
+
+        Args:
+            pageTitles(list): titles of the pages
+            batchSize(int): number of titles per request - default is MediaWikiApi.MAX_TITLES_PER_REQUEST
+
+        Returns:
+            dict: wikiText by pageTitle (as given) - None if the page does not exist
+        """
+        if batchSize is None:
+            batchSize=MediaWikiApi.MAX_TITLES_PER_REQUEST
+        pageTitles=list(dict.fromkeys(pageTitles))
+        batches=[pageTitles[offset:offset+batchSize] for offset in range(0, len(pageTitles), batchSize)]
+
+        async def getBatch(batch:list) -> dict:
+            queryResults=await self.query(MediaWikiApi.getPageTextsParams(batch))
+            return MediaWikiApi.getPageTextsOfQueryResults(batch, queryResults)
+
+        pageTexts={}
+        for batchTexts in await asyncio.gather(*[getBatch(batch) for batch in batches]):
+            pageTexts.update(batchTexts)
+        if self.debug:
+            print(f"retrieved {len(pageTitles)} pages from {self.apiUrl} with {len(batches)} requests")
+        return pageTexts
+
+    async def getToken(self, tokenType:str="csrf") -> str:
+        """
+        get a token of the given type
+
+        Args:
+            tokenType(str): type of the token e.g. csrf or login
+
+        Returns:
+            str: the token
+        """
+        queryResults=await self.query({"meta":"tokens", "type":tokenType})
+        return queryResults[0]["tokens"][f"{tokenType}token"]
+
+    async def login(self, user:str, password:str):
+        """
+        login with the given (bot) credentials - the session cookies are used for all following requests
+
+        Args:
+            user(str): name of the user
+            password(str): password of the user
+        """
+        loginToken=await self.getToken("login")
+        result=await self.post({"action":"login", "lgname":user, "lgpassword":password, "lgtoken":loginToken})
+        if result.get("login", {}).get("result") != "Success":
+            raise Exception(f"login of {user} at {self.apiUrl} failed: {result.get('login')}")
+        self.csrfToken=None
+
+    async def edit(self, pageTitle:str, text:str, summary:str) -> dict:
+        """
+        replace the content of the given page
+
+        Args:
+            pageTitle(str): title of the page
+            text(str): the new wikiText
+            summary(str): summary of the edit
+
+        Returns:
+            dict: the edit result
+        """
+        if self.csrfToken is None:
+            self.csrfToken=await self.getToken("csrf")
+        params={"action":"edit", "title":pageTitle, "text":text, "summary":summary, "token":self.csrfToken}
+        try:
+            result=await self.post(params)
+        except Exception as ex:
+            if "badtoken" not in str(ex):
+                raise
+            # the token expired e.g. after a new login
+            self.csrfToken=await self.getToken("csrf")
+            result=await self.post({**params, "token":self.csrfToken})
+        return result.get("edit", {})
+
+
+class AsyncWikiFileManager(object):
+    """
+    asyncio variant of the WikiFileManager - fetches and updates many pages concurrently without threads.
+    The WikiFiles are loaded from the wikiText files at the wikiTextPath or from the source wiki and pushed to the
+    target wiki.
+    """
+
+    def __init__(self, sourceApiUrl:str=None, targetApiUrl:str=None, wikiTextPath:str=None, maxConnections:int=10,
+                 debug:bool=False):
+        """
+        constructor
+
+        Args:
+            sourceApiUrl(str): url of the api.php of the wiki the pages are retrieved from
+            targetApiUrl(str): url of the api.php of the wiki the pages are pushed to - default is the sourceApiUrl
+            wikiTextPath(str): the root of the wikiText directory (e.g. a wikibackup) the pages are looked up first
+            maxConnections(int): maximum number of concurrent connections to each wiki
+            debug(bool): True if debugging should be switched on
+        """
+        if targetApiUrl is None:
+            targetApiUrl=sourceApiUrl
+        self.wikiTextPath=wikiTextPath
+        self.debug=debug
+        self.sourceApi=AsyncMediaWikiApi(sourceApiUrl, maxConnections, debug) if sourceApiUrl else None
+        if targetApiUrl == sourceApiUrl:
+            self.targetApi=self.sourceApi
+        else:
+            self.targetApi=AsyncMediaWikiApi(targetApiUrl, maxConnections, debug)
+        self.targetWikiUser=None
+        self.wikiRender=WikiRender()
+
+    @classmethod
+    def ofWikiIds(cls, sourceWikiId:str, targetWikiId:str=None, wikiTextPath:str=None, maxConnections:int=10,
+                  debug:bool=False) -> 'AsyncWikiFileManager':
+        """
+        create an AsyncWikiFileManager for the wikis with the given ids (see wikiuser of py-3rdparty-mediawiki)
+
+        Args:
+            sourceWikiId(str): id of the wiki the pages are retrieved from
+            targetWikiId(str): id of the wiki the pages are pushed to - its credentials are used by login()
+            wikiTextPath(str): the root of the wikiText directory - default is the wikibackup of the source wiki
+            maxConnections(int): maximum number of concurrent connections to each wiki
+            debug(bool): True if debugging should be switched on
+
+        Returns:
+            AsyncWikiFileManager
+        """
+        getApiUrl=lambda wikiUser: f"{wikiUser.getWikiUrl()}/api.php"
+        sourceWikiUser=WikiUser.ofWikiId(sourceWikiId, lenient=True)
+        targetWikiUser=WikiUser.ofWikiId(targetWikiId, lenient=True) if targetWikiId else None
+        if wikiTextPath is None:
+            home=os.path.expanduser("~")
+            wikiTextPath=f"{home}/wikibackup/{sourceWikiId}"
+        manager=cls(sourceApiUrl=getApiUrl(sourceWikiUser),
+                    targetApiUrl=getApiUrl(targetWikiUser) if targetWikiUser else None,
+                    wikiTextPath=wikiTextPath,
+                    maxConnections=maxConnections,
+                    debug=debug)
+        manager.targetWikiUser=targetWikiUser
+        return manager
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """
+        close the connections to the wikis
+        """
+        if self.sourceApi is not None:
+            await self.sourceApi.close()
+        if self.targetApi is not None and self.targetApi is not self.sourceApi:
+            await self.targetApi.close()
+
+    async def login(self, user:str=None, password:str=None):
+        """
+        login to the target wiki - default are the credentials of the targetWikiId
+
+        Args:
+            user(str): name of the user
+            password(str): password of the user
+        """
+        if user is None and self.targetWikiUser is not None:
+            user=self.targetWikiUser.user
+            password=self.targetWikiUser.getPassword()
+        await self.targetApi.login(user, password)
+
+    def getWikiFileFromBackup(self, pageTitle:str) -> WikiFile:
+        """
+        get the WikiFile of the given page from the wikiText file at the wikiTextPath
+
+        Args:
+            pageTitle(str): title of the page
+
+        Returns:
+            WikiFile or None if the page is not located at the wikiTextPath
+        """
+        if self.wikiTextPath is None:
+            return None
+        wikiText=WikiFile.readWikiText(self.wikiTextPath, pageTitle)
+        if wikiText is None:
+            return None
+        return self.createWikiFile(pageTitle, wikiText)
+
+    def createWikiFile(self, pageTitle:str, wikiText:str) -> WikiFile:
+        """
+        create a WikiFile with the given loaded content - the WikiFile renders missing templates with the wikiRender
+        of this manager
+
+        Args:
+            pageTitle(str): title of the page
+            wikiText(str): the loaded wikiText
+
+        Returns:
+            WikiFile
+        """
+        wikiFile=WikiFile(pageTitle, wikiFileManager=self, wikiText=wikiText, debug=self.debug)
+        wikiFile.markAsLoaded()
+        return wikiFile
+
+    async def getWikiFile(self, pageTitle:str, checkWiki:bool=True) -> WikiFile:
+        """
+        Get the WikiFile of the given page from the wikiTextPath or if it is not located there from the source wiki
+
+        Args:
+            pageTitle(str): title of the page
+            checkWiki(bool): If True pages that are not located at the wikiTextPath are retrieved from the source wiki
+
+        Returns:
+            WikiFile - empty if the page does not exist
+        """
+        wikiFiles=await self.getWikiFiles([pageTitle], checkWiki=checkWiki)
+        return wikiFiles[pageTitle]
+
+    async def getWikiFiles(self, pageTitles:list, checkWiki:bool=True) -> dict:
+        """
+        Get the WikiFiles of the given pages (see getWikiFile) - the pages missing at the wikiTextPath are
+        retrieved with concurrent bulk requests
+
+        Args:
+            pageTitles(list): titles of the pages
+            checkWiki(bool): If True pages that are not located at the wikiTextPath are retrieved from the source wiki
+
+        Returns:
+            dict: WikiFiles by pageTitle
+        """
+        wikiFiles={}
+        missing=[]
+        for pageTitle in pageTitles:
+            wikiFile=self.getWikiFileFromBackup(pageTitle)
+            if wikiFile is None:
+                missing.append(pageTitle)
+            else:
+                wikiFiles[pageTitle]=wikiFile
+        if missing and checkWiki:
+            wikiFiles.update(await self.getWikiFilesFromWiki(missing))
+        for pageTitle in missing:
+            if pageTitle not in wikiFiles:
+                wikiFiles[pageTitle]=self.createWikiFile(pageTitle, "")
+        return {pageTitle:wikiFiles[pageTitle] for pageTitle in pageTitles}
+
+    async def getWikiFileFromWiki(self, pageTitle:str) -> WikiFile:
+        """
+        Get the WikiFile of the given page from the source wiki
+
+        Args:
+            pageTitle(str): title of the page
+
+        Returns:
+            WikiFile - empty if the page does not exist
+        """
+        wikiFiles=await self.getWikiFilesFromWiki([pageTitle])
+        return wikiFiles[pageTitle]
+
+    async def getWikiFilesFromWiki(self, pageTitles:list) -> dict:
+        """
+        Get the WikiFiles of the given pages from the source wiki
+
+        Args:
+            pageTitles(list): titles of the pages
+
+        Returns:
+            dict: WikiFiles by pageTitle - pages that do not exist are empty
+        """
+        if self.sourceApi is None:
+            raise Exception("no source wiki to retrieve the pages from - the AsyncWikiFileManager has no sourceApiUrl")
+        pageTexts=await self.sourceApi.getPageTexts(pageTitles)
+        return {pageTitle:self.createWikiFile(pageTitle, wikiText if wikiText is not None else "") for pageTitle, wikiText in pageTexts.items()}
+
+    async def pushWikiFileToWiki(self, wikiFile:WikiFile, updateMsg:str, retries:int=3, backoff:float=1.0) -> dict:
+        """
+        Pushes the content of the given wikiFile to the target wiki and retries edits that failed with a transient
+        error (see MediaWikiApi.isTransientError) with exponential backoff
+
+        Args:
+            wikiFile(WikiFile): the WikiFile that should be pushed to the wiki
+            updateMsg(str): Summary of the update (shown as comment in the history of the page)
+            retries(int): number of retries of an edit that failed with a transient error
+            backoff(float): seconds to wait before the first retry - doubled with each further retry
+
+        Returns:
+            dict: push result with pageTitle, status, attempts and error (see WikiFileManager.pushWikiFileToWiki)
+        """
+        pageTitle=wikiFile.getPageTitle()
+        result={"pageTitle":pageTitle, "status":"failed", "attempts":0, "error":None}
+        while result["attempts"] <= retries:
+            result["attempts"]+=1
+            try:
+                await self.targetApi.edit(pageTitle, str(wikiFile), updateMsg)
+                wikiFile.markAsLoaded()
+                result["status"]="success"
+                result["error"]=None
+                break
+            except Exception as ex:
+                result["error"]=str(ex)
+                if self.debug:
+                    print(f"push of {pageTitle} failed (attempt {result['attempts']}): {ex}")
+                if not (MediaWikiApi.isTransientError(ex) or isinstance(ex, aiohttp.ClientConnectionError)):
+                    # e.g. protected page or missing permission - a retry fails in the same way
+                    break
+                if result["attempts"] <= retries:
+                    await asyncio.sleep(backoff*2**(result["attempts"]-1))
+        return result
+
+    async def pushWikiFilesToWiki(self, wikiFiles:list, updateMsg:str=None, concurrency:int=10, retries:int=3,
+                                  backoff:float=1.0, skipUnchanged:bool=True) -> list:
+        """
+        Pushes the content of the given wikiFiles concurrently to the target wiki.
+        WikiFiles that were not modified since they were loaded are skipped (see WikiFile.isModified())
+
+        Args:
+            wikiFiles(list): WikiFiles that should be pushed to the wiki
+            updateMsg(str): Summary of the update (shown as comment in the history of the pages)
+            concurrency(int): maximum number of edits in progress
+            retries(int): number of retries of a failed edit
+            backoff(float): seconds to wait before the first retry - doubled with each further retry
+            skipUnchanged(bool): If True unmodified WikiFiles are not pushed
+
+        Returns:
+            list: push report in the order of the given WikiFiles (see WikiFileManager.pushWikiFilesToWiki)
+        """
+        if updateMsg is None:
+            updateMsg="modified through AsyncWikiFileManager"
+        semaphore=asyncio.Semaphore(max(1, concurrency))
+
+        async def pushPage(wikiFile:WikiFile) -> dict:
+            if skipUnchanged and not wikiFile.isModified():
+                return {"pageTitle":wikiFile.getPageTitle(), "status":"skipped", "attempts":0, "error":None}
+            async with semaphore:
+                return await self.pushWikiFileToWiki(wikiFile, updateMsg, retries, backoff)
+
+        wikiFiles=[wikiFile for wikiFile in wikiFiles if isinstance(wikiFile, WikiFile)]
+        report=list(await asyncio.gather(*[pushPage(wikiFile) for wikiFile in wikiFiles]))
+        if self.debug:
+            print(f"pushed pages: {WikiFileManager.getPushSummary(report)}")
+        failures=[result for result in report if result["status"] == "failed"]
+        if failures:
+            warnings.warn(f"failed to push {len(failures)} of {len(report)} pages: {[result['pageTitle'] for result in failures]}", Warning)
+        return report
+
+    async def updatePageWikiSON(self, pageTitle:str, wikiSonEntity:str, props:dict, updateMsg:str=None) -> dict:
+        """
+        updates the given wikiSonEntity in the page under the given pageTitle with the given properties
+        (see WikiPage.updatePageWikiSON)
+
+        Args:
+            pageTitle(str): title of the page to update
+            wikiSonEntity(str): name of the wikiSON entity to update
+            props(dict): values that should be used to update the WikiSon. Value None deletes a property
+            updateMsg(str): update message to show in the page revisions
+
+        Returns:
+            dict: push result - the status is skipped if the update does not change the page
+        """
+        wikiFile=await self.getWikiFileFromWiki(pageTitle)
+        wikiFile.updateTemplate(wikiSonEntity, props, prettify=True, overwrite=True)
+        if not wikiFile.isModified():
+            return {"pageTitle":wikiFile.getPageTitle(), "status":"skipped", "attempts":0, "error":None}
+        if updateMsg is None:
+            updateMsg="modified through AsyncWikiFileManager"
+        return await self.pushWikiFileToWiki(wikiFile, updateMsg)
@@ -0,0 +1,195 @@
+'''
+reproducible benchmark of the extraction, rendering and update hot paths on a synthetic wikiText backup
+
+usage: python -m wikifile.benchmark --pages 10000 --topics 3 --subobjects 2 --nesting 1
+'''
+import json
+import os
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+
+from wikifile.syntheticWiki import SyntheticWiki
+from wikifile.wikiFile import WikiFile
+from wikifile.wikiFileManager import WikiFileManager
+from wikifile.wikiRender import WikiRender
+
+try:
+    import resource
+except ImportError:
+    # not available on windows
+    resource = None
+
+
+class Benchmark(object):
+    """
+    measures the throughput of the extraction, rendering and update hot paths on the pages of a SyntheticWiki.
+    The extraction and update stages work on the entity template of the first topic, which is on every
+    len(topics)-th page, and the generateTopic stage renders the topics of the SyntheticWiki
+    """
+    STAGES = ["extractTemplate", "extractTemplate (wikitextparser)", "exportWikiSonToLOD", "updateTemplate", "generateTopic"]
+
+    def __init__(self, syntheticWiki: SyntheticWiki, workers: int = 1, debug: bool = False):
+        """
+        constructor
+
+        Args:
+            syntheticWiki(SyntheticWiki): the generator of the backup and the topics the stages work on
+            workers(int): number of worker processes of the extraction stages
+            debug(bool): True if debugging should be switched on
+        """
+        self.syntheticWiki = syntheticWiki
+        self.templateName = syntheticWiki.getTopic(0).name
+        self.workers = workers
+        self.debug = debug
+
+    @staticmethod
+    def getPeakRSS() -> int:
+        """
+        Returns:
+            int: the peak resident set size of this process in bytes - None if it is not available
+        """
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # linux reports kilobytes macOS bytes
+        return peak if sys.platform == "darwin" else peak*1024
+
+    def measure(self, stage: str, func) -> dict:
+        """
+        measure the given stage
+
+        Args:
+            stage(str): name of the stage
+            func: function that runs the stage and returns the number of processed items
+
+        Returns:
+            dict: stage, items, seconds, itemsPerSecond and peakRSS
+        """
+        start = time.perf_counter()
+        items = func()
+        seconds = time.perf_counter()-start
+        result = {
+            "stage": stage,
+            "items": items,
+            "seconds": round(seconds, 4),
+            "itemsPerSecond": round(items/seconds, 1) if seconds > 0 else None,
+            "peakRSS": Benchmark.getPeakRSS()
+        }
+        if self.debug:
+            print(result)
+        return result
+
+    def run(self, stages: list = None) -> list:
+        """
+        run the given stages on a freshly generated backup
+
+        Args:
+            stages(list): names of the stages to run - default are all STAGES
+
+        Returns:
+            list: the results of the stages (see measure) - the first result is the generation of the backup
+        """
+        if stages is None:
+            stages = Benchmark.STAGES
+        templateName = self.templateName
+        results = []
+        with tempfile.TemporaryDirectory() as tempDir:
+            wikiTextPath = os.path.join(tempDir, "backup")
+            pageTitles = self.syntheticWiki.getPageTitles()
+            results.append(self.measure("generateBackup", lambda: len(self.syntheticWiki.write(wikiTextPath))))
+
+            def extract(fastScan: bool) -> int:
+                if fastScan:
+                    for _pageTitle, _records in WikiFile.extractTemplateFromFiles(wikiTextPath, pageTitles, templateName, workers=self.workers):
+                        pass
+                else:
+                    for pageTitle in pageTitles:
+                        WikiFile(pageTitle, wikiText=WikiFile.readWikiText(wikiTextPath, pageTitle)).extractTemplate(templateName, fastScan=False)
+                return len(pageTitles)
+
+            def export() -> int:
+                wikiFileManager = WikiFileManager(sourceWikiId=None, wikiTextPath=wikiTextPath, login=False)
+                wikiFileManager.exportWikiSonToLOD(pageTitles, templateName, properties=[], workers=self.workers)
+                return len(pageTitles)
+
+            def update() -> int:
+                # pages without the template get it added which needs the renderer of the manager
+                wikiFileManager = WikiFileManager(sourceWikiId=None, wikiTextPath=wikiTextPath, login=False)
+                for pageTitle in pageTitles:
+                    wikiFile = wikiFileManager.getWikiFile(pageTitle, checkWiki=False)
+                    wikiFile.updateTemplate(templateName, {"City": "Aachen", "year": "2022"}, overwrite=True)
+                    str(wikiFile)
+                return len(pageTitles)
+
+            def generate() -> int:
+                outputPath = os.path.join(tempDir, "generated")
+                wikiRender = WikiRender()
+                for topic in self.syntheticWiki.topics:
+                    wikiRender.generateTopic(topic, outputPath, overwrite=True)
+                return len(os.listdir(outputPath))
+
+            stageFunctions = {
+                "extractTemplate": lambda: extract(fastScan=True),
+                "extractTemplate (wikitextparser)": lambda: extract(fastScan=False),
+                "exportWikiSonToLOD": export,
+                "updateTemplate": update,
+                "generateTopic": generate
+            }
+            for stage in stages:
+                if stage not in stageFunctions:
+                    raise Exception(f"unknown benchmark stage {stage} - available stages are {', '.join(Benchmark.STAGES)}")
+                results.append(self.measure(stage, stageFunctions[stage]))
+        return results
+
+    @staticmethod
+    def formatResults(results: list) -> str:
+        """
+        format the given results as table
+
+        Args:
+            results(list): results of run()
+
+        Returns:
+            str: the table
+        """
+        lines = [f"{'stage':<34}{'items':>8}{'seconds':>10}{'items/s':>12}{'peak RSS MB':>13}"]
+        for result in results:
+            peakRSS = f"{result['peakRSS']/2**20:.1f}" if result["peakRSS"] is not None else "-"
+            itemsPerSecond = result["itemsPerSecond"] if result["itemsPerSecond"] is not None else "-"
+            lines.append(f"{result['stage']:<34}{result['items']:>8}{result['seconds']:>10.3f}{itemsPerSecond:>12}{peakRSS:>13}")
+        return "\n".join(lines)
+
+
+def main(argv=None):
+    '''
+    command line entry point
+    '''
+    parser = ArgumentParser(description="benchmark the extraction, rendering and update of wikiText pages on a synthetic backup")
+    parser.add_argument("--pages", type=int, default=1000, help="number of pages of the synthetic backup")
+    parser.add_argument("--topics", type=int, default=3, help="number of topics - the extracted template is on every topics-th page")
+    parser.add_argument("--propertiesPerTopic", type=int, default=6, help="number of properties of each topic")
+    parser.add_argument("--subobjects", type=int, default=2, help="maximum number of subobjects of each page")
+    parser.add_argument("--nesting", type=int, default=1, help="depth of the nested parser functions of each page")
+    parser.add_argument("--paragraphs", type=int, default=3, help="number of free text paragraphs of each page")
+    parser.add_argument("--seed", type=int, default=42, help="seed of the synthetic backup")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes of the extraction stages")
+    parser.add_argument("--stages", nargs="+", default=None, help=f"stages to run - default: {', '.join(Benchmark.STAGES)}")
+    parser.add_argument("--json", dest="json_file", help="store the results in the given json file")
+    parser.add_argument("--debug", action="store_true", default=False, help="Enable debug mode")
+    args = parser.parse_args(argv)
+    syntheticWiki = SyntheticWiki(pages=args.pages, topics=SyntheticWiki.getTopics(args.topics, args.propertiesPerTopic),
+                                  subobjects=args.subobjects, nesting=args.nesting, paragraphs=args.paragraphs,
+                                  seed=args.seed)
+    benchmark = Benchmark(syntheticWiki, workers=args.workers, debug=args.debug)
+    results = benchmark.run(args.stages)
+    print(Benchmark.formatResults(results))
+    if args.json_file:
+        with open(args.json_file, mode="w") as file:
+            json.dump({"parameters": vars(args), "results": results}, file, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import os
+
+
+class BuildManifest(object):
+    """
+    Records the fingerprints of the inputs the generated pages of a target directory were rendered from.
+    Allows to skip the rendering of pages whose inputs did not change since the last run.
+    """
+    MANIFEST_FILE=".wikirender-manifest.json"
+
+    def __init__(self, path:str, manifestFile:str=None, debug:bool=False):
+        """
+        constructor
+
+        Args:
+            path(str): the directory the generated pages are stored in
+            manifestFile(str): the json file to store the manifest in - default is MANIFEST_FILE in the given path
+            debug(bool): True if debugging should be switched on
+        """
+        self.path=path
+        if manifestFile is None:
+            manifestFile=os.path.join(path, BuildManifest.MANIFEST_FILE)
+        self.manifestFile=manifestFile
+        self.debug=debug
+        self.fingerprints={}
+        if os.path.isfile(manifestFile):
+            with open(manifestFile) as file:
+                self.fingerprints=json.load(file).get("pages", {})
+
+    def save(self):
+        """
+        store the manifest
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.manifestFile)), exist_ok=True)
+        with open(self.manifestFile, mode="w") as file:
+            json.dump({"pages":self.fingerprints}, file, indent=2, sort_keys=True)
+
+    @staticmethod
+    def getFingerprint(*inputs) -> str:
+        """
+        get the fingerprint of the given inputs
+
+        Args:
+            inputs: json serializable inputs (other values are serialized by their string representation)
+
+        Returns:
+            str: hex digest of the inputs
+        """
+        serialized=json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha1(serialized.encode()).hexdigest()
+
+    @staticmethod
+    def getKeptFingerprint(fingerprint:str) -> str:
+        """
+        get the fingerprint recorded for an existing page that was kept instead of being replaced by the page
+        generated from inputs with the given fingerprint
+        """
+        return BuildManifest.getFingerprint("kept", fingerprint)
+
+    def isUpToDate(self, pageTitles:list, fingerprint:str, overwrite:bool=True) -> bool:
+        """
+        Checks if the given pages were generated from inputs with the given fingerprint and still exist
+
+        Args:
+            pageTitles(list): titles of the generated pages
+            fingerprint(str): fingerprint of the current inputs
+            overwrite(bool): If False existing pages that were kept by a run without overwrite are up to date
+
+        Returns:
+            True if the pages do not need to be regenerated
+        """
+        fingerprints={fingerprint}
+        if not overwrite:
+            fingerprints.add(BuildManifest.getKeptFingerprint(fingerprint))
+        for pageTitle in pageTitles:
+            if self.fingerprints.get(pageTitle) not in fingerprints:
+                return False
+            if not os.path.isfile(os.path.join(self.path, f"{pageTitle}.wiki")):
+                return False
+        return True
+
+    def update(self, pageTitles:list, fingerprint:str, kept:bool=False):
+        """
+        record that the given pages were generated from inputs with the given fingerprint
+
+        Args:
+            pageTitles(list): titles of the generated pages
+            fingerprint(str): fingerprint of the inputs
+            kept(bool): If True the existing pages were kept instead of being replaced by the generated pages
+        """
+        if kept:
+            fingerprint=BuildManifest.getKeptFingerprint(fingerprint)
+        for pageTitle in pageTitles:
+            self.fingerprints[pageTitle]=fingerprint
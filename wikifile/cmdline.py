@@ -4,19 +4,27 @@ import os
 import sys
 import logging
 
+from wikifile.parseCache import ParseCache
+from wikifile.stats import Stats
+from wikifile.wikiFile import WikiFile
+
 class CmdLineAble(object):
     """
     Bundles methods that are required by the command line tools that this file provides
     """
 
     def __init__(self):
-        pass
+        # the timers and counters of this process see Stats
+        self.stats=Stats.getInstance()
         
-    def getParser(self):
+    def getParser(self, multipleTemplates:bool=False):
         '''
         setup my argument parser
         
         sets self.parser as a side effect
+
+        Args:
+            multipleTemplates(bool): If True the template option can be given multiple times and args.template is a list
         
         Returns:
             ArgumentParser: the argument parser
@@ -32,12 +40,20 @@ class CmdLineAble(object):
                             required=False)
         parser.add_argument("--listFile", dest="file_list",
                                  help="List of pages from which the data should be extracted", required=False)
-        parser.add_argument("-t", "--template", dest="template",
+        if multipleTemplates:
+            parser.add_argument("-t", "--template", dest="template", action="append",
+                                help="Select a template (entity) to use for filtering - can be given multiple times")
+        else:
+            parser.add_argument("-t", "--template", dest="template",
                                  help="Select a template (entity) to user for rendering/filtering")
 
         parser.add_argument('-stdin', dest="stdin", action='store_true',
                             help='Use the input from STD IN using pipes')
         parser.add_argument('--debug', dest="debug", action='store_true', default=False, help="Enable debug mode")
+        parser.add_argument('--parseCache', dest="parse_cache", nargs="?", const="",
+                            help="Cache the parses of the pages - if a directory is given the parses are also stored there to reuse them in later runs")
+        parser.add_argument('--stats', dest="stats_file",
+                            help="Store the timers and counters of the run as json in the given file (- for stderr)")
         self.parser=parser
         return parser
 
@@ -51,6 +67,30 @@ class CmdLineAble(object):
         else:
             logging.basicConfig(stream=sys.stdout, level=logging.INFO)
 
+    def initParseCache(self,args):
+        '''
+        enable the cache of the parses of the pages with --parseCache - the parses are persisted in the given directory
+        '''
+        parseCache=getattr(args, "parse_cache", None)
+        if parseCache is not None:
+            WikiFile.parseCache=ParseCache(cacheDir=parseCache or None, debug=args.debug)
+
+    def initStats(self,args):
+        '''
+        switch the recording of the timers and counters on if they are requested with --stats
+        '''
+        if getattr(args, "stats_file", None):
+            self.stats.reset()
+            self.stats.enable()
+
+    def writeStats(self,args):
+        '''
+        store the timers and counters of the run if they are requested with --stats
+        '''
+        if getattr(args, "stats_file", None):
+            self.stats.write(args.stats_file)
+            self.stats.enable(False)
+
     def getPageTitlesForArgs(self,args):
         '''
         see also wikirestore in wikipush of py-3rdparty-mediawiki
@@ -73,14 +113,14 @@ class CmdLineAble(object):
             page_titles = sys.stdin.readlines()
             pageTitlesfix = []
             for page in page_titles:
-                pageTitlesfix.append(page)
+                pageTitlesfix.append(page.rstrip("\n"))
             page_titles = pageTitlesfix
         elif file_list is not None:
             f = open(file_list, 'r')
             allx = f.readlines()
             page_titles = []
             for page in allx:
-                page_titles.append(page)
+                page_titles.append(page.rstrip("\n"))
         else:
             if page_titles is None:
                 page_titles=CmdLineAble.getPageTitlesForWikiTextPath(args.backupPath)
@@ -0,0 +1,139 @@
+import csv
+import json
+import os
+
+
+class ColumnarTable(object):
+    """
+    Column oriented table of WikiSon records. The records are added to per property column arrays directly during the
+    extraction so that missing values do not have to be padded into each record dict and large exports can be written
+    as columnar file (csv, json or parquet) for analytics consumers.
+    """
+
+    def __init__(self, columns:list=None, limitColumns:bool=False):
+        """
+        constructor
+
+        Args:
+            columns(list): names of the columns in the order they should appear. Keys of the added records that are not in the list are appended as new columns
+            limitColumns(bool): If True only the given columns are recorded and all other keys of the records are ignored
+        """
+        self.columns={}
+        self.rowCount=0
+        self.limitColumns=limitColumns
+        if columns is not None:
+            for column in columns:
+                self.columns[column]=[]
+
+    def __len__(self):
+        return self.rowCount
+
+    def addRecord(self, record:dict):
+        """
+        add the given record as new row
+
+        Args:
+            record(dict): the values of the row by column name
+        """
+        for key, value in record.items():
+            column=self.columns.get(key)
+            if column is None:
+                if self.limitColumns:
+                    continue
+                # new column - the previous rows have no value for it
+                column=[None]*self.rowCount
+                self.columns[key]=column
+            column.append(value)
+        self.rowCount+=1
+        for column in self.columns.values():
+            if len(column) < self.rowCount:
+                column.append(None)
+
+    def getColumnNames(self) -> list:
+        """
+        Returns:
+            list: the names of the columns
+        """
+        return list(self.columns.keys())
+
+    def getColumn(self, name:str) -> list:
+        """
+        get the values of the given column
+
+        Args:
+            name(str): name of the column
+
+        Returns:
+            list: the values of all rows
+        """
+        return self.columns[name]
+
+    def getRows(self):
+        """
+        Returns:
+            generator of the rows as tuples in the order of the column names
+        """
+        return zip(*self.columns.values())
+
+    def getRecords(self):
+        """
+        Returns:
+            generator of the rows as dicts - all dicts have a value for each column
+        """
+        names=self.getColumnNames()
+        for row in self.getRows():
+            yield dict(zip(names, row))
+
+    def write(self, filePath:str):
+        """
+        write the table to the given file - the format is selected by the file extension (.csv, .json or .parquet)
+
+        Args:
+            filePath(str): path of the file
+        """
+        extension=os.path.splitext(filePath)[1].lower()
+        writers={
+            ".csv": self.toCsv,
+            ".json": self.toJson,
+            ".parquet": self.toParquet
+        }
+        if extension not in writers:
+            raise Exception(f"Unsupported columnar file format '{extension}' - use one of {', '.join(writers.keys())}")
+        writers[extension](filePath)
+
+    def toCsv(self, filePath:str):
+        """
+        write the table as csv file with a header row
+
+        Args:
+            filePath(str): path of the file
+        """
+        with open(filePath, mode="w", newline="") as file:
+            writer=csv.writer(file)
+            writer.writerow(self.getColumnNames())
+            writer.writerows(self.getRows())
+
+    def toJson(self, filePath:str):
+        """
+        write the table as column oriented json {"rowCount": n, "columns": {name: [values]}}
+
+        Args:
+            filePath(str): path of the file
+        """
+        with open(filePath, mode="w") as file:
+            json.dump({"rowCount":self.rowCount, "columns":self.columns}, file, default=str)
+
+    def toParquet(self, filePath:str):
+        """
+        write the table as parquet file - requires the optional dependency pyarrow
+
+        Args:
+            filePath(str): path of the file
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise Exception("The parquet export needs pyarrow - install it with: pip install pyarrow")
+        table=pyarrow.table({name:pyarrow.array(values, type=pyarrow.string()) for name, values in self.columns.items()})
+        pyarrow.parquet.write_table(table, filePath)
@@ -0,0 +1,195 @@
+import re
+
+import requests
+
+from wikifile.stats import Stats
+
+
+class MediaWikiApi(object):
+    """
+    Minimal client for the MediaWiki action API (api.php) that uses a connection pooled requests session.
+    Allows to retrieve the content of many pages with few requests.
+    see https://www.mediawiki.org/wiki/API:Revisions
+    """
+    # maximum number of titles per query for users without apihighlimits
+    MAX_TITLES_PER_REQUEST=50
+    # api error codes of a lagging, rate limiting or read only wiki - a later retry of the request might succeed
+    TRANSIENT_ERROR_CODES=["maxlag", "ratelimited", "readonly"]
+
+    def __init__(self, apiUrl:str, session:requests.Session=None, debug:bool=False):
+        """
+        constructor
+
+        Args:
+            apiUrl(str): url of the api.php of the wiki e.g. https://www.openresearch.org/mediawiki/api.php
+            session(requests.Session): session to use - if None a new session is created. Use the session of a logged in client to access pages that require a login
+            debug(bool): True if debugging should be switched on
+        """
+        self.apiUrl=apiUrl
+        if session is None:
+            session=requests.Session()
+        self.session=session
+        self.debug=debug
+        self.requestCount=0
+
+    @classmethod
+    def ofWikiClient(cls, wikiClient, debug:bool=False) -> 'MediaWikiApi':
+        """
+        create a MediaWikiApi for the given WikiClient reusing the connection (and login) of its mwclient site
+
+        Args:
+            wikiClient(WikiClient): the client of the wiki
+            debug(bool): True if debugging should be switched on
+
+        Returns:
+            MediaWikiApi
+        """
+        site=wikiClient.getSite()
+        apiUrl=f"{site.scheme}://{site.host}{site.path}api{site.ext}"
+        return cls(apiUrl, session=site.connection, debug=debug)
+
+    def post(self, params:dict) -> dict:
+        """
+        post the given parameters to the api
+
+        Args:
+            params(dict): api parameters
+
+        Returns:
+            dict: the json response
+        """
+        self.requestCount+=1
+        stats=Stats.getInstance()
+        stats.count("http.calls")
+        with stats.timer("http"):
+            response=self.session.post(self.apiUrl, data={**params, "format":"json", "formatversion":"2"})
+        response.raise_for_status()
+        return MediaWikiApi.checkResult(response.json())
+
+    @staticmethod
+    def checkResult(result:dict) -> dict:
+        """
+        check the given api response for errors
+
+        Args:
+            result(dict): the json response
+
+        Returns:
+            dict: the given response
+
+        Raises:
+            Exception: if the api returned an error
+        """
+        if "error" in result:
+            error=result["error"]
+            raise Exception(f"MediaWiki api error {error.get('code')}: {error.get('info')}")
+        return result
+
+    @staticmethod
+    def isTransientError(ex:Exception) -> bool:
+        """
+        check whether the given error of a request is transient so that it is worth to retry the request.
+        Connection errors, timeouts, http status 429 and 5xx and the api errors TRANSIENT_ERROR_CODES are transient.
+        Other errors e.g. protectedpage, permissiondenied or a failed login fail in the same way on each retry.
+
+        Args:
+            ex(Exception): the error of the request
+
+        Returns:
+            bool: True if the request should be retried
+        """
+        if isinstance(ex, (requests.ConnectionError, requests.Timeout, ConnectionError, TimeoutError)):
+            return True
+        response=getattr(ex, "response", None)
+        # requests errors have a response with a status_code - aiohttp errors a status
+        status=getattr(response, "status_code", None) if response is not None else getattr(ex, "status", None)
+        if isinstance(status, int):
+            return status == 429 or status >= 500
+        codes="|".join(MediaWikiApi.TRANSIENT_ERROR_CODES)
+        return re.search(rf"\b({codes})\b", str(ex)) is not None
+
+    def query(self, params:dict):
+        """
+        query the api and follow the continuation of the results
+
+        Args:
+            params(dict): query parameters (without action)
+
+        Returns:
+            generator of the query parts of the responses
+        """
+        continueParams={}
+        while True:
+            result=self.post({"action":"query", **params, **continueParams})
+            if "query" in result:
+                yield result["query"]
+            if "continue" not in result:
+                break
+            continueParams=result["continue"]
+
+    def getPageTexts(self, pageTitles:list, batchSize:int=None) -> dict:
+        """
+        get the wikiText of the given pages with one request per batch of titles
+
+        Args:
+            pageTitles(list): titles of the pages
+            batchSize(int): number of titles per request - default is MAX_TITLES_PER_REQUEST
+
+        Returns:
+            dict: wikiText by pageTitle (as given) - None if the page does not exist
+        """
+        if batchSize is None:
+            batchSize=MediaWikiApi.MAX_TITLES_PER_REQUEST
+        pageTitles=list(dict.fromkeys(pageTitles))
+        pageTexts={}
+        for offset in range(0, len(pageTitles), batchSize):
+            batch=pageTitles[offset:offset+batchSize]
+            queryResults=list(self.query(MediaWikiApi.getPageTextsParams(batch)))
+            pageTexts.update(MediaWikiApi.getPageTextsOfQueryResults(batch, queryResults))
+            if self.debug:
+                print(f"retrieved {len(batch)} pages from {self.apiUrl}")
+        return pageTexts
+
+    @staticmethod
+    def getPageTextsParams(pageTitles:list) -> dict:
+        """
+        get the query parameters to retrieve the content of the given pages
+
+        Args:
+            pageTitles(list): titles of the pages (at most MAX_TITLES_PER_REQUEST)
+
+        Returns:
+            dict: query parameters
+        """
+        return {
+            "prop":"revisions",
+            "rvprop":"content",
+            "rvslots":"main",
+            "titles":"|".join(pageTitles)
+        }
+
+    @staticmethod
+    def getPageTextsOfQueryResults(pageTitles:list, queryResults:list) -> dict:
+        """
+        get the wikiText of the given pages from the given revision query results
+
+        Args:
+            pageTitles(list): the requested titles
+            queryResults(list): query parts of the responses
+
+        Returns:
+            dict: wikiText by pageTitle (as given) - None if the page does not exist
+        """
+        normalized={}
+        texts={}
+        for queryResult in queryResults:
+            for normalization in queryResult.get("normalized", []):
+                normalized[normalization["from"]]=normalization["to"]
+            for page in queryResult.get("pages", []):
+                revisions=page.get("revisions")
+                if revisions:
+                    revision=revisions[0]
+                    # the slots are only available since MediaWiki 1.32
+                    content=revision.get("slots", {}).get("main", {}).get("content", revision.get("content"))
+                    texts[page["title"]]=content
+        return {pageTitle:texts.get(normalized.get(pageTitle, pageTitle)) for pageTitle in pageTitles}
@@ -8,6 +8,7 @@ import re
 import sys
 import pkgutil
 from datetime import datetime
+from types import MappingProxyType
 from lodstorage.jsonable import Types, JSONAble, JSONAbleList
 from wikifile.smw import SMW, Query
 
@@ -86,6 +87,19 @@ class MetaModelElement(JSONAble):
             para_map.update(para_item)
         return para_map
 
+    @staticmethod
+    def get_attributes(element) -> dict:
+        """
+        Returns the attributes of the given element
+        Args:
+            element: MetaModelElement or slot based compact element (see CompactMetaModelElement)
+        Returns:
+            dict of the attribute values by name
+        """
+        if hasattr(element, "__dict__"):
+            return element.__dict__
+        return {name: getattr(element, name) for name in element.__slots__ if hasattr(element, name)}
+
     @staticmethod
     def get_prop_list_from_samples(samples: list):
         """Returns a list of used keys by the given list of dicts"""
@@ -118,6 +132,9 @@ class MetaModelElement(JSONAble):
         else:
             return None
 
+    # parsed read-only metamodel definitions by file name see get_metamodel_definition()
+    metamodel_definitions = {}
+
     @staticmethod
     def get_metamodel_definition(file_name:str):
         '''
@@ -126,11 +143,33 @@ class MetaModelElement(JSONAble):
             file_name: name of the file that contains the requested metamodel definitions
 
         Returns:
+            the read-only definition (tuples and MappingProxyTypes) - the bundled file is only loaded once per process
+            and the definition is shared so callers copy what they want to change e.g. with dict(record)
+        '''
+        definition = MetaModelElement.metamodel_definitions.get(file_name)
+        if definition is None:
+            template = pkgutil.get_data(__name__, f"resources/metamodel/{file_name}")
+            definition = MetaModelElement.freeze(json.loads(template))
+            MetaModelElement.metamodel_definitions[file_name] = definition
+        return definition
 
+    @staticmethod
+    def freeze(value):
+        '''
+        Returns a read-only view of the given parsed json value - lists become tuples and dicts MappingProxyTypes
+        '''
+        if isinstance(value, dict):
+            return MappingProxyType({key: MetaModelElement.freeze(item) for key, item in value.items()})
+        if isinstance(value, list):
+            return tuple(MetaModelElement.freeze(item) for item in value)
+        return value
+
+    @staticmethod
+    def clear_metamodel_cache():
+        '''
+        clear the cached metamodel definitions
         '''
-        template = pkgutil.get_data(__name__, f"resources/metamodel/{file_name}")
-        dict = json.loads(template)
-        return dict
+        MetaModelElement.metamodel_definitions.clear()
 
     @staticmethod
     def get_metamodels():
@@ -223,34 +262,25 @@ class Topic(MetaModelElement):
         Returns:
             Returns page name of this topic.
         """
-        return super(Topic, self).get_pageTitle("Concept", withNamespace)
+        return MetaModelElement.get_pageTitle(self, "Concept", withNamespace)
 
 
     def get_related_topics(self, properties):
         """
         Returns a list of names of topics that are related to this topic.
         Args:
-            properties: List of all properties of the wiki
+            properties: PropertyIndex or list of all properties of the wiki
 
         Returns:
             list of names of related topics
         """
-        res = set([])
-        for p in UML.get_outgoing_edges(self.name, properties):
-            # source (self) --> target
-            res.add(p['target'])
-        for p in UML.get_incoming_edges(self.name, properties):
-            # source --> target (self)
-            res.add(p['source'])
-        if self.name in res:
-            res.remove(self.name)
-        return res
+        return MetaModelGraph.of(properties).get_related_topics(self.name)
 
     def render_entity(self, oneliner=True):
         """Render tis topic to its template representation"""
         separator = "" if oneliner else "\n"
         res = "{{Topic" + separator
-        res += SMW.render_parameters(oneliner, **MetaModelElement.get_parameters(self.__dict__, self.propList))
+        res += SMW.render_parameters(oneliner, **MetaModelElement.get_parameters(MetaModelElement.get_attributes(self), self.propList))
         return res + "}}"
 
     def get_page_link(self, withLabel=True, withDescription=False):
@@ -287,6 +317,40 @@ class Topic(MetaModelElement):
         topic.properties=properties
         return topic
 
+    @classmethod
+    def list_from_wiki_json(cls, topic_json, prop_json=None, compact: bool = False) -> list:
+        """
+        Parse all topics of the given topic_json and assign each topic the properties of the given prop_json that
+        are used for it.
+        Args:
+            topic_json: json string containing all topics e.g. of a context
+            prop_json: json string containing the properties of the topics
+            compact: If True the topics and properties are returned as CompactTopic and CompactProperty
+
+        Returns:
+            list of Topic objects
+        """
+        key = "data"
+        t=TopicList(listname=key)
+        t.fromJson(topic_json, t.getTypes())
+        topics=t.getList()
+        properties = []
+        if prop_json:
+            p=PropertyList(listname=key)
+            p.fromJson(prop_json, p.getTypes(key))
+            properties=p.getList()
+        propertiesByTopic={}
+        for property in properties:
+            topicNames={usedFor[len("Concept:"):] if usedFor.startswith("Concept:") else usedFor for usedFor in property.is_used_for()}
+            for topicName in topicNames:
+                propertiesByTopic.setdefault(topicName, []).append(property)
+        for topic in topics:
+            topic.properties=propertiesByTopic.get(topic.name, [])
+        if compact:
+            compact_properties={}
+            topics=[CompactTopic.of(topic, compact_properties) for topic in topics]
+        return topics
+
     @classmethod
     def from_dict(cls, topicRecord:dict, props:dict=None):
         """
@@ -442,34 +506,43 @@ class Property(MetaModelElement):
         Returns:
             Returns page name of this property.
         """
-        return super(Property, self).get_pageTitle(self.__class__.__name__, withNamespace)
+        return MetaModelElement.get_pageTitle(self, "Property", withNamespace)
 
 
     @staticmethod
     def get_property_properties():
         """Returns the properties that describe properties"""
-        properties_json = json.loads(pkgutil.get_data("wikifile", "/resources/metamodel/Property_properties.json"))
+        properties_json = MetaModelElement.get_metamodel_definition("Property_properties.json")
         properties = [Property(x) for x in properties_json]
         # Add pageTitle
         for property in properties:
             property.__dict__["pageTitle"] = f"Property:Property {property.name}"
         return properties
 
+    @staticmethod
+    def get_topic_properties(entity_name: str, properties) -> list:
+        """
+        Returns the properties that are used by the given entity in the order of the given properties
+        Args:
+            entity_name: name of the entity
+            properties: PropertyIndex or list of all properties - a list is scanned
+        """
+        if isinstance(properties, PropertyIndex):
+            return properties.get_topic_properties(entity_name)
+        return [property for property in properties or [] if f"Concept:{entity_name}" in property.is_used_for()]
+
     @staticmethod
     def get_entity_properties(entity_name: str, properties: list):
         """
         Extracts the properties of an entity form the given property list
         Args:
             entity_name: Name of the property for which the properties should be extracted
-            properties: List of all properties
+            properties: PropertyIndex or list of all properties
 
         Returns:
             List of all properties the are used by the given entity
         """
-        res = []
-        for property in properties:
-            if f"Concept:{entity_name}" in property.is_used_for():
-                res.append(property)
+        res = Property.get_topic_properties(entity_name, properties)
         return sorted(res, key=lambda k: int(k.index) if k.index is not None else sys.maxsize) # ToDo: Add sortPos to all properties. If done exchange index with sortPos
 
     @staticmethod
@@ -478,7 +551,7 @@ class Property(MetaModelElement):
         Returns a list of all primitive datatype of the given entity.
         Args:
             entity_name: name of the entity for which the primitive properties should be returned
-            properties: list of all properties
+            properties: PropertyIndex or list of all properties
         Returns:
             List of primitive properties of the given entity
         """
@@ -486,8 +559,8 @@ class Property(MetaModelElement):
                                "ExternalIdentifier","Geographic coordinate", "Number","URI","Url","number","code"]
         primitive_datatypes.extend([f"Special:Types/{datatype}" for datatype in primitive_datatypes])
         primitive_properties = []
-        for property in properties:
-            if f"Concept:{entity_name}" in property.is_used_for() and property.type in primitive_datatypes:
+        for property in Property.get_topic_properties(entity_name, properties):
+            if property.type in primitive_datatypes:
                 primitive_properties.append(property)
         return primitive_properties
 
@@ -495,7 +568,7 @@ class Property(MetaModelElement):
         """Render this property to its template representation"""
         separator = "" if oneliner else "\n"
         res = "{{Property" + separator
-        res += SMW.render_parameters(oneliner=oneliner, **MetaModelElement.get_parameters(self.__dict__, self.propList))
+        res += SMW.render_parameters(oneliner=oneliner, **MetaModelElement.get_parameters(MetaModelElement.get_attributes(self), self.propList))
         return res + "}}"
 
     def get_page_link(self, name=None):
@@ -538,9 +611,9 @@ class Property(MetaModelElement):
             List of dicts that have the given key with a matching value
         """
         if invert:
-            return [p for p in lop if p.__dict__[key] not in match]
+            return [p for p in lop if getattr(p, key) not in match]
         else:
-            return [p for p in lop if p.__dict__[key] in match]
+            return [p for p in lop if getattr(p, key) in match]
 
     @classmethod
     def from_wiki_json(cls, prop_json):
@@ -571,6 +644,184 @@ class Property(MetaModelElement):
         return typeDefStr
 
 
+class CompactMetaModelElement(object):
+    """
+    Base of the slot based compact representations of MetaModelElements.
+    The compact elements have no attribute dict - only the attributes of the metamodel (and those used by the
+    templates) can be set. They are intended to reduce the memory and attribute access overhead of large metamodels.
+    """
+    __slots__ = ()
+    propList = []
+
+    def __init__(self, properties: dict = None):
+        """
+        construct me from the given properties - all attributes of my propList are initialized
+        Args:
+            properties(dict): a dictionary of properties
+        """
+        if properties is None:
+            properties = {}
+        for name in self.propList:
+            setattr(self, name, None)
+        for name, value in properties.items():
+            if name in self.__slots__:
+                setattr(self, name, value)
+
+    @classmethod
+    def of(cls, element):
+        """
+        create the compact representation of the given element - attributes without a slot are dropped
+        Args:
+            element: the MetaModelElement to convert
+        Returns:
+            compact element with the attributes of the given element
+        """
+        compact = cls.__new__(cls)
+        for name in cls.__slots__:
+            if hasattr(element, name):
+                setattr(compact, name, getattr(element, name))
+        return compact
+
+    def __getstate__(self):
+        return MetaModelElement.get_attributes(self)
+
+    def __setstate__(self, state: dict):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+
+class CompactProperty(CompactMetaModelElement):
+    """
+    slot based Property with the same attribute API
+    """
+    __slots__ = tuple(Property.propList) + ("allowedValues", "externalFormatterUri", "usedFor", "template")
+    propList = Property.propList
+
+    def __init__(self, properties: dict = None):
+        super().__init__(properties)
+        self.template = "property_page.jinja"
+
+    is_used_for = Property.is_used_for
+    get_pageTitle = Property.get_pageTitle
+    render_entity = Property.render_entity
+    get_page_link = Property.get_page_link
+    get_description_page_link = Property.get_description_page_link
+    setPropertyType = Property.setPropertyType
+
+
+class CompactTopic(CompactMetaModelElement):
+    """
+    slot based Topic with the same attribute API
+    """
+    __slots__ = tuple(Topic.propList) + ("properties", "template", "_templateParamMapping")
+    propList = Topic.propList
+
+    def __init__(self, topic_properties: dict = None, properties: list = None):
+        super().__init__(topic_properties)
+        self.template = None
+        self.properties = properties
+
+    @classmethod
+    def of(cls, element, compact_properties: dict = None):
+        """
+        create the compact representation of the given topic and its properties
+        Args:
+            element: the Topic to convert
+            compact_properties(dict): already converted properties by id of the original property - allows to share the properties of multiple topics
+        Returns:
+            CompactTopic
+        """
+        compact = super().of(element)
+        if getattr(element, "properties", None) is not None:
+            if compact_properties is None:
+                compact_properties = {}
+            properties = []
+            for property in element.properties:
+                if id(property) not in compact_properties:
+                    compact_properties[id(property)] = CompactProperty.of(property)
+                properties.append(compact_properties[id(property)])
+            compact.properties = properties
+        return compact
+
+    templateParamMapping = Topic.templateParamMapping
+    get_pageTitle = Topic.get_pageTitle
+    get_related_topics = Topic.get_related_topics
+    render_entity = Topic.render_entity
+    get_page_link = Topic.get_page_link
+    query_topic_overview = Topic.query_topic_overview
+    query_entities = Topic.query_entities
+    query_examples = Topic.query_examples
+    query_entity_properties = Topic.query_entity_properties
+    query_number_entities = Topic.query_number_entities
+    query_documentation = Topic.query_documentation
+
+
+class PropertyIndex(object):
+    """
+    Index of a list of properties by the topics they are used for, the topics their values are from and their types.
+    The index is built once for a property list (e.g. by WikiRender.renderTopic for the properties of a topic) and
+    passed explicitly to the functions that query the properties instead of the list. Changes of the list or of the
+    topic, usedFor, values_from or type of its properties require a call of refresh().
+    """
+
+    def __init__(self, properties: list):
+        """
+        build the index of the given properties
+        Args:
+            properties: list of properties
+        """
+        self.properties=properties if properties is not None else []
+        self.refresh()
+
+    def refresh(self):
+        """
+        rebuild the index from the current state of the property list
+        """
+        self.by_topic={}
+        self.by_values_from={}
+        self.by_type={}
+        # MetaModelGraph of the properties see get_graph()
+        self.graph=None
+        for property in self.properties:
+            for topic in dict.fromkeys(property.is_used_for()):
+                self.by_topic.setdefault(topic, []).append(property)
+            values_from=getattr(property, "values_from", None)
+            if values_from:
+                self.by_values_from.setdefault(values_from, []).append(property)
+            self.by_type.setdefault(getattr(property, "type", None), []).append(property)
+
+    @staticmethod
+    def of(properties) -> 'PropertyIndex':
+        """
+        get the index of the given properties
+        Args:
+            properties: PropertyIndex or list of properties
+        Returns:
+            the given PropertyIndex or a new index of the given list
+        """
+        if isinstance(properties, PropertyIndex):
+            return properties
+        return PropertyIndex(properties)
+
+    def get_graph(self) -> 'MetaModelGraph':
+        """Returns the MetaModelGraph of the indexed properties - it is computed on the first call"""
+        if self.graph is None:
+            self.graph=MetaModelGraph(self.properties)
+        return self.graph
+
+    def get_topic_properties(self, entity_name: str) -> list:
+        """Returns the properties that are used for the given entity"""
+        return self.by_topic.get(f"Concept:{entity_name}", [])
+
+    def get_values_from_properties(self, entity_name: str) -> list:
+        """Returns the properties whose values are pages of the given entity"""
+        return self.by_values_from.get(f"concept={entity_name}", [])
+
+    def get_type_properties(self, type_name: str) -> list:
+        """Returns the properties of the given type"""
+        return self.by_type.get(type_name, [])
+
+
 class UML:
     """
     ToDo: Migrate the functionality of this class to Topic
@@ -583,7 +834,7 @@ class UML:
         Reduce the given list of properties to those properties which have the given entity as subject
         Args:
             entity_name: Name of the entity for which the outgoing edges should be extracted
-            properties: List of all properties
+            properties: PropertyIndex or list of all properties
         Returns:
             List of dicts with each dict containing information for one edge.
         Examples: For entity_name=Project
@@ -597,25 +848,7 @@ class UML:
             Means in UML:
             "Project" "*" --> "1" "Goal" : "<Property object>.name"
         """
-        outgoing_edges = []
-        for property in properties:
-            if f"Concept:{entity_name}" in property.is_used_for() and property.type == "Special:Types/Page" and property.values_from:
-                uml_infos = {}
-                uml_infos["source"] = entity_name
-                if property.values_from:
-                    values_from = str(property.values_from).split("=")
-                    if values_from[0] == "concept":
-                        uml_infos["target"] = values_from[1]
-                    else:
-                        continue
-                if property.inputType == "tokens":
-                    uml_infos["target_cardinality"] = "*"
-                else:
-                    uml_infos["target_cardinality"] = "1"
-                uml_infos["source_cardinality"] = "*"
-                uml_infos["property"] = property
-                outgoing_edges.append(uml_infos)
-        return outgoing_edges
+        return MetaModelGraph.of(properties).get_outgoing_edges(entity_name)
 
     @staticmethod
     def get_incoming_edges(entity_name: str, properties: list):
@@ -623,7 +856,7 @@ class UML:
         Reduce the given list of properties to those properties which have the given entity as object
         Args:
             entity_name: Name of the entity for which the incoming edges should be extracted
-            properties: List of all properties
+            properties: PropertyIndex or list of all properties
         Returns:
             List of dicts with each dict containing information for one edge.
         Examples: For entity_name=Goal
@@ -637,22 +870,7 @@ class UML:
             Means in UML:
             "Project" "*" --> "1" "Goal" : "<Property object>.name"
         """
-        incoming_edges = []
-        for property in properties:
-            if property.values_from == f"concept={entity_name}" and property.type == "Special:Types/Page" and property.values_from:
-                uml_infos = {}
-                uml_infos["target"] = entity_name
-                if property.inputType == "tokens":
-                    uml_infos["target_cardinality"] = "*"
-                else:
-                    uml_infos["target_cardinality"] = "1"
-                uml_infos["source_cardinality"] = "*"
-                uml_infos["property"] = property
-                for source in property.is_used_for():
-                    temp_uml_infos = uml_infos.copy()
-                    temp_uml_infos["source"] = source.replace("Concept:","")
-                    incoming_edges.append(temp_uml_infos)
-        return incoming_edges
+        return MetaModelGraph.of(properties).get_incoming_edges(entity_name)
 
     @staticmethod
     def get_incoming_edges_reduced(entity_name: str, properties: list):
@@ -661,7 +879,7 @@ class UML:
         Returns a list of dict. The edges lname is stored in the kex properties.
         Args:
             entity_name: Name of the entity for which the incoming edges should be extracted
-            properties: List of all properties
+            properties: PropertyIndex or list of all properties
         Returns:
             List of dicts with each dict containing information for one edge.
         Examples:
@@ -675,18 +893,102 @@ class UML:
             Means in UML:
             "Project" "*" --> "*" "Goal" : "Task goals, Project goals"
         """
-        incoming_edges  = UML.get_incoming_edges(entity_name, properties)
+        return MetaModelGraph.of(properties).get_incoming_edges_reduced(entity_name)
+
+
+class MetaModelGraph(object):
+    """
+    Graph of the topics of a metamodel (e.g. of a complete context) connected by the page properties whose values
+    are from another topic. The adjacency lists of all topics are computed in one pass over the properties, the edges
+    of a topic are then queried in O(degree).
+    """
+
+    def __init__(self, properties: list):
+        """
+        compute the adjacency lists of the given properties
+        Args:
+            properties: list of all properties
+        """
+        # (target, property) by the raw topic the property is used for e.g. "Concept:Task"
+        self.outgoing={}
+        # (source, property) by target topic name
+        self.incoming={}
+        for property in properties:
+            values_from=property.values_from
+            if property.type != "Special:Types/Page" or not values_from:
+                continue
+            values_from_parts = str(values_from).split("=")
+            if values_from_parts[0] != "concept" or len(values_from_parts) < 2:
+                continue
+            target = values_from_parts[1]
+            for used_for in property.is_used_for():
+                self.outgoing.setdefault(used_for, []).append((target, property))
+                self.incoming.setdefault(values_from[len("concept="):], []).append((used_for.replace("Concept:", ""), property))
+
+    @staticmethod
+    def of(properties) -> 'MetaModelGraph':
+        """
+        get the graph of the given properties
+        Args:
+            properties: PropertyIndex (whose graph is computed once) or list of all properties
+        Returns:
+            MetaModelGraph of the properties
+        """
+        if isinstance(properties, PropertyIndex):
+            return properties.get_graph()
+        return MetaModelGraph(properties if properties is not None else [])
+
+    @staticmethod
+    def get_edge(source: str, target: str, property) -> dict:
+        """Returns the edge dict of the given property (the cardinality depends on the current inputType)"""
+        return {
+            "source": source,
+            "target": target,
+            "target_cardinality": "*" if property.inputType == "tokens" else "1",
+            "source_cardinality": "*",
+            "property": property
+        }
+
+    def get_outgoing_edges(self, entity_name: str) -> list:
+        """Returns the edges from the given entity to other topics see UML.get_outgoing_edges"""
+        # an entity used for multiple times by a property has only one edge per property
         res = []
-        for edge in incoming_edges:
-            if edge.get('source') == entity_name:
+        seen = set()
+        for target, property in self.outgoing.get(f"Concept:{entity_name}", []):
+            if id(property) not in seen:
+                seen.add(id(property))
+                res.append(MetaModelGraph.get_edge(entity_name, target, property))
+        return res
+
+    def get_incoming_edges(self, entity_name: str) -> list:
+        """Returns the edges from other topics to the given entity see UML.get_incoming_edges"""
+        return [MetaModelGraph.get_edge(source, entity_name, property) for source, property in self.incoming.get(entity_name, [])]
+
+    def get_incoming_edges_reduced(self, entity_name: str) -> list:
+        """Returns the incoming edges merged by their source see UML.get_incoming_edges_reduced"""
+        edges_by_source = {}
+        for edge in self.get_incoming_edges(entity_name):
+            source = edge.get('source')
+            if source == entity_name:
                 continue
-            if edge.get('source') in [x.get('source') for x in res]:
-                # merge edges
-                for x in res:
-                    if x.get('source') == edge.get('source'):
-                        x.get('properties').append(edge.get('property').name)
+            if source in edges_by_source:
+                edges_by_source[source]['properties'].append(edge.get('property').name)
             else:
                 edge['properties'] = [edge.get('property').name]
-                res.append(edge)
+                edges_by_source[source] = edge
+        return list(edges_by_source.values())
+
+    def get_related_topics(self, entity_name: str) -> set:
+        """Returns the names of the topics that are connected with the given entity"""
+        res = {target for target, _property in self.outgoing.get(f"Concept:{entity_name}", [])}
+        res.update(source for source, _property in self.incoming.get(entity_name, []))
+        res.discard(entity_name)
         return res
 
+    def get_edges(self) -> list:
+        """Returns all edges of the graph"""
+        res = []
+        for used_for in self.outgoing:
+            if used_for.startswith("Concept:"):
+                res.extend(self.get_outgoing_edges(used_for[len("Concept:"):]))
+        return res
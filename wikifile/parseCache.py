@@ -0,0 +1,166 @@
+import os
+import pickle
+import threading
+import warnings
+from collections import OrderedDict
+
+import wikitextparser as wtp
+try:
+    from wikitextparser._wikitext import SpanData
+except ImportError:
+    # wikitextparser versions without span data objects - the cache is bypassed
+    SpanData = None
+
+from wikifile.stats import Stats
+
+
+class ParseCache(object):
+    """
+    Size bounded LRU cache of wikitextparser parses keyed by the hash of the wikiText.
+    Only the spans of the parse are cached and a new WikiText object is built from them on each hit so that
+    modifications of a parsed wikiText (e.g. updateTemplate) never leak into the cache or to other WikiFiles.
+    Optionally the spans are persisted as pickles in a cache directory to reuse the parses across runs.
+    """
+
+    def __init__(self, maxSize:int=1024, cacheDir:str=None, debug:bool=False):
+        """
+        constructor
+
+        Args:
+            maxSize(int): maximum number of parses held in memory
+            cacheDir(str): if given the parses are also stored as pickles in this directory (not size bounded)
+            debug(bool): True if debugging should be switched on
+        """
+        self.maxSize=maxSize
+        self.cacheDir=cacheDir
+        self.debug=debug
+        self.lock=threading.Lock()
+        self.entries=OrderedDict()
+        self.hits=0
+        self.misses=0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        """
+        remove all parses from the memory cache
+        """
+        with self.lock:
+            self.entries.clear()
+
+    def getPicklePath(self, key:str) -> str:
+        """
+        Returns:
+            str: the location of the pickle of the given key
+        """
+        return os.path.join(self.cacheDir, key[:2], f"{key}.pickle")
+
+    @staticmethod
+    def getSpans(parsedWikiText:wtp.WikiText) -> dict:
+        """
+        get the spans of the given parse
+
+        Args:
+            parsedWikiText(WikiText): the unmodified parse of a wikiText
+
+        Returns:
+            dict: list of (start, end) tuples by span type
+        """
+        return {spanType:[(span.start, span.end) for span in spans] for spanType, spans in parsedWikiText._type_to_spans.items()}
+
+    @staticmethod
+    def toWikiText(wikiText:str, spans:dict) -> wtp.WikiText:
+        """
+        build a new WikiText object of the given wikiText from the given spans without parsing it
+
+        Args:
+            wikiText(str): the wiki markup
+            spans(dict): the spans of the parse of the wikiText see getSpans()
+
+        Returns:
+            WikiText: the parsed wikiText
+        """
+        typeToSpans={spanType:[SpanData(start, end, None, None) for start, end in spanList] for spanType, spanList in spans.items()}
+        parsedWikiText=wtp.WikiText([wikiText], typeToSpans)
+        parsedWikiText._span_data=typeToSpans["WikiText"][0]
+        return parsedWikiText
+
+    def get(self, key:str) -> dict:
+        """
+        get the spans of the given key from the memory cache or the cache directory
+
+        Returns:
+            dict: the spans or None if the key is not cached
+        """
+        with self.lock:
+            spans=self.entries.get(key)
+            if spans is not None:
+                self.entries.move_to_end(key)
+                return spans
+        if self.cacheDir is not None:
+            picklePath=self.getPicklePath(key)
+            if os.path.isfile(picklePath):
+                try:
+                    with open(picklePath, mode="rb") as file:
+                        version, spans=pickle.load(file)
+                    if version == wtp.__version__:
+                        self.put(key, spans, persist=False)
+                        return spans
+                except Exception as ex:
+                    if self.debug:
+                        print(f"could not load the cached parse {picklePath}: {ex}")
+        return None
+
+    def put(self, key:str, spans:dict, persist:bool=True):
+        """
+        add the given spans to the cache and evict the least recently used parses
+
+        Args:
+            key(str): hash of the wikiText
+            spans(dict): spans of the parse
+            persist(bool): If True and a cache directory is configured the spans are stored as pickle
+        """
+        with self.lock:
+            self.entries[key]=spans
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxSize:
+                self.entries.popitem(last=False)
+        if persist and self.cacheDir is not None:
+            picklePath=self.getPicklePath(key)
+            os.makedirs(os.path.dirname(picklePath), exist_ok=True)
+            # write to a temporary file first as several processes might share the cache directory
+            tmpPath=f"{picklePath}.{os.getpid()}.tmp"
+            with open(tmpPath, mode="wb") as file:
+                pickle.dump((wtp.__version__, spans), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmpPath, picklePath)
+
+    def parse(self, wikiText:str, key:str) -> wtp.WikiText:
+        """
+        parse the given wikiText reusing a cached parse of the same content
+
+        Args:
+            wikiText(str): the wiki markup
+            key(str): the hash of the wikiText see WikiFile.getContentHash
+
+        Returns:
+            WikiText: a new parsed wikiText object
+        """
+        if SpanData is None:
+            return wtp.parse(wikiText)
+        spans=self.get(key)
+        stats=Stats.getInstance()
+        if spans is not None:
+            try:
+                parsedWikiText=ParseCache.toWikiText(wikiText, spans)
+                self.hits+=1
+                stats.count("parse.cache.hits")
+                return parsedWikiText
+            except Exception as ex:
+                # e.g. the internals of an other wikitextparser version differ
+                warnings.warn(f"cached parse could not be used - parsing the wikiText: {ex}")
+        self.misses+=1
+        stats.count("parse.cache.misses")
+        parsedWikiText=wtp.parse(wikiText)
+        self.put(key, ParseCache.getSpans(parsedWikiText))
+        return parsedWikiText
@@ -0,0 +1,43 @@
+import threading
+import time
+
+
+class RateLimiter(object):
+    """
+    Thread safe limiter that spaces out requests to a wiki so that concurrent workers do not exceed the given
+    number of requests per second. A worker that got a lag or rate limit response can ask for a pause that
+    applies to all workers.
+    """
+
+    def __init__(self, requestsPerSecond:float=None):
+        """
+        constructor
+
+        Args:
+            requestsPerSecond(float): maximum number of requests per second - if None the requests are not limited
+        """
+        self.interval=0.0 if not requestsPerSecond else 1.0/requestsPerSecond
+        self.nextSlot=0.0
+        self.lock=threading.Lock()
+
+    def wait(self):
+        """
+        block until the next request is allowed
+        """
+        with self.lock:
+            now=time.monotonic()
+            slot=max(now, self.nextSlot)
+            self.nextSlot=slot+self.interval
+        delay=slot-now
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds:float):
+        """
+        delay all following requests by the given number of seconds
+
+        Args:
+            seconds(float): number of seconds no request should be started
+        """
+        with self.lock:
+            self.nextSlot=max(self.nextSlot, time.monotonic()+seconds)
@@ -8,12 +8,13 @@ from typing import TYPE_CHECKING
 
 from tabulate import tabulate
 
+from wikifile.stats import Stats
 from wikifile.utils import Widget, Itemize, PageLink, WikiSon, SubObject, TemplateParam, SetProperties, SwitchFunction, \
     MagicWord
 
 if TYPE_CHECKING:
     from wikifile.wikiRender import WikiRender
-    from wikifile.metamodel import Topic, Property, UML, Context
+    from wikifile.metamodel import Topic, Property, PropertyIndex, UML, Context
 
 
 class SMWPart(object):
@@ -29,17 +30,18 @@ class SMWPart(object):
         self.wikiRender = wikiRender
         self.template = "%s_page.jinja" % part.lower().replace(" ", "_")
 
-    def render_page(self, topic: Topic):
+    def render_page(self, topic: Topic, property_index: PropertyIndex = None):
         """
         Renders the help page for the given entity using the provided properties
         Args:
             topic: topic for which the page should be rendered
-            properties: list of all properties
+            property_index: index of the properties of the topic shared by all pages of the topic (see WikiRender.renderTopic)
         Returns:
 
         """
-        template_template = self.wikiRender.template_env.get_template(self.template)
-        page = template_template.render(topic=topic)
+        with Stats.getInstance().timer(f"render.{self.template}"):
+            template_template = self.wikiRender.template_env.get_template(self.template)
+            page = template_template.render(topic=topic, property_index=property_index)
         return page
 
     @staticmethod
@@ -294,7 +296,7 @@ class Template(SMWPart):
             string of an mediawiki table displaying the properties of the given topic
         """
         formlink = Form.formlink(form=topic.name, link_text="✎", target="{{FULLPAGENAME}}", tooltip="Start editing this " + topic.name)
-        sortBySortPos = lambda property: 99999 if "sortPos" not in property.__dict__ or property.__dict__.get("sortPos") is None else int(property.sortPos)
+        sortBySortPos = lambda property: 99999 if getattr(property, "sortPos", None) is None else int(property.sortPos)
         properties_sorted = sorted(properties, key=sortBySortPos)
 
         table=Table(css_class="wikitable", escape=escape)
@@ -426,19 +428,21 @@ class Form(SMWPart):
                     "allowedValues": "values"}
         parameters = {}
         for prop in prop_map.keys():
+            value = getattr(property, prop, None)
             if prop == "inputType":
-                if property.__dict__[prop] is None:
-                    property.__dict__[prop] = "text"
-                elif property.__dict__[prop].lower() == "textarea":
+                if value is None:
+                    value = "text"
+                    property.inputType = value
+                elif value.lower() == "textarea":
                     parameters["editor"] = "wikieditor"
-            if prop in property.__dict__ and property.__dict__[prop] is not None:
+            if value is not None:
                 if prop == "values_from":
                     # values_from contains data like "concept=Country" so we add an auxiliary property "values from concept" with the value "Country"
-                    vals = property.__dict__[prop].split("=")
+                    vals = value.split("=")
                     parameters[f"{prop_map[prop]} {vals[0]}" ] = vals[1]
                 else:
-                    parameters[prop_map[prop]] = property.__dict__[prop]
-                if prop == "inputType" and property.__dict__[prop] == "regexp":
+                    parameters[prop_map[prop]] = value
+                if prop == "inputType" and value == "regexp":
                     parameters.update(Form.regexps.get(property.regexp))
         return Form.page_form_function(tag="field", **{property.name: True, **parameters})
 
@@ -465,7 +469,7 @@ class Form(SMWPart):
         if label:
             table.add_row().add_cell(content=label, colspan=2)
         # Add form field for each given property
-        sortBySortPos = lambda property: 99999 if "sortPos" not in property.__dict__ or property.__dict__.get("sortPos") is None else int(property.sortPos)
+        sortBySortPos = lambda property: 99999 if getattr(property, "sortPos", None) is None else int(property.sortPos)
         properties_sorted = sorted(properties, key=sortBySortPos)
         for property in properties_sorted:
             property_row = table.add_row()
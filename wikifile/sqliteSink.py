@@ -0,0 +1,174 @@
+import sqlite3
+
+
+class SQLiteSink(object):
+    """
+    Streams extracted template records into a SQLite table. The records are inserted in batches with executemany and
+    the table columns are taken from the first records so that a full wiki backup can be exported and queried
+    without holding all records in memory. Columns that only show up in later records are added to the table.
+    All columns are TEXT as the values of template arguments are text - a numeric column affinity inferred from the
+    first records would change later values such as "01067" or "1.50" (use CAST in queries to compare numbers).
+    As SQLite column names are case insensitive keys that only differ in case (e.g. Year and year) share a column.
+    """
+
+    def __init__(self, dbFile:str, tableName:str, batchSize:int=1000, sampleSize:int=100, debug:bool=False):
+        """
+        constructor
+
+        Args:
+            dbFile(str): location of the SQLite database file
+            tableName(str): name of the table the records are stored in - an existing table is extended
+            batchSize(int): number of records that are inserted with one executemany call
+            sampleSize(int): number of records the columns of a new table are taken from
+            debug(bool): True if debugging should be switched on
+        """
+        self.dbFile=dbFile
+        self.tableName=tableName
+        self.batchSize=batchSize
+        self.sampleSize=max(1, sampleSize)
+        self.debug=debug
+        self.connection=sqlite3.connect(dbFile)
+        self.columns=None
+        self.buffer=[]
+        self.count=0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def quote(identifier:str) -> str:
+        """
+        quote the given identifier (e.g. a template argument name that contains blanks)
+
+        Args:
+            identifier(str): table or column name
+
+        Returns:
+            str: the quoted identifier
+        """
+        return '"'+str(identifier).replace('"', '""')+'"'
+
+    def getTableColumns(self) -> list:
+        """
+        Returns:
+            list: names of the columns of the table - empty if the table does not exist yet
+        """
+        rows=self.connection.execute(f"PRAGMA table_info({self.quote(self.tableName)})").fetchall()
+        return [row[1] for row in rows]
+
+    def normalize(self, records:list) -> list:
+        """
+        map the keys of the given records to the case insensitive column names - keys that only differ in case are
+        merged into the column of the first spelling (the spelling of an existing column is kept)
+
+        Args:
+            records(list): the records to store
+
+        Returns:
+            list: the records with the keys of their columns - the first non empty value of merged keys is kept
+        """
+        columns=self.columns if self.columns is not None else self.getTableColumns()
+        names={column.lower():column for column in columns}
+        normalizedRecords=[]
+        for record in records:
+            normalizedRecord={}
+            for key, value in record.items():
+                name=names.setdefault(str(key).lower(), key)
+                if normalizedRecord.get(name) in (None, ""):
+                    normalizedRecord[name]=value
+            normalizedRecords.append(normalizedRecord)
+        return normalizedRecords
+
+    def createTable(self, sample:list):
+        """
+        create the table for the given sample records if it does not exist yet and add missing columns
+
+        Args:
+            sample(list): the records the columns are taken from
+        """
+        columns={key:None for record in sample for key in record.keys()}
+        existingColumns=self.getTableColumns()
+        if existingColumns:
+            self.columns=existingColumns
+        else:
+            columnDefinitions=", ".join(f"{self.quote(name)} TEXT" for name in columns.keys())
+            self.connection.execute(f"CREATE TABLE {self.quote(self.tableName)} ({columnDefinitions})")
+            self.columns=list(columns.keys())
+        self.addColumns(columns.keys())
+
+    def addColumns(self, names):
+        """
+        add the given columns to the table if they are missing - the names are compared case insensitive
+
+        Args:
+            names: names of the columns
+        """
+        existingNames={column.lower() for column in self.columns}
+        for name in names:
+            if str(name).lower() not in existingNames:
+                self.connection.execute(f"ALTER TABLE {self.quote(self.tableName)} ADD COLUMN {self.quote(name)} TEXT")
+                self.columns.append(name)
+                existingNames.add(str(name).lower())
+                if self.debug:
+                    print(f"added column {name} to {self.tableName}")
+
+    def addRecord(self, record:dict):
+        """
+        add the given record - the records are buffered and inserted in batches
+
+        Args:
+            record(dict): the record to store
+        """
+        self.buffer.append(record)
+        if self.columns is None:
+            if len(self.buffer) >= self.sampleSize:
+                self.flush()
+        elif len(self.buffer) >= self.batchSize:
+            self.flush()
+
+    def store(self, records) -> int:
+        """
+        store the given records and flush the buffer
+
+        Args:
+            records: iterable of dicts
+
+        Returns:
+            int: number of stored records of this sink
+        """
+        for record in records:
+            self.addRecord(record)
+        self.flush()
+        return self.count
+
+    def flush(self):
+        """
+        insert the buffered records
+        """
+        if not self.buffer:
+            return
+        records=self.normalize(self.buffer)
+        if self.columns is None:
+            self.createTable(records)
+        else:
+            self.addColumns({key:None for record in records for key in record.keys()}.keys())
+        for start in range(0, len(records), self.batchSize):
+            batch=records[start:start+self.batchSize]
+            columns=list({key:None for record in batch for key in record.keys()}.keys())
+            columnNames=", ".join(self.quote(column) for column in columns)
+            placeholders=", ".join("?"*len(columns))
+            self.connection.executemany(f"INSERT INTO {self.quote(self.tableName)} ({columnNames}) VALUES ({placeholders})",
+                                        [tuple(record.get(column) for column in columns) for record in batch])
+            self.count+=len(batch)
+        self.connection.commit()
+        self.buffer=[]
+
+    def close(self):
+        """
+        flush the buffered records and close the connection
+        """
+        self.flush()
+        self.connection.close()
@@ -0,0 +1,155 @@
+import json
+import sys
+import threading
+import time
+
+
+class Stats(object):
+    """
+    Lightweight timers and counters of the reading, parsing, template matching, rendering, writing and http stages.
+    The statistics are collected process wide (see getInstance()) and only if they are enabled so that production runs
+    can be profiled without a profiler and without slowing down runs that do not need them.
+
+    Example:
+        stats=Stats.getInstance()
+        stats.enable()
+        with stats.timer("parse"):
+            ...
+        stats.count("read.bytes", 1024)
+    """
+    # the process wide instance see getInstance()
+    instance=None
+
+    def __init__(self, enabled:bool=False):
+        """
+        constructor
+
+        Args:
+            enabled(bool): If True the timers and counters are recorded
+        """
+        self.enabled=enabled
+        self.lock=threading.Lock()
+        self.reset()
+
+    @classmethod
+    def getInstance(cls) -> 'Stats':
+        """
+        Returns:
+            Stats: the process wide statistics
+        """
+        if cls.instance is None:
+            cls.instance=Stats()
+        return cls.instance
+
+    def enable(self, enabled:bool=True):
+        """
+        switch the recording on or off
+        """
+        self.enabled=enabled
+
+    def reset(self):
+        """
+        clear all timers and counters
+        """
+        with self.lock:
+            self.counters={}
+            self.timers={}
+
+    def count(self, name:str, value:int=1):
+        """
+        increase the counter of the given name
+
+        Args:
+            name(str): name of the counter e.g. read.bytes
+            value(int): the increment
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name]=self.counters.get(name, 0)+value
+
+    def addTime(self, name:str, seconds:float, calls:int=1):
+        """
+        add the given duration to the timer of the given name
+
+        Args:
+            name(str): name of the timer e.g. parse
+            seconds(float): the measured duration
+            calls(int): number of measured calls
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            timer=self.timers.get(name)
+            if timer is None:
+                self.timers[name]=[seconds, calls]
+            else:
+                timer[0]+=seconds
+                timer[1]+=calls
+
+    def timer(self, name:str) -> 'Stats.Timer':
+        """
+        get a context manager that measures the time of its block with the timer of the given name
+        """
+        return Stats.Timer(self, name)
+
+    def merge(self, stats:dict):
+        """
+        add the timers and counters of the given statistics (see asDict) e.g. of a worker process
+
+        Args:
+            stats(dict): the statistics to add
+        """
+        if not stats:
+            return
+        for name, value in stats.get("counters", {}).items():
+            self.count(name, value)
+        for name, timer in stats.get("timers", {}).items():
+            self.addTime(name, timer["seconds"], timer["calls"])
+
+    def asDict(self) -> dict:
+        """
+        Returns:
+            dict: counters and timers (with seconds and calls) by name
+        """
+        with self.lock:
+            return {
+                "counters": dict(sorted(self.counters.items())),
+                "timers": {name: {"seconds": round(seconds, 6), "calls": calls} for name, (seconds, calls) in sorted(self.timers.items())}
+            }
+
+    def toJson(self) -> str:
+        return json.dumps(self.asDict(), indent=2)
+
+    def write(self, filePath:str):
+        """
+        store the statistics as json in the given file - "-" writes them to stderr so that they do not mix with
+        records written to stdout (e.g. the ndjson output of wikiextract)
+
+        Args:
+            filePath(str): location of the json file
+        """
+        if filePath == "-":
+            print(self.toJson(), file=sys.stderr)
+        else:
+            with open(filePath, mode="w") as file:
+                file.write(self.toJson())
+
+    class Timer(object):
+        """
+        measures the time of a with block
+        """
+
+        def __init__(self, stats:'Stats', name:str):
+            self.stats=stats
+            self.name=name
+            self.start=None
+
+        def __enter__(self):
+            if self.stats.enabled:
+                self.start=time.perf_counter()
+            return self
+
+        def __exit__(self, exc_type, exc_value, traceback):
+            if self.start is not None:
+                self.stats.addTime(self.name, time.perf_counter()-self.start)
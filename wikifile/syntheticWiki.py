@@ -0,0 +1,208 @@
+'''
+generator of synthetic wikiText backups for scale and load tests
+
+usage: python -m wikifile.syntheticWiki --pages 100000 --wikiTextPath /tmp/wiki --pagesPerDirectory 1000
+'''
+import random
+from argparse import ArgumentParser
+
+from wikifile.metamodel import Topic, Property
+from wikifile.smw import SMW
+from wikifile.wikiFile import WikiFile
+from wikifile.wikiRender import WikiRender
+
+
+class SyntheticWiki(object):
+    """
+    Generates entity pages of the topics of a metamodel. Each page holds the WikiSON entity of its topic rendered
+    with WikiRender.render_template, subobjects, nested parser functions and free text. The pages only depend on the
+    seed and the page index so that backups of any size can be (re)generated page by page without holding them in memory.
+    """
+    WORDS = ["wiki", "semantic", "conference", "workshop", "proceedings", "research", "event", "series", "data",
+             "query", "template", "property", "topic", "concept", "markup", "page", "city", "country", "year"]
+    TYPES = ["Special:Types/Text", "Special:Types/Page", "Special:Types/Number", "Special:Types/Date",
+             "Special:Types/URL", "Special:Types/Boolean"]
+
+    def __init__(self, pages: int = 1000, topics: list = None, subobjects: int = 2, nesting: int = 1,
+                 paragraphs: int = 3, pagesPerDirectory: int = None, seed: int = 42, wikiRender: WikiRender = None):
+        """
+        constructor
+
+        Args:
+            pages(int): number of entity pages
+            topics(list): Topics with properties the entities are generated for - default are the topics of getTopics()
+            subobjects(int): maximum number of subobjects of each page
+            nesting(int): depth of the nested parser functions of each page
+            paragraphs(int): number of free text paragraphs of each page
+            pagesPerDirectory(int): if given the pages are distributed as subpages over directories with at most this number of pages
+            seed(int): seed of the random generator - the same seed generates the same backup
+            wikiRender(WikiRender): the renderer of the entities
+        """
+        self.pages = pages
+        self.topics = topics if topics is not None else SyntheticWiki.getTopics()
+        self.subobjects = subobjects
+        self.nesting = nesting
+        self.paragraphs = paragraphs
+        self.pagesPerDirectory = pagesPerDirectory
+        self.seed = seed
+        self.wikiRender = wikiRender if wikiRender is not None else WikiRender()
+
+    @staticmethod
+    def getTopics(count: int = 3, propertiesPerTopic: int = 6) -> list:
+        """
+        get synthetic topics whose properties cover the common SMW datatypes - the property pages of the topics
+        are distinct e.g. Property:Entity0 property1 (see benchmark.Benchmark for the rendering of the topics)
+
+        Args:
+            count(int): number of topics
+            propertiesPerTopic(int): number of properties of each topic
+
+        Returns:
+            list: Topics
+        """
+        topics = []
+        for i in range(count):
+            name = f"Entity{i}"
+            topic = Topic({"name": name, "pluralName": f"{name}s", "documentation": f"synthetic topic {i}"})
+            topic.properties = [Property({
+                "name": f"property{j}",
+                "pageTitle": f"Property:{name} property{j}",
+                "label": f"property {j}",
+                "type": SyntheticWiki.TYPES[j % len(SyntheticWiki.TYPES)],
+                "values_from": f"concept=Entity{(i+1) % count}" if j % len(SyntheticWiki.TYPES) == 1 else None,
+                "documentation": f"property {j} of topic {name}",
+                "topic": f"Concept:{name}"
+            }) for j in range(propertiesPerTopic)]
+            topics.append(topic)
+        return topics
+
+    def getTopic(self, index: int) -> Topic:
+        """
+        Returns:
+            Topic: the topic of the page with the given index
+        """
+        return self.topics[index % len(self.topics)]
+
+    def getPageTitle(self, index: int) -> str:
+        """
+        get the title of the page with the given index
+
+        Args:
+            index(int): index of the page
+
+        Returns:
+            str: the page title e.g. "Entity1 4" or "Entity1/0/Entity1 4" if the pages are distributed over directories
+        """
+        topic = self.getTopic(index)
+        pageTitle = f"{topic.name} {index}"
+        if self.pagesPerDirectory:
+            topicIndex = index // len(self.topics)
+            pageTitle = f"{topic.name}/{topicIndex // self.pagesPerDirectory}/{pageTitle}"
+        return pageTitle
+
+    def getPageTitles(self) -> list:
+        """
+        Returns:
+            list: the titles of the pages
+        """
+        return [self.getPageTitle(index) for index in range(self.pages)]
+
+    def getValue(self, rand: random.Random, property: Property) -> str:
+        """
+        get a random value of the datatype of the given property
+        """
+        propertyType = getattr(property, "type", None)
+        if propertyType == "Special:Types/Page":
+            return self.getPageTitle(rand.randrange(self.pages))
+        elif propertyType == "Special:Types/Number":
+            return str(rand.randint(0, 10000))
+        elif propertyType == "Special:Types/Date":
+            return f"{rand.randint(1990, 2030)}-{rand.randint(1, 12):02d}-{rand.randint(1, 28):02d}"
+        elif propertyType == "Special:Types/URL":
+            return f"https://{rand.choice(SyntheticWiki.WORDS)}.example.org/{rand.randint(1, 1000)}"
+        elif propertyType == "Special:Types/Boolean":
+            return rand.choice(["true", "false"])
+        return " ".join(rand.choices(SyntheticWiki.WORDS, k=rand.randint(1, 5)))
+
+    def getParserFunction(self, rand: random.Random, depth: int) -> str:
+        """
+        get a parser function call with the given depth of nested parser functions and templates
+        """
+        if depth <= 0:
+            return rand.choice(SyntheticWiki.WORDS)
+        inner = self.getParserFunction(rand, depth-1)
+        choice = rand.randrange(3)
+        if choice == 0:
+            return f"{{{{#if:{inner}|{{{{#expr:{rand.randint(1, 99)}+{rand.randint(1, 99)}}}}}|{inner}}}}}"
+        elif choice == 1:
+            return f"{{{{#ifeq:{inner}|{rand.choice(SyntheticWiki.WORDS)}|{{{{Link|target={inner}}}}}|}}}}"
+        return f"{{{{#switch:{inner}|wiki={{{{#time:Y|{rand.randint(1990, 2030)}-01-01}}}}|#default={inner}}}}}"
+
+    def getWikiText(self, index: int) -> str:
+        """
+        get the wikiText of the page with the given index
+
+        Args:
+            index(int): index of the page
+
+        Returns:
+            str: the wikiText
+        """
+        rand = random.Random(f"{self.seed}-{index}")
+        topic = self.getTopic(index)
+        properties = topic.properties or []
+        record = {property.name: self.getValue(rand, property) for property in properties}
+        parts = [self.wikiRender.render_template(topic.name, record)]
+        for _i in range(rand.randint(0, self.subobjects)):
+            subobject = {property.get_pageTitle(withNamespace=False): self.getValue(rand, property)
+                         for property in rand.sample(properties, k=min(2, len(properties)))}
+            parts.append("{{#subobject:" + SMW.render_parameters(**subobject) + "}}")
+        if self.nesting > 0:
+            parts.append(self.getParserFunction(rand, self.nesting))
+        for _i in range(self.paragraphs):
+            parts.append(" ".join(rand.choices(SyntheticWiki.WORDS, k=rand.randint(20, 60))))
+        return "\n".join(parts)
+
+    def write(self, wikiTextPath: str) -> list:
+        """
+        write the pages as wikiText files to the given path
+
+        Args:
+            wikiTextPath(str): the root of the wikiText directory
+
+        Returns:
+            list: the titles of the written pages
+        """
+        pageTitles = []
+        for index in range(self.pages):
+            pageTitle = self.getPageTitle(index)
+            WikiFile.write_to_file(wikiTextPath, pageTitle, self.getWikiText(index), overwrite=True)
+            pageTitles.append(pageTitle)
+        return pageTitles
+
+
+def main(argv=None):
+    '''
+    command line entry point
+    '''
+    parser = ArgumentParser(description="generate a synthetic wikiText backup of entity pages")
+    parser.add_argument("--wikiTextPath", required=True, help="path the wikiText files are stored in")
+    parser.add_argument("--pages", type=int, default=1000, help="number of entity pages")
+    parser.add_argument("--topics", type=int, default=3, help="number of topics of the synthetic metamodel")
+    parser.add_argument("--propertiesPerTopic", type=int, default=6, help="number of properties of each topic")
+    parser.add_argument("--subobjects", type=int, default=2, help="maximum number of subobjects of each page")
+    parser.add_argument("--nesting", type=int, default=1, help="depth of the nested parser functions of each page")
+    parser.add_argument("--paragraphs", type=int, default=3, help="number of free text paragraphs of each page")
+    parser.add_argument("--pagesPerDirectory", type=int, default=None, help="distribute the pages over directories with at most this number of pages")
+    parser.add_argument("--seed", type=int, default=42, help="seed of the synthetic backup")
+    args = parser.parse_args(argv)
+    syntheticWiki = SyntheticWiki(pages=args.pages, topics=SyntheticWiki.getTopics(args.topics, args.propertiesPerTopic),
+                                  subobjects=args.subobjects, nesting=args.nesting, paragraphs=args.paragraphs,
+                                  pagesPerDirectory=args.pagesPerDirectory, seed=args.seed)
+    pageTitles = syntheticWiki.write(args.wikiTextPath)
+    print(f"generated {len(pageTitles)} pages in {args.wikiTextPath}")
+    return pageTitles
+
+
+if __name__ == '__main__':
+    main()
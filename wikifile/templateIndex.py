@@ -0,0 +1,183 @@
+import os
+import sqlite3
+import wikitextparser as wtp
+from wikifile.wikiFile import WikiFile
+from wikifile.templateScanner import TemplateScanner
+
+
+class TemplateIndex(object):
+    """
+    Persistent index of the templates that are used in the wikiText files located at a wikiTextPath (e.g. a wikibackup).
+    The index is stored as SQLite database next to the wikiTextPath and maps each template name to the pageTitles
+    of the pages using it. For each file the modification time and size is recorded so that an update only reparses
+    the files that changed since the last update.
+    """
+
+    def __init__(self, wikiTextPath:str, dbFile:str=None, debug:bool=False):
+        """
+        constructor
+
+        Args:
+            wikiTextPath(str): the root of the wikiText directory that should be indexed
+            dbFile(str): location of the SQLite database file - if None the file is placed next to the wikiTextPath
+            debug(bool): True if debugging should be switched on
+        """
+        self.wikiTextPath=wikiTextPath
+        if dbFile is None:
+            dbFile=TemplateIndex.getDefaultDbFile(wikiTextPath)
+        self.dbFile=dbFile
+        self.debug=debug
+        self.connection=sqlite3.connect(dbFile)
+        self.createTables()
+
+    @staticmethod
+    def getDefaultDbFile(wikiTextPath:str) -> str:
+        """
+        Get the default location of the index database for the given wikiTextPath
+        Example: ~/wikibackup/or -> ~/wikibackup/or.templateIndex.db
+
+        Args:
+            wikiTextPath(str): the root of the wikiText directory
+
+        Returns:
+            path of the database file
+        """
+        return f"{os.path.normpath(wikiTextPath)}.templateIndex.db"
+
+    def createTables(self):
+        """
+        create the index tables if they do not exist yet
+        """
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS pages (
+                pageTitle TEXT PRIMARY KEY,
+                mtime INTEGER,
+                size INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS templates (
+                templateName TEXT,
+                pageTitle TEXT,
+                PRIMARY KEY (templateName, pageTitle)
+            );
+            CREATE INDEX IF NOT EXISTS templates_pageTitle ON templates(pageTitle);
+        """)
+        self.connection.commit()
+
+    def close(self):
+        """
+        close the connection to the index database
+        """
+        self.connection.close()
+
+    def getFileStats(self) -> dict:
+        """
+        Get the modification time and size of all wikiText files located at the wikiTextPath
+
+        Returns:
+            dict: (mtime, size) tuples by pageTitle
+        """
+        fileStats={}
+        for root, _dirnames, filenames in os.walk(self.wikiTextPath):
+            for filename in filenames:
+                if filename.endswith(".wiki"):
+                    filePath=os.path.join(root, filename)
+                    pageTitle=os.path.relpath(filePath, self.wikiTextPath)[:-len(".wiki")]
+                    stat=os.stat(filePath)
+                    fileStats[pageTitle]=(stat.st_mtime_ns, stat.st_size)
+        return fileStats
+
+    @staticmethod
+    def getTemplateNames(wikiText:str) -> set:
+        """
+        Get the names of all templates used in the given wikiText
+
+        Args:
+            wikiText(str): wiki markup to scan
+
+        Returns:
+            set of normalized template names
+        """
+        if not wikiText:
+            return set()
+        templateNames=TemplateScanner.getTemplateNames(wikiText)
+        if templateNames is None:
+            templateNames={WikiFile.get_template_name(template.name) for template in wtp.parse(wikiText).templates}
+        return templateNames
+
+    def update(self) -> dict:
+        """
+        update the index by reparsing all files that were added or changed since the last update and by removing
+        files that no longer exist
+
+        Returns:
+            dict: number of added, updated and removed pages
+        """
+        fileStats=self.getFileStats()
+        indexedStats={pageTitle:(mtime, size) for pageTitle, mtime, size in self.connection.execute("SELECT pageTitle, mtime, size FROM pages")}
+        counts={"added":0, "updated":0, "removed":0}
+        cursor=self.connection.cursor()
+        for pageTitle in indexedStats.keys()-fileStats.keys():
+            cursor.execute("DELETE FROM templates WHERE pageTitle=?", (pageTitle,))
+            cursor.execute("DELETE FROM pages WHERE pageTitle=?", (pageTitle,))
+            counts["removed"]+=1
+        for pageTitle, stats in fileStats.items():
+            if indexedStats.get(pageTitle) == stats:
+                continue
+            if pageTitle in indexedStats:
+                cursor.execute("DELETE FROM templates WHERE pageTitle=?", (pageTitle,))
+                counts["updated"]+=1
+            else:
+                counts["added"]+=1
+            filePath=WikiFile.get_wiki_path(self.wikiTextPath, pageTitle)
+            with open(filePath, mode='r') as file:
+                wikiText=file.read()
+            templateNames=self.getTemplateNames(wikiText)
+            cursor.executemany("INSERT INTO templates (templateName, pageTitle) VALUES (?,?)", [(name, pageTitle) for name in templateNames])
+            cursor.execute("INSERT OR REPLACE INTO pages (pageTitle, mtime, size) VALUES (?,?,?)", (pageTitle, *stats))
+        self.connection.commit()
+        if self.debug:
+            print(f"updated template index {self.dbFile}: {counts}")
+        return counts
+
+    def getPageTitlesForTemplate(self, templateName:str) -> list:
+        """
+        Get the pageTitles of all indexed pages that use the given template
+
+        Args:
+            templateName(str): name of the template
+
+        Returns:
+            list: sorted list of pageTitles
+        """
+        templateName=WikiFile.get_template_name(templateName)
+        query="SELECT pageTitle FROM templates WHERE templateName=? ORDER BY pageTitle"
+        return [pageTitle for (pageTitle,) in self.connection.execute(query, (templateName,))]
+
+    def isIndexed(self, pageTitle:str) -> bool:
+        """
+        Checks if the given page is part of the index
+
+        Args:
+            pageTitle(str): title of the page
+
+        Returns:
+            True if the page is indexed otherwise False
+        """
+        row=self.connection.execute("SELECT 1 FROM pages WHERE pageTitle=?", (pageTitle,)).fetchone()
+        return row is not None
+
+    def filterPageTitles(self, pageTitles:list, templateName:str) -> list:
+        """
+        Reduce the given pageTitles to the pages that might contain the given template.
+        Pages that are not part of the index (e.g. pages that are only available in the wiki) are kept.
+
+        Args:
+            pageTitles(list): pageTitles to filter
+            templateName(str): name of the template
+
+        Returns:
+            list: the pageTitles in the given order without the indexed pages that do not use the template
+        """
+        matching=set(self.getPageTitlesForTemplate(templateName))
+        indexed={pageTitle for (pageTitle,) in self.connection.execute("SELECT pageTitle FROM pages")}
+        return [pageTitle for pageTitle in pageTitles if pageTitle in matching or pageTitle not in indexed]
@@ -0,0 +1,187 @@
+import mmap
+import re
+
+try:
+    # extension tags whose content wikitextparser does not parse (e.g. <nowiki>, <math>, <chem>)
+    from wikitextparser._spans import _unparsable_tag_extensions as UNPARSABLE_TAG_EXTENSIONS
+except ImportError:
+    # wikitextparser versions without the set - the tags of wikitextparser 3.0
+    UNPARSABLE_TAG_EXTENSIONS={"ce", "charinsert", "chem", "graph", "hiero", "languages", "mapframe", "maplink",
+                               "math", "nowiki", "pagelist", "pagequality", "pages", "pre", "score", "source",
+                               "syntaxhighlight", "templatedata", "templatestyles", "timeline"}
+
+
+class TemplateScanner(object):
+    """
+    Lightweight scanner that locates templates with a brace-balancing tokenizer and extracts the arguments of flat
+    templates without building the complete wikitextparser AST.
+
+    The scanner only handles markup it can interpret exactly like wikitextparser. For nested or otherwise ambiguous
+    markup it returns None so that the caller can fall back to wikitextparser.
+    """
+    # markup that changes how braces and pipes have to be interpreted
+    AMBIGUOUS_BRACES=("{{{", "}}}")
+    AMBIGUOUS_TAGS=("<!--", "<includeonly", "<noinclude", "<onlyinclude")+tuple(f"<{tag}" for tag in sorted(UNPARSABLE_TAG_EXTENSIONS))
+    # the tag names have to end at the name e.g. <ce> is ambiguous but <center> is not
+    AMBIGUOUS_TAG=re.compile("<!--|(?:"+"|".join(re.escape(tag) for tag in AMBIGUOUS_TAGS[1:])+r")(?=[\s/>]|$)", re.IGNORECASE)
+    # markup within the arguments of a template that makes splitting at the pipes unreliable
+    AMBIGUOUS_ARGUMENT_MARKUP=("[[", "{", "}", "<")
+    BRACES=re.compile(r"\{\{|\}\}")
+
+    @staticmethod
+    def fileMayContainTemplates(filePath:str, templateNames:list) -> bool:
+        """
+        Checks if the given wikiText file may contain one of the given templates without reading and decoding it.
+        The file is memory mapped and its raw bytes are searched for the template names. As the raw template name
+        always contains the normalized name, files without any of the names can not contain the templates and are
+        rejected without allocating their text.
+
+        Args:
+            filePath(str): path of the wikiText file
+            templateNames(list): the normalized names of the templates
+
+        Returns:
+            False if the file can not contain any of the templates - True if the file has to be parsed to decide
+            or does not exist
+        """
+        encodedNames=[templateName.encode() for templateName in templateNames]
+        try:
+            with open(filePath, mode="rb") as file:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                    return any(content.find(encodedName) != -1 for encodedName in encodedNames)
+        except FileNotFoundError:
+            return True
+        except ValueError:
+            # empty files can not be mapped
+            return False
+
+    @staticmethod
+    def getTemplateSpans(wikiText:str):
+        """
+        Get the spans of all double brace constructs (templates and parser functions) of the given wikiText
+
+        Args:
+            wikiText(str): the wiki markup to scan
+
+        Returns:
+            list of (start, end, depth) tuples with the content of the construct being wikiText[start+2:end-2]
+            or None if the braces are not balanced
+        """
+        spans=[]
+        stack=[]
+        for match in TemplateScanner.BRACES.finditer(wikiText):
+            if match.group() == "{{":
+                stack.append(match.start())
+            else:
+                if not stack:
+                    return None
+                start=stack.pop()
+                spans.append((start, match.end(), len(stack)))
+        if stack:
+            return None
+        return spans
+
+    @staticmethod
+    def isAmbiguous(wikiText:str) -> bool:
+        """
+        Checks if the given wikiText contains markup the scanner can not interpret reliably
+
+        Args:
+            wikiText(str): the wiki markup to check
+
+        Returns:
+            True if wikitextparser should be used for the given wikiText
+        """
+        if any(markup in wikiText for markup in TemplateScanner.AMBIGUOUS_BRACES):
+            return True
+        if "<" not in wikiText:
+            return False
+        return TemplateScanner.AMBIGUOUS_TAG.search(wikiText) is not None
+
+    @staticmethod
+    def getTemplateNames(wikiText:str):
+        """
+        Get the names of all double brace constructs used in the given wikiText
+
+        Args:
+            wikiText(str): the wiki markup to scan
+
+        Returns:
+            set of the stripped names or None if the markup is ambiguous
+        """
+        if TemplateScanner.isAmbiguous(wikiText):
+            return None
+        spans=TemplateScanner.getTemplateSpans(wikiText)
+        if spans is None:
+            return None
+        templateNames=set()
+        for start, end, _depth in spans:
+            name=wikiText[start+2:end-2].split("|", 1)[0]
+            if "{" in name or "}" in name:
+                # name built from nested constructs
+                return None
+            templateNames.add(name.strip())
+        return templateNames
+
+    @staticmethod
+    def extractTemplate(wikiText:str, templateName:str):
+        """
+        Extracts the arguments of all occurrences of the given template in the same way as WikiFile.extractTemplate
+
+        Args:
+            wikiText(str): the wiki markup to scan
+            templateName(str): the normalized name of the template
+
+        Returns:
+            list of dicts - one dict for each occurrence of the template that has arguments -
+            or None if the markup is ambiguous and wikitextparser has to be used
+        """
+        lods=TemplateScanner.extractTemplates(wikiText, [templateName])
+        if lods is None:
+            return None
+        return lods[templateName]
+
+    @staticmethod
+    def extractTemplates(wikiText:str, templateNames:list):
+        """
+        Extracts the arguments of all occurrences of the given templates in one pass over the template spans
+
+        Args:
+            wikiText(str): the wiki markup to scan
+            templateNames(list): the normalized names of the templates
+
+        Returns:
+            dict of lods by template name (see extractTemplate) -
+            or None if the markup is ambiguous and wikitextparser has to be used
+        """
+        lods={templateName:[] for templateName in templateNames}
+        # the raw template name always contains the normalized name
+        usedNames={templateName for templateName in templateNames if templateName in wikiText}
+        if not usedNames:
+            return lods
+        if TemplateScanner.isAmbiguous(wikiText):
+            return None
+        spans=TemplateScanner.getTemplateSpans(wikiText)
+        if spans is None:
+            return None
+        for start, end, depth in sorted(spans):
+            content=wikiText[start+2:end-2]
+            name, separator, arguments=content.partition("|")
+            name=name.strip()
+            if name not in usedNames:
+                continue
+            if depth > 0 or any(markup in arguments for markup in TemplateScanner.AMBIGUOUS_ARGUMENT_MARKUP):
+                return None
+            if not separator:
+                # template without arguments
+                continue
+            records={}
+            position=0
+            for argument in arguments.split("|"):
+                key, equals, value=argument.partition("=")
+                if not equals:
+                    position+=1
+                    key, value=str(position), argument
+                records[key.strip()]=value.strip()
+            lods[name].append(records)
+        return lods
@@ -5,6 +5,8 @@ import sys
 import logging
 
 from wikifile.cmdline import CmdLineAble
+from wikifile.columnarTable import ColumnarTable
+from wikifile.sqliteSink import SQLiteSink
 
 
 class WikiExtract(CmdLineAble):
@@ -24,22 +26,26 @@ class WikiExtract(CmdLineAble):
 
     def getParser(self):
         # Setup argument parser
-        super().getParser() # setup default parser arguments
+        super().getParser(multipleTemplates=True) # setup default parser arguments
         if self.parser is None:
             raise AttributeError("parser of this object should be defined at this point.")
         self.parser.add_argument("-m", "--mode", dest="mode",
                                  help="Select a mode.\n\tupdate_templates: updates the wikifiles at the provided location with the provided data\n\tcreate: creates a wikifile with the given data.",
                                  required=True)
-        # Add parser arguments
-        self.parser.add_argument("-t", "--template", dest="template",
-                                 help="Select a template in which the data is being rendered", required=True)
+        # Add parser arguments (-t/--template and --listFile are provided by the default parser - with multiple templates all are extracted in one scan)
         self.parser.add_argument("-id", "--file_name_id", dest="file_name_id",
                                  help="Name of the key in which the file name is stored.")
-        self.parser.add_argument("--listFile", dest="file_list",
-                                 help="List of pages from which the data should be extracted", required=False)
+        self.parser.add_argument("--workers", dest="workers", type=int, default=1,
+                                 help="Number of worker processes used to parse the wiki files (default: 1)")
+        self.parser.add_argument("--ndjson", dest="ndjson", action="store_true",
+                                 help="Stream the records as newline delimited json (one record per line)")
+        self.parser.add_argument("--columnar", dest="columnar_file",
+                                 help="Write the records of the template as columnar table to the given file (.csv, .json or .parquet)")
+        self.parser.add_argument("--sqlite", dest="sqlite_file",
+                                 help="Stream the records into the given SQLite database - one table for each template")
 
     @staticmethod
-    def extract_templates(template_name: str, stdIn, page_titles, file_list, backup_path, add_file_name):
+    def extract_templates(template_name: str, stdIn, page_titles, file_list, backup_path, add_file_name, workers:int=1):
         """
         Extracts template data of the template template_name from the given files/location and returns the data as json.
         Args:
@@ -49,20 +55,145 @@ class WikiExtract(CmdLineAble):
             file_list:
             backup_path:
             add_file_name: If defined this value will be used as key to store the filename. Should be used wisely to not interfere with regular template arguments.
+            workers: number of worker processes used to parse the wiki files. The order of the result is independent of the number of workers.
 
         Returns:
 
         """
         # refactor to use command line
-        res = []
-        for file in page_titles:
-            wikiFile = WikiFile(file, backup_path)
-            template = wikiFile.extract_template(template_name)
-            if template is not None:
+        res = list(WikiExtract.iterate_templates(template_name, page_titles, backup_path, add_file_name, workers=workers))
+        return json.dumps({"data": res}, default=str, indent=3)
+
+    @staticmethod
+    def iterate_templates(template_name: str, page_titles, backup_path, add_file_name=None, workers:int=1):
+        """
+        Extracts template data of the template template_name from the given pages and yields the records one by one
+        so that they can be processed before all pages are extracted.
+        Args:
+            template_name: name of the template that should be extracted
+            page_titles: titles of the pages the data should be extracted from
+            backup_path: location of the wiki files
+            add_file_name: If defined this value will be used as key to store the filename.
+            workers: number of worker processes used to parse the wiki files
+
+        Returns:
+            generator of dicts containing the arguments of the first occurrence of the template in each page
+        """
+        for file, templates in WikiFile.extractTemplateFromFiles(backup_path, page_titles, template_name, workers=workers):
+            if templates:
+                template=templates[0]
                 if add_file_name is not None:
                     template[add_file_name] = file
-                res.append(template)
+                yield template
+
+    @staticmethod
+    def extract_multiple_templates(template_names: list, page_titles, backup_path, add_file_name=None, workers:int=1):
+        """
+        Extracts the data of all given templates in one scan of the given pages and returns the data as json.
+        Args:
+            template_names: names of the templates that should be extracted
+            page_titles: titles of the pages the data should be extracted from
+            backup_path: location of the wiki files
+            add_file_name: If defined this value will be used as key to store the filename.
+            workers: number of worker processes used to parse the wiki files
+
+        Returns:
+            json with the records of each template by template name
+        """
+        res = {template_name: [] for template_name in template_names}
+        for template_name, template in WikiExtract.iterate_multiple_templates(template_names, page_titles, backup_path, add_file_name, workers=workers):
+            res[template_name].append(template)
         return json.dumps({"data": res}, default=str, indent=3)
+
+    @staticmethod
+    def iterate_multiple_templates(template_names: list, page_titles, backup_path, add_file_name=None, workers:int=1):
+        """
+        Extracts the data of all given templates reading and traversing each page only once.
+        Args:
+            template_names: names of the templates that should be extracted
+            page_titles: titles of the pages the data should be extracted from
+            backup_path: location of the wiki files
+            add_file_name: If defined this value will be used as key to store the filename.
+            workers: number of worker processes used to parse the wiki files
+
+        Returns:
+            generator of (template_name, dict) tuples containing the arguments of the first occurrence of each template in each page
+        """
+        for file, templatesByName in WikiFile.extractTemplatesFromFiles(backup_path, page_titles, template_names, workers=workers):
+            if not templatesByName:
+                continue
+            for template_name in template_names:
+                templates = templatesByName.get(template_name)
+                if templates:
+                    template = templates[0]
+                    if add_file_name is not None:
+                        template[add_file_name] = file
+                    yield template_name, template
+
+    @staticmethod
+    def extract_columns(template_name: str, page_titles, backup_path, add_file_name=None, workers:int=1) -> ColumnarTable:
+        """
+        Extracts the template data of the template template_name from the given pages into per argument columns.
+        Args:
+            template_name: name of the template that should be extracted
+            page_titles: titles of the pages the data should be extracted from
+            backup_path: location of the wiki files
+            add_file_name: If defined this value will be used as column name to store the filename.
+            workers: number of worker processes used to parse the wiki files
+
+        Returns:
+            ColumnarTable with one row for each page containing the template
+        """
+        table = ColumnarTable()
+        for template in WikiExtract.iterate_templates(template_name, page_titles, backup_path, add_file_name, workers=workers):
+            table.addRecord(template)
+        return table
+
+    @staticmethod
+    def store_in_sqlite(template_names: list, page_titles, backup_path, db_file:str, add_file_name=None, workers:int=1, batch_size:int=1000) -> dict:
+        """
+        Streams the template data of the given templates into tables of the given SQLite database (one scan of the pages for all templates).
+        Args:
+            template_names: names of the templates that should be extracted - used as table names
+            page_titles: titles of the pages the data should be extracted from
+            backup_path: location of the wiki files
+            db_file: location of the SQLite database file
+            add_file_name: If defined this value will be used as column name to store the filename.
+            workers: number of worker processes used to parse the wiki files
+            batch_size: number of records that are inserted at once
+
+        Returns:
+            dict: number of stored records by template name
+        """
+        sinks = {template_name: SQLiteSink(db_file, template_name, batchSize=batch_size) for template_name in template_names}
+        try:
+            for template_name, template in WikiExtract.iterate_multiple_templates(template_names, page_titles, backup_path, add_file_name, workers=workers):
+                sinks[template_name].addRecord(template)
+        finally:
+            for sink in sinks.values():
+                sink.close()
+        return {template_name: sink.count for template_name, sink in sinks.items()}
+
+    @staticmethod
+    def write_ndjson(records, out=None) -> int:
+        """
+        Writes the given records as newline delimited json (one json object per line).
+        Each line is flushed directly so that consumers can start processing immediately.
+        Args:
+            records: iterable of dicts
+            out: stream to write to. Default is stdout
+
+        Returns:
+            number of written records
+        """
+        if out is None:
+            out = sys.stdout
+        count = 0
+        for record in records:
+            out.write(json.dumps(record, default=str) + "\n")
+            out.flush()
+            count += 1
+        return count
     
     def maininstance(self, argv=None):
         '''
@@ -78,17 +209,68 @@ class WikiExtract(CmdLineAble):
         try:
             # Process arguments
             args = self.parser.parse_args(argv)
+            if not args.template:
+                # the template option of the default parser is optional
+                self.parser.error("-t/--template is required")
             super().initLogging(args)
+            self.initStats(args)
+            self.initParseCache(args)
 
 
-            res_templates = WikiExtract.extract_templates(args.template,
-                                                          stdIn=args.stdin,
-                                                          file_list=args.file_list,
-                                                          page_titles=args.pages,
-                                                          backup_path=args.backupPath,
-                                                          add_file_name=args.file_name_id)
-            print(res_templates)
-
+            template_names = args.template if args.template else []
+            template_name = template_names[0] if template_names else None
+            if args.sqlite_file:
+                counts = WikiExtract.store_in_sqlite(template_names,
+                                                     page_titles=self.getPageTitlesForArgs(args),
+                                                     backup_path=args.backupPath,
+                                                     db_file=args.sqlite_file,
+                                                     add_file_name=args.file_name_id,
+                                                     workers=args.workers)
+                if args.debug:
+                    print(counts)
+            elif args.columnar_file:
+                if len(template_names) != 1:
+                    raise Exception("The columnar export needs exactly one template")
+                table = WikiExtract.extract_columns(template_name,
+                                                   page_titles=self.getPageTitlesForArgs(args),
+                                                   backup_path=args.backupPath,
+                                                   add_file_name=args.file_name_id,
+                                                   workers=args.workers)
+                table.write(args.columnar_file)
+            elif len(template_names) > 1:
+                page_titles = self.getPageTitlesForArgs(args)
+                if args.ndjson:
+                    # one json object per record with the template name as key
+                    records = ({name: template} for name, template in
+                               WikiExtract.iterate_multiple_templates(template_names,
+                                                                      page_titles=page_titles,
+                                                                      backup_path=args.backupPath,
+                                                                      add_file_name=args.file_name_id,
+                                                                      workers=args.workers))
+                    WikiExtract.write_ndjson(records)
+                else:
+                    print(WikiExtract.extract_multiple_templates(template_names,
+                                                                 page_titles=page_titles,
+                                                                 backup_path=args.backupPath,
+                                                                 add_file_name=args.file_name_id,
+                                                                 workers=args.workers))
+            elif args.ndjson:
+                records = WikiExtract.iterate_templates(template_name,
+                                                        page_titles=self.getPageTitlesForArgs(args),
+                                                        backup_path=args.backupPath,
+                                                        add_file_name=args.file_name_id,
+                                                        workers=args.workers)
+                WikiExtract.write_ndjson(records)
+            else:
+                res_templates = WikiExtract.extract_templates(template_name,
+                                                              stdIn=args.stdin,
+                                                              file_list=args.file_list,
+                                                              page_titles=self.getPageTitlesForArgs(args),
+                                                              backup_path=args.backupPath,
+                                                              add_file_name=args.file_name_id,
+                                                              workers=args.workers)
+                print(res_templates)
+            self.writeStats(args)
 
         except KeyboardInterrupt:
             ### handle keyboard interrupt ###
@@ -2,11 +2,16 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from wikifile.wikiFileManager import WikiFileManager
+import hashlib
 import os
 import warnings
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import wikitextparser as wtp
 from mwclient.page import Page
 from wikitextparser import Template
+from wikifile.stats import Stats
+from wikifile.templateScanner import TemplateScanner
 
 class WikiFile:
     '''
@@ -14,26 +19,64 @@ class WikiFile:
     see https://en.wikipedia.org/wiki/Help:Wikitext
     '''
 
-    def __init__(self, name, wikiFileManager:WikiFileManager=None, wikiText: str = None, debug=False):
+    def __init__(self, name, wikiFileManager:WikiFileManager=None, wikiText: str = None, debug=False, lazy:bool=False, wikiTextPath:str=None):
         """
 
         Args:
             name: page title of the wikiText file
             wikiFileManager: WikiFileManager providing context information for this WikiFile
             wikiText: WikiPage content as string. If None try to init the wikiText from source location
+            lazy: If True and no wikiText is given the wikiText is read from the source location on first access
+            wikiTextPath: the source location of the wikiText file - default is the wikiTextPath of the wikiFileManager
         """
         self.wikiFileManager=wikiFileManager
+        self.wikiTextPath=wikiTextPath
+        if self.wikiTextPath is None and wikiFileManager is not None:
+            self.wikiTextPath=wikiFileManager.wikiTextPath
         self.pageTitle = self.sanitizePageTitle(name)
         if wikiFileManager:
             self.wiki_render = wikiFileManager.wikiRender
         self.debug = debug
         self._wikiText=wikiText
-        if wikiText is None:
-            self._wikiText=self.get_wikiText_from_source()
         self._parsedWikiText=None
+        self.loadedHash=None
+        self.lazy=lazy and wikiText is None
+        self.isLoaded=wikiText is not None
+        if not self.isLoaded and not self.lazy:
+            self.load()
+
+    def load(self):
+        """
+        read the wikiText from the source location
+        """
+        self._wikiText=self.get_wikiText_from_source()
+        self._parsedWikiText=None
+        self.isLoaded=True
+        if self._wikiText is not None:
+            self.markAsLoaded()
+
+    def release(self) -> bool:
+        """
+        release the wikiText of a lazily loaded WikiFile - it is read again from the source location on the next access.
+        Allows to work on all pages of a backup with bounded memory.
+
+        Returns:
+            True if the wikiText was released. False if the WikiFile is not lazy or has unsaved modifications
+        """
+        if not self.lazy:
+            return False
+        if self.isLoaded:
+            if self.isModified():
+                return False
+            self._wikiText=None
+            self._parsedWikiText=None
+            self.isLoaded=False
+        return True
 
     @property
     def wikiText(self):
+        if not self.isLoaded:
+            self.load()
         if self._parsedWikiText is None:
             return self._wikiText
         else:
@@ -42,19 +85,79 @@ class WikiFile:
     @wikiText.setter
     def wikiText(self, wikiText:str):
         self._wikiText=wikiText
+        self.isLoaded=True
         if self._parsedWikiText is not None:
             # update parsed wikiText
-            self._parsedWikiText=wtp.parse(wikiText)
+            self._parsedWikiText=WikiFile.parse(wikiText)
 
     @property
     def parsedWikiText(self):
+        if not self.isLoaded:
+            self.load()
         if self._parsedWikiText is None and self._wikiText is not None:
-            self._parsedWikiText=wtp.parse(self._wikiText)
+            stats=Stats.getInstance()
+            with stats.timer("parse"):
+                self._parsedWikiText=WikiFile.parse(self._wikiText)
+            stats.count("parse.pages")
         return self._parsedWikiText
 
     @parsedWikiText.setter
     def parsedWikiText(self, parsedWikiText: wtp.WikiText):
         self._parsedWikiText=parsedWikiText
+        self.isLoaded=True
+
+    # shared cache of the parses of all WikiFiles of this process e.g. ParseCache() - disabled by default (see --parseCache)
+    parseCache=None
+
+    @staticmethod
+    def parse(wikiText:str) -> wtp.WikiText:
+        """
+        parse the given wikiText - parses of the same content are reused from the parseCache
+
+        Args:
+            wikiText(str): the wiki markup
+
+        Returns:
+            WikiText: a new parsed wikiText object that may be modified
+        """
+        if WikiFile.parseCache is None:
+            return wtp.parse(wikiText)
+        return WikiFile.parseCache.parse(wikiText, key=WikiFile.getContentHash(wikiText))
+
+    @staticmethod
+    def getContentHash(wikiText:str) -> str:
+        """
+        get the hash of the given wikiText
+
+        Args:
+            wikiText(str): the wiki markup - None is handled as empty page
+
+        Returns:
+            str: hex digest of the content
+        """
+        if wikiText is None:
+            wikiText=""
+        return hashlib.sha1(wikiText.encode()).hexdigest()
+
+    def markAsLoaded(self):
+        """
+        record the hash of the current wikiText as the content that is stored in the backup/wiki the text was loaded from
+        """
+        self.loadedHash=WikiFile.getContentHash(self.wikiText)
+
+    def isModified(self) -> bool:
+        """
+        Checks if the wikiText was changed since it was loaded
+
+        Returns:
+            True if the wikiText differs from the loaded content or if it is unknown where the wikiText was loaded from.
+            False for lazy WikiFiles whose wikiText was not read (or was released) as it equals the source content
+        """
+        if self.lazy and not self.isLoaded:
+            return False
+        if self.loadedHash is None:
+            return True
+        return WikiFile.getContentHash(self.wikiText) != self.loadedHash
 
     def sanitizePageTitle(self, name:str):
         """
@@ -71,7 +174,7 @@ class WikiFile:
             if name.endswith(suffix):
                 name=name[:-len(suffix)]
             # if completely migrated to python 3.9 exchange with removeprefix()
-            prefix=f"{self.wikiFileManager.wikiTextPath}/"
+            prefix=f"{self.wikiTextPath}/"
             if name.startswith(prefix):
                 name=name[len(prefix):]
         return name
@@ -87,34 +190,47 @@ class WikiFile:
         WikiFile.write_to_file(self.file_path, self.pageTitle, str(self), overwrite=overwrite)
 
     @staticmethod
-    def write_to_file(path:str, pageTitle,content:str,overwrite:bool=False, debug:bool=False):
+    def write_to_file(path:str, pageTitle,content:str,overwrite:bool=False, debug:bool=False) -> bool:
         """
+        Save the given content as wikiText file of the given page. Files that already hold the content are not rewritten.
 
         Args:
-            path:
-            content:
-            overwrite:
-            debug:
+            path: the root of the wikiText directory
+            pageTitle: title of the page
+            content: the wikiText to save
+            overwrite: If True existing files will be over written and if the path does not exist the missing folder will be created. Otherwise, only missing files will be saved.
+            debug: True if debugging should be switched on
 
         Returns:
-
+            True if the file holds the given content afterwards
         """
         wiki_file_path = WikiFile.get_wiki_path(path, pageTitle)
+        content=str(content)
         mode = "w"
-        if overwrite:
-            mode = 'w'
-            os.makedirs(os.path.dirname(wiki_file_path), exist_ok=True)
-        else:
-            if os.path.isfile(wiki_file_path):
+        stats=Stats.getInstance()
+        if os.path.isfile(wiki_file_path):
+            if not overwrite:
                 # file already exists
                 if debug:
                     print(
                         f"File {wiki_file_path} exists \t-> Generated page not saved. To save also existing pages use -f to overwrite them.", )
-                    return
-        with open(wiki_file_path, mode=mode) as f:
-            f.write(str(content))
+                return False
+            with open(wiki_file_path, mode="r") as f:
+                if f.read() == content:
+                    if debug:
+                        print(f"{pageTitle} is unchanged")
+                    return True
+        elif os.path.dirname(wiki_file_path):
+            os.makedirs(os.path.dirname(wiki_file_path), exist_ok=True)
+        with stats.timer("write"):
+            with open(wiki_file_path, mode=mode) as f:
+                f.write(content)
+        if stats.enabled:
+            stats.count("write.files")
+            stats.count("write.bytes", len(content.encode()))
         if debug:
             print(f"{pageTitle} saved to {path}")
+        return True
 
     def get_wikiText_from_source(self):
         """
@@ -126,13 +242,144 @@ class WikiFile:
         Returns:
             WikiText object
         """
-        fname = WikiFile.get_wiki_path(self.wikiFileManager.wikiTextPath, self.pageTitle)
+        return WikiFile.readWikiText(self.wikiTextPath, self.pageTitle)
+
+    @staticmethod
+    def readWikiText(path:str, pageTitle:str):
+        """
+        read the wikiText of the given page from the wikiText file located at the given path
+
+        Args:
+            path(str): the root of the wikiText directory
+            pageTitle(str): title of the page
+
+        Returns:
+            the wikiText of the page or None if there is no file for the page
+        """
+        fname = WikiFile.get_wiki_path(path, pageTitle)
         if os.path.isfile(fname):
-            with open(fname, mode='r') as file:
-                page = file.read()
+            stats=Stats.getInstance()
+            with stats.timer("read"):
+                with open(fname, mode='r') as file:
+                    page = file.read()
+            if stats.enabled:
+                stats.count("read.files")
+                stats.count("read.bytes", os.path.getsize(fname))
             return page
         return None
 
+    @staticmethod
+    def extractTemplateFromFile(path:str, pageTitle:str, templateName:str):
+        """
+        Extracts the template data of the given page from the wikiText file located at the given path.
+        Does not need a WikiFileManager and can therefore be used as task of a worker process.
+
+        Args:
+            path(str): the root of the wikiText directory
+            pageTitle(str): title of the page
+            templateName(str): name of the template that should be extracted
+
+        Returns:
+            list of dicts (see extractTemplate) or None if there is no file for the page
+        """
+        lods=WikiFile.extractTemplatesFromFile(path, pageTitle, [templateName])
+        if lods is None:
+            return None
+        return lods[templateName]
+
+    @staticmethod
+    def extractTemplatesFromFile(path:str, pageTitle:str, templateNames:list):
+        """
+        Extracts the data of the given templates of the given page from the wikiText file located at the given path
+        in one traversal of the page
+
+        Args:
+            path(str): the root of the wikiText directory
+            pageTitle(str): title of the page
+            templateNames(list): names of the templates that should be extracted
+
+        Returns:
+            dict of lods by template name (see extractTemplates) or None if there is no file for the page
+        """
+        filePath=WikiFile.get_wiki_path(path, pageTitle)
+        if not os.path.isfile(filePath):
+            return None
+        if not TemplateScanner.fileMayContainTemplates(filePath, [WikiFile.get_template_name(templateName) for templateName in templateNames]):
+            Stats.getInstance().count("read.skipped")
+            return {templateName:[] for templateName in templateNames}
+        wikiText=WikiFile.readWikiText(path, pageTitle)
+        return WikiFile(pageTitle, wikiText=wikiText).extractTemplates(templateNames)
+
+    @staticmethod
+    def extractTemplateFromFiles(path:str, pageTitles:list, templateName:str, workers:int=1):
+        """
+        Extracts the template data of the given pages from the wikiText files located at the given path.
+        If more than one worker is requested the pages are sharded and parsed in a pool of worker processes.
+        The results are always yielded in the order of the given pageTitles.
+
+        Args:
+            path(str): the root of the wikiText directory
+            pageTitles(list): titles of the pages
+            templateName(str): name of the template that should be extracted
+            workers(int): number of worker processes to use. If 1 or less the pages are parsed in this process
+
+        Returns:
+            generator of (pageTitle, records) tuples - records is None if there is no file for the page
+        """
+        for pageTitle, lods in WikiFile.extractTemplatesFromFiles(path, pageTitles, [templateName], workers=workers):
+            yield pageTitle, None if lods is None else lods[templateName]
+
+    @staticmethod
+    def extractTemplatesFromFiles(path:str, pageTitles:list, templateNames:list, workers:int=1):
+        """
+        Extracts the data of the given templates of the given pages from the wikiText files located at the given path
+        reading and traversing each page only once (see extractTemplateFromFiles)
+
+        Args:
+            path(str): the root of the wikiText directory
+            pageTitles(list): titles of the pages
+            templateNames(list): names of the templates that should be extracted
+            workers(int): number of worker processes to use. If 1 or less the pages are parsed in this process
+
+        Returns:
+            generator of (pageTitle, lods) tuples - lods is the dict of lods by template name or None if there is no file for the page
+        """
+        pageTitles=list(pageTitles)
+        if workers is None or workers <= 1:
+            for pageTitle in pageTitles:
+                yield pageTitle, WikiFile.extractTemplatesFromFile(path, pageTitle, templateNames)
+        else:
+            # several chunks per worker to balance pages of different size
+            chunksize=max(1, len(pageTitles)//(workers*4))
+            stats=Stats.getInstance()
+            task=WikiFile.extractTemplatesFromFileWithStats if stats.enabled else WikiFile.extractTemplatesFromFile
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results=executor.map(task,
+                                     repeat(path),
+                                     pageTitles,
+                                     repeat(templateNames),
+                                     chunksize=chunksize)
+                for pageTitle, result in zip(pageTitles, results):
+                    if stats.enabled:
+                        # the statistics of the worker process are merged into the statistics of this process
+                        result, workerStats=result
+                        stats.merge(workerStats)
+                    yield pageTitle, result
+
+    @staticmethod
+    def extractTemplatesFromFileWithStats(path:str, pageTitle:str, templateNames:list):
+        """
+        task of a worker process - extracts the templates (see extractTemplatesFromFile) and returns the statistics of the extraction
+
+        Returns:
+            tuple: the result of extractTemplatesFromFile and the statistics (see Stats.asDict())
+        """
+        stats=Stats.getInstance()
+        stats.enable()
+        stats.reset()
+        lods=WikiFile.extractTemplatesFromFile(path, pageTitle, templateNames)
+        return lods, stats.asDict()
+
     def get_template(self, template_name: str):
         """
         Returns the template
@@ -332,32 +579,92 @@ class WikiFile:
         else:
             WikiFile.update_arguments(template, data, overwrite, prettify)
 
-    def extractTemplate(self, templateName, match:dict={}) -> list:
+    def extractTemplate(self, templateName, match:dict={}, fastScan:bool=True) -> list:
         """
         Extracts the template data and returns it as dict
 
         Args:
             name: name of the template that should be extracted
             match(dict):
+            fastScan(bool): If True and the wikiText is not parsed yet, flat templates are extracted with the TemplateScanner. Nested or ambiguous markup is always parsed with wikitextparser.
 
         Returns:
             Returns template content as dict and a list if multiple instances of the template are found
         """
+        if not self.isLoaded:
+            self.load()
+        stats=Stats.getInstance()
+        if fastScan and not match and self._parsedWikiText is None and self._wikiText is not None:
+            with stats.timer("scan"):
+                lod=TemplateScanner.extractTemplate(self._wikiText, WikiFile.get_template_name(templateName))
+            if lod is not None:
+                stats.count("templates.matched", len(lod))
+                return lod
         templates=self.getTemplatesByName(templateName, match=match)
         lod=[]
         for template in templates:
             if template is None:
                 continue
-            records = {}
-            for arg in template.arguments:
-                value = arg.value.strip()
-                if value.endswith("\n"):
-                    value = value[:-1]
-                records[arg.name.strip()] = value
+            records = WikiFile.getTemplateRecords(template)
             if records:
                 lod.append(records)
+        stats.count("templates.matched", len(lod))
         return lod
 
+    def extractTemplates(self, templateNames:list, fastScan:bool=True) -> dict:
+        """
+        Extracts the data of all given templates in one traversal of the templates of this page
+
+        Args:
+            templateNames(list): names of the templates that should be extracted
+            fastScan(bool): If True and the wikiText is not parsed yet, flat templates are extracted with the TemplateScanner (see extractTemplate)
+
+        Returns:
+            dict: the list of dicts (see extractTemplate) of each template by the given template name
+        """
+        if not self.isLoaded:
+            self.load()
+        targetNames={WikiFile.get_template_name(templateName):templateName for templateName in templateNames}
+        lods={templateName:[] for templateName in templateNames}
+        stats=Stats.getInstance()
+        if fastScan and self._parsedWikiText is None and self._wikiText is not None:
+            with stats.timer("scan"):
+                scannedLods=TemplateScanner.extractTemplates(self._wikiText, list(targetNames.keys()))
+            if scannedLods is not None:
+                for name, lod in scannedLods.items():
+                    lods[targetNames[name]]=lod
+                    stats.count("templates.matched", len(lod))
+                return lods
+        if self.parsedWikiText is None or self.parsedWikiText.templates is None:
+            return lods
+        for template in self.parsedWikiText.templates:
+            name = WikiFile.get_template_name(template.name)
+            if name in targetNames:
+                records = WikiFile.getTemplateRecords(template)
+                if records:
+                    lods[targetNames[name]].append(records)
+                    stats.count("templates.matched")
+        return lods
+
+    @staticmethod
+    def getTemplateRecords(template:Template) -> dict:
+        """
+        get the arguments of the given template as dict
+
+        Args:
+            template(Template): the parsed template
+
+        Returns:
+            dict: the stripped argument values by argument name
+        """
+        records = {}
+        for arg in template.arguments:
+            value = arg.value.strip()
+            if value.endswith("\n"):
+                value = value[:-1]
+            records[arg.name.strip()] = value
+        return records
+
     def extract_template(self, name: str):
         """
         Extracts the template data and returns it as dict
@@ -386,16 +693,30 @@ class WikiFile:
     def getPageTitle(self):
         return self.pageTitle
 
-    def pushToWiki(self, msg:str=None):
+    def pushToWiki(self, msg:str=None, force:bool=False) -> bool:
         """
         Pushes the wikiMarkup/WikiText of this object to the target wiki of the wikiFileManager on the page
         corresponding to the pageTitle of the object.
+        The push is skipped if the wikiText was not modified since it was loaded.
 
         Args:
             msg(str): Summary of the update (shown as comment in the history of the page)
-        """
-        page = self.wikiFileManager.wikiPush.toWiki.getPage(self.getPageTitle())
-        page.edit(self.wikiText, msg)
+            force(bool): If True the wikiText is also pushed if it was not modified
+
+        Returns:
+            True if the page was edited
+        """
+        if not force and not self.isModified():
+            if self.debug:
+                print(f"{self.getPageTitle()} is unchanged -> push skipped")
+            return False
+        stats=Stats.getInstance()
+        stats.count("http.calls")
+        with stats.timer("http"):
+            page = self.wikiFileManager.wikiPush.toWiki.getPage(self.getPageTitle())
+            page.edit(self.wikiText, msg)
+        self.markAsLoaded()
+        return True
 
     @staticmethod
     def get_wiki_path(path: str, name: str):
@@ -2,12 +2,20 @@ import os
 import re
 import sys
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 
 from lodstorage.lod import LOD
 from typing import List
 from wikibot3rd.wikipush import WikiPush
 from wikifile.wikiFile import WikiFile
 from wikifile.cmdline import CmdLineAble
+from wikifile.columnarTable import ColumnarTable
+from wikifile.sqliteSink import SQLiteSink
+from wikifile.stats import Stats
+from wikifile.templateIndex import TemplateIndex
+from wikifile.templateScanner import TemplateScanner
+from wikifile.mediaWikiApi import MediaWikiApi
+from wikifile.rateLimiter import RateLimiter
 from wikifile.wikiRender import WikiRender
 
 
@@ -16,7 +24,7 @@ class WikiFileManager(CmdLineAble):
     access to Wiki markup files for a given wiki
     '''
 
-    def __init__(self, sourceWikiId:str, wikiTextPath:str=None,targetWikiTextPath:str=None, targetWikiId:str=None, login=True,debug=False):
+    def __init__(self, sourceWikiId:str, wikiTextPath:str=None,targetWikiTextPath:str=None, targetWikiId:str=None, login=True,debug=False, withTemplateIndex:bool=False):
         '''
         constructor
         
@@ -27,6 +35,7 @@ class WikiFileManager(CmdLineAble):
             targetWikiId(str): the target wikiId of the wiki were pages should be pushed to
             login(bool): do we need to login to the wiki
             debug(bool): True if debugging should be switched on 
+            withTemplateIndex(bool): If True template lookups use a persistent template index of the wikiTextPath
         '''
         super(WikiFileManager, self).__init__()
         self.sourceWikiId=sourceWikiId
@@ -41,6 +50,9 @@ class WikiFileManager(CmdLineAble):
         self.wikiPush = WikiPush(fromWikiId=sourceWikiId, toWikiId=self.targetWikiId, login=login, debug=debug)
         self.debug = debug
         self.wikiRender = WikiRender()
+        self.withTemplateIndex=withTemplateIndex
+        self.templateIndex=None
+        self.mediaWikiApi=None
 
 
     def getWikiClient(self):
@@ -63,6 +75,29 @@ class WikiFileManager(CmdLineAble):
             wikiUser=wikiClient.wikiUser
         return wikiUser
 
+    def getMediaWikiApi(self) -> MediaWikiApi:
+        '''
+        get the MediaWikiApi of the source wiki - it shares the connection pool (and login) of the source wiki client
+
+        Returns:
+            MediaWikiApi: api client for bulk requests to the source wiki
+        '''
+        if self.mediaWikiApi is None:
+            self.mediaWikiApi=MediaWikiApi.ofWikiClient(self.wikiPush.fromWiki, debug=self.debug)
+        return self.mediaWikiApi
+
+    def getTemplateIndex(self) -> TemplateIndex:
+        '''
+        get the template index of my wikiTextPath - the index is updated on first access
+
+        Returns:
+            TemplateIndex: the template index of the wikiTextPath
+        '''
+        if self.templateIndex is None:
+            self.templateIndex=TemplateIndex(self.wikiTextPath, debug=self.debug)
+            self.templateIndex.update()
+        return self.templateIndex
+
     @staticmethod
     def getPageTitlesLocatedAt(path:str)->list:
         '''
@@ -97,7 +132,7 @@ class WikiFileManager(CmdLineAble):
         return wikiFiles
 
 
-    def importLODtoWiki(self, data: list, wikiSon: str, titleKey: str = "pageTitle"):
+    def importLODtoWiki(self, data: list, wikiSon: str, titleKey: str = "pageTitle", workers:int=1):
         """
         Uses the given data and updates the corresponding pages in the wiki.
         It is assumed that the page title is part of the dict binding the values of the dict to the corresponding page.
@@ -106,17 +141,18 @@ class WikiFileManager(CmdLineAble):
             data(list): List of Dicts that should be used to update the corresponding pages in the wiki
             wikiSon(str): Name of the wikiSon object that should be updated/created
             titleKey(str): Name of the key that holds the pageTitle. Default is "pageTitle"
+            workers(int): number of pages that are pushed concurrently
 
         Returns:
-
+            list: push report see pushWikiFilesToWiki()
         """
         pageDict = self.pagesListToDict(data, titleKey)
         wiki_files = self.getUpdatedPages(pageDict, wikiSon)
-        self.pushWikiFilesToWiki(wiki_files)
+        return self.pushWikiFilesToWiki(wiki_files, workers=workers)
 
 
     def exportWikiSonToLOD(self, pageTitels: list, wikiSonName: str, pageTitleKey: str = "pageTitle",
-                           properties: list = [], limitProperties: bool = False) -> List[dict]:
+                           properties: list = [], limitProperties: bool = False, workers:int=1) -> List[dict]:
         """
         Exports the WikiSon entities from the WikiFiles identified by the given pageTitles corresponding to the given
         WikiSonName and returns the values as list of dicts.
@@ -127,19 +163,114 @@ class WikiFileManager(CmdLineAble):
             pageTitleKey(str): Name of the key that should be used to identify the pageTitle. This name should be distinct form other properties of the object
             properties(list): List of property names that should occur in the returned LoD. Order of the list is used as order of result. Default is null.
             limitProperties(bool): If true the resulting dicts only contain keys that are present in the given properties list any other key is removed. Otherwise all properties that are either given or defined are present in the result. Defualt is False.
+            workers(int): number of worker processes used to parse the pages. Default is 1 (no worker processes)
 
         Returns:
             List of dicts containing the WikiSon entities of the given pages
         """
         lod = []
-        for pageTitle in pageTitels:
-            wikiFile = self.getWikiFile(pageTitle)
-            wikiSonEntities=wikiFile.extractTemplate(wikiSonName)
+        for pageTitle, wikiSonEntities in self.extractTemplateFromPages(pageTitels, wikiSonName, workers=workers):
             if wikiSonEntities:
                 wikiSon=wikiSonEntities.pop()
                 wikiSon[pageTitleKey] = pageTitle
                 lod.append(wikiSon)
+        return WikiFileManager.normalizeLOD(lod, properties, limitProperties)
+
+    def exportWikiSonToColumns(self, pageTitles: list, wikiSonName: str, pageTitleKey: str = "pageTitle",
+                               properties: list = None, limitProperties: bool = False, workers:int=1) -> ColumnarTable:
+        """
+        Exports the WikiSon entities from the WikiFiles identified by the given pageTitles corresponding to the given
+        WikiSonName into per property columns. Other than exportWikiSonToLOD the records are not padded and reordered.
+
+        Args:
+            pageTitles(list): List of all pageTitles from which the given WikiSon entity should be extracted
+            wikiSonName(str): Name of the WikiSon object that should be extracted
+            pageTitleKey(str): Name of the column that should be used to identify the pageTitle. This name should be distinct form other properties of the object
+            properties(list): List of property names that should be the first columns of the table
+            limitProperties(bool): If true the table only contains the columns of the given properties (and the pageTitleKey)
+            workers(int): number of worker processes used to parse the pages. Default is 1 (no worker processes)
+
+        Returns:
+            ColumnarTable containing the WikiSon entities of the given pages
+        """
+        columns=list(properties) if properties is not None else []
+        if limitProperties and pageTitleKey not in columns:
+            columns.append(pageTitleKey)
+        table=ColumnarTable(columns, limitColumns=limitProperties)
+        for pageTitle, wikiSonEntities in self.extractTemplateFromPages(pageTitles, wikiSonName, workers=workers):
+            if wikiSonEntities:
+                wikiSon=wikiSonEntities.pop()
+                wikiSon[pageTitleKey] = pageTitle
+                table.addRecord(wikiSon)
+        return table
+
+    def exportWikiSonsToSQLite(self, pageTitles: list, wikiSonNames: list, dbFile: str, pageTitleKey: str = "pageTitle",
+                               workers:int=1, batchSize:int=1000) -> dict:
+        """
+        Streams the WikiSon entities of the given WikiSonNames from the WikiFiles identified by the given pageTitles
+        into SQLite tables named like the WikiSon objects. The entities are inserted in batches while the pages are
+        extracted so that the records are never held in memory completely.
+
+        Args:
+            pageTitles(list): List of all pageTitles from which the given WikiSon entities should be extracted
+            wikiSonNames(list): Names of the WikiSon objects that should be extracted
+            dbFile(str): location of the SQLite database file
+            pageTitleKey(str): Name of the column that should be used to identify the pageTitle
+            workers(int): number of worker processes used to parse the pages. Default is 1 (no worker processes)
+            batchSize(int): number of records that are inserted at once
+
+        Returns:
+            dict: number of stored entities by WikiSon name
+        """
+        sinks={wikiSonName:SQLiteSink(dbFile, wikiSonName, batchSize=batchSize, debug=self.debug) for wikiSonName in wikiSonNames}
+        try:
+            for pageTitle, entitiesByName in self.extractTemplatesFromPages(pageTitles, wikiSonNames, workers=workers):
+                for wikiSonName, wikiSonEntities in entitiesByName.items():
+                    if wikiSonEntities:
+                        wikiSon=wikiSonEntities.pop()
+                        wikiSon[pageTitleKey] = pageTitle
+                        sinks[wikiSonName].addRecord(wikiSon)
+        finally:
+            for sink in sinks.values():
+                sink.close()
+        return {wikiSonName:sink.count for wikiSonName, sink in sinks.items()}
+
+    def exportWikiSonsToLOD(self, pageTitles: list, wikiSonNames: list, pageTitleKey: str = "pageTitle", workers:int=1) -> dict:
+        """
+        Exports the WikiSon entities of all given WikiSonNames from the WikiFiles identified by the given pageTitles.
+        Each page is read and traversed only once for all WikiSon names.
+
+        Args:
+            pageTitles(list): List of all pageTitles from which the given WikiSon entities should be extracted
+            wikiSonNames(list): Names of the WikiSon objects that should be extracted
+            pageTitleKey(str): Name of the key that should be used to identify the pageTitle. This name should be distinct form other properties of the object
+            workers(int): number of worker processes used to parse the pages. Default is 1 (no worker processes)
 
+        Returns:
+            dict: List of dicts of the WikiSon entities (see exportWikiSonToLOD) by WikiSon name
+        """
+        lods={wikiSonName:[] for wikiSonName in wikiSonNames}
+        for pageTitle, entitiesByName in self.extractTemplatesFromPages(pageTitles, wikiSonNames, workers=workers):
+            for wikiSonName, wikiSonEntities in entitiesByName.items():
+                if wikiSonEntities:
+                    wikiSon=wikiSonEntities.pop()
+                    wikiSon[pageTitleKey] = pageTitle
+                    lods[wikiSonName].append(wikiSon)
+        return {wikiSonName:WikiFileManager.normalizeLOD(lod, []) for wikiSonName, lod in lods.items()}
+
+    @staticmethod
+    def normalizeLOD(lod:list, properties:list, limitProperties:bool=False) -> list:
+        """
+        Normalizes the given records to have the same keys in the order of the given properties
+
+        Args:
+            lod(list): the records
+            properties(list): List of property names that should occur in the records. Keys used by the records are added to the list.
+            limitProperties(bool): If true the resulting dicts only contain keys that are present in the given properties list
+
+        Returns:
+            list of the normalized records
+        """
         # Build up the set of keys
         keys = set()
         if not limitProperties:
@@ -169,8 +300,51 @@ class WikiFileManager(CmdLineAble):
             lod[pos] = dict(sorted(record.items(), key=lambda x: propertyMap[x[0]]))
         return lod
 
+    def extractTemplateFromPages(self, pageTitles:list, templateName:str, workers:int=1):
+        """
+        Extracts the given template from the pages identified by the given pageTitles.
+        With more than one worker the pages located at the wikiTextPath are parsed in a pool of worker processes,
+        pages that are not located there are retrieved from the source wiki.
+
+        Args:
+            pageTitles(list): titles of the pages the template should be extracted from
+            templateName(str): Name of the template that should be extracted
+            workers(int): number of worker processes used to parse the pages. Default is 1 (no worker processes)
+
+        Returns:
+            generator of (pageTitle, records) tuples in the order of the given pageTitles
+        """
+        for pageTitle, lods in self.extractTemplatesFromPages(pageTitles, [templateName], workers=workers):
+            yield pageTitle, lods[templateName]
+
+    def extractTemplatesFromPages(self, pageTitles:list, templateNames:list, workers:int=1):
+        """
+        Extracts the given templates from the pages identified by the given pageTitles in one traversal of each page
+        (see extractTemplateFromPages)
+
+        Args:
+            pageTitles(list): titles of the pages the templates should be extracted from
+            templateNames(list): Names of the templates that should be extracted
+            workers(int): number of worker processes used to parse the pages. Default is 1 (no worker processes)
+
+        Returns:
+            generator of (pageTitle, lods) tuples in the order of the given pageTitles - lods is a dict of the records by template name
+        """
+        if workers is None or workers <= 1:
+            for pageTitle in pageTitles:
+                if not self.mayContainTemplates(pageTitle, templateNames):
+                    yield pageTitle, {templateName:[] for templateName in templateNames}
+                    continue
+                wikiFile = self.getWikiFile(pageTitle)
+                yield pageTitle, wikiFile.extractTemplates(templateNames)
+        else:
+            for pageTitle, lods in WikiFile.extractTemplatesFromFiles(self.wikiTextPath, pageTitles, templateNames, workers=workers):
+                if lods is None:
+                    lods=self.getWikiFile(pageTitle).extractTemplates(templateNames)
+                yield pageTitle, lods
+
     @classmethod
-    def convertWikiFilesToLOD(cls, wikiFiles: list, templateName: str, limit:int=None):
+    def convertWikiFilesToLOD(cls, wikiFiles: list, templateName: str, limit:int=None, records:dict=None):
         '''
         converts the given wikiFiles to list of dicts 
         by extracting the given templateName from the wikiPage corresponding to
@@ -180,6 +354,7 @@ class WikiFileManager(CmdLineAble):
             wikiFiles(list): pageTitles to convert to list of dict
             templateName(str): Name of the template/entity/WikiSon object that should be extracted
             limit(int): limit the number of converted records
+            records(dict): the already extracted records of the template by pageTitle (see getWikiFilesWithRecords) - pages without records are extracted
 
         Returns:
             list: a list of dicts with the content
@@ -187,9 +362,14 @@ class WikiFileManager(CmdLineAble):
         lod = []
         for wikifile in wikiFiles:
             if isinstance(wikifile, WikiFile):
-                wikiSonEntities = wikifile.extractTemplate(templateName)
+                wikiSonEntities = None
+                if records is not None:
+                    wikiSonEntities = records.get(wikifile.getPageTitle())
+                if wikiSonEntities is None:
+                    wikiSonEntities = wikifile.extractTemplate(templateName)
                 if wikiSonEntities:
-                    wikiSonEntity=wikiSonEntities.pop()
+                    # copy as the given records stay untouched
+                    wikiSonEntity=dict(wikiSonEntities[-1])
                     pageTitle = wikifile.getPageTitle()
                     if pageTitle is not None:
                         wikiSonEntity['pageTitle']= pageTitle
@@ -223,26 +403,109 @@ class WikiFileManager(CmdLineAble):
                 del record[titleKey] 
         return pagesDict
 
-    def pushWikiFilesToWiki(self, wiki_files: list, updateMsg:str=None):
+    def pushWikiFilesToWiki(self, wiki_files: list, updateMsg:str=None, workers:int=1, retries:int=3,
+                            backoff:float=1.0, requestsPerSecond:float=None, skipUnchanged:bool=True) -> list:
         """
         Pushes the content of the given wikiFiles to the corresponding wiki pages in the wiki
         If targetWikiId is not defined no pages will be pushed
+        WikiFiles that were not modified since they were loaded are skipped (see WikiFile.isModified())
         
         Args:
             wiki_files: list of WikiFiles that should be pushed to the wiki
+            updateMsg(str): Summary of the update (shown as comment in the history of the pages)
+            workers(int): number of pages that are pushed concurrently
+            retries(int): number of retries of a failed edit
+            backoff(float): seconds to wait before the first retry - doubled with each further retry
+            requestsPerSecond(float): maximum number of edits per second over all workers - if None the edits are not limited
+            skipUnchanged(bool): If True unmodified WikiFiles are not pushed
 
         Returns:
-            Nothing
+            list: push report with one dict per page containing pageTitle, status ("success", "skipped" or "failed"), attempts and error
         """
         if self.targetWikiId is None:
             warnings.warn("targetWikiId needs to be defined to be able to push WikiFiles to a wiki", Warning)
-            return
-        for wiki_file in wiki_files:
-            if isinstance(wiki_file, WikiFile):
-                page_content = str(wiki_file)
-                if updateMsg is None: updateMsg=f"modified through WikiFileManager by {self.wikiPush.toWiki.wikiUser.user}"
-                page = self.wikiPush.toWiki.getPage(wiki_file.getPageTitle())
-                page.edit(page_content, updateMsg)
+            return []
+        if updateMsg is None:
+            updateMsg=f"modified through WikiFileManager by {self.wikiPush.toWiki.wikiUser.user}"
+        rateLimiter=RateLimiter(requestsPerSecond)
+        wiki_files=[wiki_file for wiki_file in wiki_files if isinstance(wiki_file, WikiFile)]
+        def pushPage(wiki_file:WikiFile) -> dict:
+            if skipUnchanged and not wiki_file.isModified():
+                return {"pageTitle":wiki_file.getPageTitle(), "status":"skipped", "attempts":0, "error":None}
+            return self.pushWikiFileToWiki(wiki_file, updateMsg, retries, backoff, rateLimiter)
+        if workers > 1 and len(wiki_files) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                report=list(executor.map(pushPage, wiki_files))
+        else:
+            report=[pushPage(wiki_file) for wiki_file in wiki_files]
+        if self.debug:
+            print(f"pushed pages: {WikiFileManager.getPushSummary(report)}")
+        failures=[result for result in report if result["status"] == "failed"]
+        if failures:
+            warnings.warn(f"failed to push {len(failures)} of {len(report)} pages: {[result['pageTitle'] for result in failures]}", Warning)
+        return report
+
+    @staticmethod
+    def getPushSummary(report:list) -> dict:
+        """
+        count the pages of the given push report by status
+
+        Args:
+            report(list): push report see pushWikiFilesToWiki()
+
+        Returns:
+            dict: number of pages by status e.g. {"success":3, "skipped":40, "failed":0}
+        """
+        summary={"success":0, "skipped":0, "failed":0}
+        for result in report:
+            summary[result["status"]]=summary.get(result["status"], 0)+1
+        return summary
+
+    def pushWikiFileToWiki(self, wiki_file:WikiFile, updateMsg:str, retries:int=3, backoff:float=1.0,
+                           rateLimiter:RateLimiter=None) -> dict:
+        """
+        Pushes the content of the given wikiFile to the target wiki and retries edits that failed with a transient
+        error (see MediaWikiApi.isTransientError) with exponential backoff. Other errors fail without a retry.
+        The maxlag handling of the wiki client stays active for each attempt.
+
+        Args:
+            wiki_file(WikiFile): the WikiFile that should be pushed to the wiki
+            updateMsg(str): Summary of the update (shown as comment in the history of the page)
+            retries(int): number of retries of an edit that failed with a transient error
+            backoff(float): seconds to wait before the first retry - doubled with each further retry
+            rateLimiter(RateLimiter): limiter shared by all concurrent pushes
+
+        Returns:
+            dict: push result with pageTitle, status, attempts and error
+        """
+        if rateLimiter is None:
+            rateLimiter=RateLimiter()
+        pageTitle=wiki_file.getPageTitle()
+        result={"pageTitle":pageTitle, "status":"failed", "attempts":0, "error":None}
+        while result["attempts"] <= retries:
+            rateLimiter.wait()
+            result["attempts"]+=1
+            try:
+                stats=Stats.getInstance()
+                stats.count("http.calls")
+                with stats.timer("http"):
+                    page=self.wikiPush.toWiki.getPage(pageTitle)
+                    page.edit(str(wiki_file), updateMsg)
+                wiki_file.markAsLoaded()
+                result["status"]="success"
+                result["error"]=None
+                break
+            except Exception as ex:
+                result["error"]=str(ex)
+                if self.debug:
+                    print(f"push of {pageTitle} failed (attempt {result['attempts']}): {ex}")
+                if not MediaWikiApi.isTransientError(ex):
+                    # e.g. protected page or missing permission - a retry fails in the same way
+                    break
+                if result["attempts"] <= retries:
+                    # slow down all workers - the wiki is lagging or rate limiting
+                    rateLimiter.pause(backoff*2**(result["attempts"]-1))
+        return result
 
     def getUpdatedPages(self, records: dict, wikiSon: str) -> list:
         """
@@ -259,9 +522,11 @@ class WikiFileManager(CmdLineAble):
             List of WikiFile objects with the updated content
         """
         res = []
+        wikiFiles = self.getWikiFiles([pageTitle for pageTitle in records.keys() if pageTitle is not None])
         for pageTitle, values in records.items():
             if pageTitle is not None:
-                wiki_file = self.getUpdatedPage(pageTitle, values, wikiSon)
+                wiki_file = wikiFiles[pageTitle]
+                wiki_file.add_template(wikiSon, values, overwrite=True, prettify=True)
                 res.append(wiki_file)
         return res
 
@@ -290,14 +555,55 @@ class WikiFileManager(CmdLineAble):
             wikiFilesToWorkon(dict): dict of WikiFiles
 
         """
-        pageTitles= self.getPageTitlesForArgs(args)
         if args.template:
-            condition=lambda wikiFile:wikiFile.extractTemplate(args.template)
+            wikiFiles, _records=self.getWikiFilesWithRecordsForArgs(args)
         else:
+            pageTitles= self.getPageTitlesForArgs(args)
             condition=lambda wikiFile:wikiFile is not None
-        wikiFiles=self.getWikiFilesForPageTitles(pageTitles,condition)
+            wikiFiles=self.getWikiFilesForPageTitles(pageTitles,condition)
         return wikiFiles
-        
+
+    def getWikiFilesWithRecordsForArgs(self,args) -> tuple:
+        """
+        Get the WikiFiles of the given arguments that contain the template of the arguments together with the
+        extracted records of the template (see getWikiFilesWithRecords)
+
+        Args:
+            args(ArgumentParser): Command line arguments - the template argument is required
+
+        Returns:
+            tuple: dict of the WikiFiles by pageTitle and dict of the records of the template by pageTitle
+        """
+        if not args.template:
+            raise Exception("a template is needed to filter and extract the WikiFiles")
+        pageTitles= self.getPageTitlesForArgs(args)
+        if self.withTemplateIndex:
+            pageTitles=self.getTemplateIndex().filterPageTitles(pageTitles, args.template)
+        return self.getWikiFilesWithRecords(pageTitles, args.template)
+
+    def getWikiFilesWithRecords(self, pageTitles:list, templateName:str) -> tuple:
+        '''
+        filter and extract in one pass: get the WikiFiles of the given pages that contain the given template together
+        with the records of the template that were extracted to check the page - so that callers do not need to
+        extract the template again
+
+        Args:
+            pageTitles(list): titles of the pages
+            templateName(str): the name of the template
+
+        Returns:
+            tuple: dict of the matching WikiFiles by pageTitle and dict of the records of the template (see WikiFile.extractTemplate) by pageTitle
+        '''
+        wikiFiles={}
+        records={}
+        for pageTitle in self.scanPageTitles(pageTitles, [templateName]):
+            wikiFile=self.getWikiFile(pageTitle)
+            lod=wikiFile.extractTemplate(templateName)
+            if lod:
+                wikiFiles[pageTitle]=wikiFile
+                records[pageTitle]=lod
+        return wikiFiles, records
+
         
     def getWikiFilesForPageTitles(self,pageTitles:list,condition=None):
         '''
@@ -324,12 +630,45 @@ class WikiFileManager(CmdLineAble):
         Returns:
             dict: a map of wikiFiles by pageTitle
         '''
-        pageTitles=CmdLineAble.getPageTitlesForWikiTextPath(self.wikiTextPath)
-        condition=lambda wikiFile:wikiFile.extractTemplate(templateName)
-        wikiFiles=self.getWikiFilesForPageTitles(pageTitles, condition)
+        if self.withTemplateIndex:
+            pageTitles=self.getTemplateIndex().getPageTitlesForTemplate(templateName)
+        else:
+            pageTitles=CmdLineAble.getPageTitlesForWikiTextPath(self.wikiTextPath)
+        wikiFiles, _records=self.getWikiFilesWithRecords(pageTitles, templateName)
         return wikiFiles
     
 
+    def mayContainTemplates(self, pageTitle:str, templateNames:list) -> bool:
+        '''
+        Checks with a scan of the raw bytes of the wikiText file of the given page if the page may contain one of
+        the given templates (see TemplateScanner.fileMayContainTemplates)
+
+        Args:
+            pageTitle(str): title of the page
+            templateNames(list): names of the templates
+
+        Returns:
+            False if the page is located at the wikiTextPath and can not contain the templates
+        '''
+        if self.wikiTextPath is None:
+            return True
+        templateNames=[WikiFile.get_template_name(templateName) for templateName in templateNames]
+        return TemplateScanner.fileMayContainTemplates(WikiFile.get_wiki_path(self.wikiTextPath, pageTitle), templateNames)
+
+    def scanPageTitles(self, pageTitles:list, templateNames:list) -> list:
+        '''
+        filter-only scan of the given pages: pages located at the wikiTextPath whose raw content does not contain any
+        of the given template names are removed without reading their text
+
+        Args:
+            pageTitles(list): titles of the pages
+            templateNames(list): names of the templates
+
+        Returns:
+            list: the pageTitles of the pages that may contain the templates
+        '''
+        return [pageTitle for pageTitle in pageTitles if self.mayContainTemplates(pageTitle, templateNames)]
+
     def getWikiFile(self, pageTitle: str, checkWiki:bool=True) -> WikiFile:
         """
         Get the WikiFile object for the given pageTitle form the source path (or source wiki if checkWiki is true)
@@ -342,22 +681,73 @@ class WikiFileManager(CmdLineAble):
         Returns:
             WikiFile corresponding the the given pageTitle
         """
-        wikiText=None
-        if self.fileExists(pageTitle):
-            wikiFilePath=WikiFile.get_wiki_path(self.wikiTextPath, pageTitle)
-            with open(wikiFilePath, mode='r') as file:
-                wikiText = file.read()
-        elif checkWiki:
-            pageItem = self.wikiPush.fromWiki.getPage(pageTitle)
-            wikiText = pageItem.text()
-        else:
-            wikiText=""
+        wikiText=WikiFile.readWikiText(self.wikiTextPath, pageTitle)
+        if wikiText is None:
+            if checkWiki:
+                stats=Stats.getInstance()
+                stats.count("http.calls")
+                with stats.timer("http"):
+                    pageItem = self.wikiPush.fromWiki.getPage(pageTitle)
+                    wikiText = pageItem.text()
+            else:
+                wikiText=""
         wiki_file = WikiFile(name=pageTitle,
                                 wikiText=wikiText,
                                 wikiFileManager=self,
                                 debug=self.debug)
+        wiki_file.markAsLoaded()
         return wiki_file
 
+    def getWikiFiles(self, pageTitles:list, checkWiki:bool=True) -> dict:
+        """
+        Get the WikiFile objects for the given pageTitles from the source path. Pages that are not located there are
+        retrieved from the source wiki (if checkWiki is true) with one api request per 50 pages.
+
+        Args:
+            pageTitles(list): Titles of the pages that should be retrieved
+            checkWiki(bool): If True pages that are not found in the backup are queried from the source wiki
+
+        Returns:
+            dict: WikiFiles by pageTitle
+        """
+        wikiTexts={}
+        missingPageTitles=[]
+        for pageTitle in pageTitles:
+            if self.fileExists(pageTitle):
+                wikiTexts[pageTitle]=WikiFile.readWikiText(self.wikiTextPath, pageTitle)
+            else:
+                missingPageTitles.append(pageTitle)
+        if checkWiki and missingPageTitles:
+            wikiTexts.update(self.getMediaWikiApi().getPageTexts(missingPageTitles))
+        wikiFiles={}
+        for pageTitle in pageTitles:
+            wikiText=wikiTexts.get(pageTitle)
+            wikiFiles[pageTitle]=WikiFile(name=pageTitle,
+                                          wikiText=wikiText if wikiText is not None else "",
+                                          wikiFileManager=self,
+                                          debug=self.debug)
+            wikiFiles[pageTitle].markAsLoaded()
+        return wikiFiles
+
+    def getWikiFilesFromWiki(self, pageTitles:list) -> dict:
+        """
+        Retrieves the wikiFiles from the source wiki with one api request per 50 pages
+        Args:
+            pageTitles: Titles of the pages that should be retrieved
+
+        Returns:
+            dict: WikiFiles by pageTitle
+        """
+        wikiTexts=self.getMediaWikiApi().getPageTexts(pageTitles)
+        wikiFiles={}
+        for pageTitle, wikiText in wikiTexts.items():
+            wikiFiles[pageTitle]=WikiFile(name=pageTitle,
+                                          wikiText=wikiText if wikiText is not None else "",
+                                          wikiFileManager=self,
+                                          debug=self.debug)
+            wikiFiles[pageTitle].markAsLoaded()
+        return wikiFiles
+
     def getWikiFileFromWiki(self, pageTitle:str) ->WikiFile:
         """
         Retrieves the wikiFile from the source wiki
@@ -367,12 +757,16 @@ class WikiFileManager(CmdLineAble):
         Returns:
             WikiFile corresponding the the given pageTitle
         """
-        pageItem = self.wikiPush.fromWiki.getPage(pageTitle)
-        wikiText = pageItem.text()
+        stats=Stats.getInstance()
+        stats.count("http.calls")
+        with stats.timer("http"):
+            pageItem = self.wikiPush.fromWiki.getPage(pageTitle)
+            wikiText = pageItem.text()
         wiki_file = WikiFile(name=pageTitle,
                              wikiText=wikiText,
                              wikiFileManager=self,
                              debug=self.debug)
+        wiki_file.markAsLoaded()
         return wiki_file
 
     def generateLink(self,page):
@@ -399,25 +793,42 @@ class WikiFileManager(CmdLineAble):
         return os.path.isfile(filePath)
 
 
-    def getAllWikiFiles(self,wikiTextPath:str=None):
+    def getAllWikiFiles(self,wikiTextPath:str=None, lazy:bool=True):
         '''
         get all wiki Files for the given wikiTextPath
 
         Args:
             wikiTextPath(str): the root of the wikiText directory (e.g. a wikiBackup target or staging area for generating or fixing/restoring wikiMarkup)
+            lazy(bool): If True the wikiText of the WikiFiles is only read when it is accessed
 
         Returns:
             dict: a lookup for WikiFiles by pageTitle
         '''
         allWikiFiles = {}
+        for wikiFile in self.iterWikiFiles(wikiTextPath, lazy=lazy):
+            allWikiFiles[wikiFile.getPageTitle()]=wikiFile
+        return allWikiFiles
+
+    def iterWikiFiles(self, wikiTextPath:str=None, lazy:bool=True, release:bool=True):
+        '''
+        iterate over all wiki Files of the given wikiTextPath. With lazy loading and release only the wikiText of
+        the current WikiFile is held in memory.
+
+        Args:
+            wikiTextPath(str): the root of the wikiText directory - default is the wikiTextPath of this WikiFileManager
+            lazy(bool): If True the wikiText of the WikiFiles is only read when it is accessed
+            release(bool): If True the wikiText of an unmodified lazy WikiFile is released when the next WikiFile is requested
+
+        Returns:
+            generator of WikiFiles
+        '''
         if wikiTextPath is None:
             wikiTextPath=self.wikiTextPath
-        for root, _dirnames, filenames in os.walk(wikiTextPath):
-            for filename in filenames:
-                if filename.endswith('.wiki'):
-                    wikiFile=WikiFile(filename, wikiFileManager=self)
-                    allWikiFiles[wikiFile.getPageTitle()]=wikiFile
-        return allWikiFiles
+        for pageTitle in CmdLineAble.getPageTitlesForWikiTextPath(wikiTextPath):
+            wikiFile=WikiFile(pageTitle, wikiFileManager=self, debug=self.debug, lazy=lazy, wikiTextPath=wikiTextPath)
+            yield wikiFile
+            if release:
+                wikiFile.release()
 
     def getAllPageTitlesFromFile(self,file=sys.stdin):
         '''
@@ -1,15 +1,20 @@
+import hashlib
 import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
 
 import wikifile
 from wikifile.utils import Widget
 from wikifile.wikiFile import WikiFile
-from wikifile.metamodel import Context, Topic, UML, Property, MetaModelElement
+from wikifile.metamodel import Context, Topic, UML, Property, PropertyIndex, MetaModelGraph, MetaModelElement, CompactTopic
 from wikifile.smw import SMWPart, SMW, Form, ListOf, Query, TemplatePage
 import json
 import sys
 import jinja2
 from distutils.sysconfig import get_python_lib
 from wikifile.cmdline import CmdLineAble
+from wikifile.buildManifest import BuildManifest
+from wikifile.stats import Stats
 
 
 class WikiRender(CmdLineAble):
@@ -34,7 +39,9 @@ class WikiRender(CmdLineAble):
         UPDATE_TEMPLATES_MODE = "update_templates"
         CREATE_FILE_MODE = "create"
         GENERATE_ENTITY_PAGES = "generate_entity_pages"
-        modes = [UPDATE_TEMPLATES_MODE, CREATE_FILE_MODE, GENERATE_ENTITY_PAGES]
+        GENERATE_ALL_ENTITY_PAGES = "generate_all_entity_pages"
+        COMPILE_TEMPLATES_MODE = "compile_templates"
+        modes = [UPDATE_TEMPLATES_MODE, CREATE_FILE_MODE, GENERATE_ENTITY_PAGES, GENERATE_ALL_ENTITY_PAGES, COMPILE_TEMPLATES_MODE]
        
         # Setup argument parser
         self.getParser()
@@ -42,15 +49,21 @@ class WikiRender(CmdLineAble):
             # Process arguments
             args = self.parser.parse_args(argv)
             self.debug=args.debug
+            self.initStats(args)
+            self.initParseCache(args)
             if args.mode not in modes:
                 raise Exception(f"Please select of of the operation modes: {modes}")
+            if args.mode == COMPILE_TEMPLATES_MODE:
+                target=self.compileTemplates(args.compiled_templates)
+                print(f"templates compiled to {target}")
+                return 0
+            if args.templates_folder or args.compiled_templates:
+                # update templateEnv
+                self.template_env = self.getTemplateEnv(additional_loader=args.templates_folder, compiled_templates=args.compiled_templates)
             if args.mode == GENERATE_ENTITY_PAGES:
                 # Check if necessary parameters are set
                 if not args.properties_file or not args.topic_file:
                     raise Exception("The parameters --properties and --topics must be defined for this mode")
-                if args.templates_folder:
-                    # update templateEnv
-                    self.template_env = self.getTemplateEnv(additional_loader=args.template_folder)
                 properties_json = ""
                 print(1)
                 with open(args.properties_file) as json_file:
@@ -60,7 +73,20 @@ class WikiRender(CmdLineAble):
                     topic_json = json_file.read()
                 topic = Topic.from_wiki_json(topic_json=topic_json, prop_json=properties_json)
                 # Generate and save the entity pages
-                self.generateTopic(topic, args.backupPath, args.overwrite)
+                manifest = BuildManifest(args.backupPath, debug=self.debug) if args.incremental else None
+                self.generateTopic(topic, args.backupPath, args.overwrite, manifest=manifest)
+            elif args.mode == GENERATE_ALL_ENTITY_PAGES:
+                if not args.properties_file or not args.topic_file:
+                    raise Exception("The parameters --properties and --topics must be defined for this mode")
+                with open(args.topic_file) as json_file:
+                    topic_json = json_file.read()
+                with open(args.properties_file) as json_file:
+                    properties_json = json_file.read()
+                topics = Topic.list_from_wiki_json(topic_json=topic_json, prop_json=properties_json, compact=args.compact)
+                manifest = BuildManifest(args.backupPath, debug=self.debug) if args.incremental else None
+                pageCount=self.generateTopics(topics, args.backupPath, args.overwrite, workers=args.workers, manifest=manifest)
+                if self.debug:
+                    print(f"generated {pageCount} pages for {len(topics)} topics")
             elif args.mode == UPDATE_TEMPLATES_MODE:
                 data = {}
                 if "data_input" in args:
@@ -79,7 +105,7 @@ class WikiRender(CmdLineAble):
             if args.mode == CREATE_FILE_MODE:
                 # ToDo
                 pass
-
+            self.writeStats(args)
 
         except KeyboardInterrupt:
             ### handle keyboard interrupt ###
@@ -95,7 +121,7 @@ class WikiRender(CmdLineAble):
         if self.parser is None:
             raise AttributeError("parser of this object should be defined at this point.")
         self.parser.add_argument("-m", "--mode", dest="mode",
-                                 help="Select a mode.\n\tupdate_templates: updates the wikifiles at the provided location with the provided data\n\tcreate: creates a wikifile with the given data.",
+                                 help="Select a mode.\n\tupdate_templates: updates the wikifiles at the provided location with the provided data\n\tcreate: creates a wikifile with the given data.\n\tgenerate_entity_pages: generates the pages of the topic\n\tgenerate_all_entity_pages: generates the pages of all given topics and their properties\n\tcompile_templates: precompiles the bundled templates (see --compiledTemplates)",
                                  required=True)
         self.parser.add_argument('-ex', '--exclude', dest="exclude_keys",
                             help="List of keys that should be excluded")
@@ -105,20 +131,148 @@ class WikiRender(CmdLineAble):
                                  help='If true template arguments will be overwritten with the given data if present')
         self.parser.add_argument("--templates", dest="templates_folder",
                                  help="Path to additional templates")
+        self.parser.add_argument("--compiledTemplates", dest="compiled_templates",
+                                 help="Path to the precompiled templates (created with the mode compile_templates)")
+        self.parser.add_argument("--workers", dest="workers", type=int, default=1,
+                                 help="Number of processes that render the pages in parallel (mode generate_all_entity_pages)")
+        self.parser.add_argument("--incremental", dest="incremental", action='store_true', default=False,
+                                 help="Only regenerate pages whose topic, properties or templates changed since the last run (recorded in a build manifest in the wikiTextPath)")
+        self.parser.add_argument("--compact", dest="compact", action='store_true', default=False,
+                                 help="Use the slot based compact topic and property records (mode generate_all_entity_pages)")
         self.parser.add_argument("--data", dest="data_input",
                                  help="Json file that should be used as data input")
 
+    # shared template environments by loader configuration
+    templateEnvs={}
+    # name of the file that records the template sources a compiled template module was created from
+    COMPILED_FINGERPRINT_FILE="templates.fingerprint"
+
+    @staticmethod
+    def getTemplateEnv(template_dir: str='/templates', additional_loader=None, compiled_templates:str=None,
+                       bytecode_cache:bool=True):
+        """
+        get the template environment for the given loader configuration.
+        The environment is created once per process and shared by all WikiRender instances.
+
+        Args:
+            template_dir(str): directory of the bundled templates relative to the package root
+            additional_loader(str): path to additional templates that take precedence over the bundled ones
+            compiled_templates(str): path to the precompiled bundled templates see compileTemplates() - only used if they are up to date
+            bytecode_cache(bool): If True the bytecode of compiled templates is cached on disk
+
+        Returns:
+            jinja2.Environment
+        """
+        key=(template_dir, additional_loader, compiled_templates, bytecode_cache)
+        templateEnv=WikiRender.templateEnvs.get(key)
+        if templateEnv is None:
+            loader = []
+            if additional_loader is not None:
+                loader.append(jinja2.FileSystemLoader(searchpath=additional_loader))
+            script_dir = os.path.dirname(wikifile.__file__) + "/.."
+            if compiled_templates is not None:
+                if WikiRender.isCompiledUpToDate(compiled_templates, script_dir + template_dir):
+                    loader.append(jinja2.ModuleLoader(compiled_templates))
+                else:
+                    warnings.warn(f"compiled templates at {compiled_templates} are outdated or missing - using the template sources")
+            loader.append(jinja2.FileSystemLoader(script_dir + template_dir))
+            loader.append(jinja2.ModuleLoader(get_python_lib() + template_dir))
+            templateLoader = jinja2.ChoiceLoader(loader)
+            bytecodeCache=WikiRender.getBytecodeCache() if bytecode_cache else None
+            templateEnv = jinja2.Environment(loader=templateLoader, bytecode_cache=bytecodeCache)
+            templateEnv = WikiRender.extend_template_env(templateEnv)
+            WikiRender.templateEnvs[key]=templateEnv
+        return templateEnv
+
+    @staticmethod
+    def getCacheDir() -> str:
+        """
+        get the directory for the cached/compiled templates
+
+        Returns:
+            str: the path of the cache directory
+        """
+        home = os.path.expanduser("~")
+        return f"{home}/.wikirender"
+
     @staticmethod
-    def getTemplateEnv(template_dir: str='/templates', additional_loader=None):
-        loader = []
-        if additional_loader is not None:
-            loader.append(jinja2.FileSystemLoader(searchpath=additional_loader))
-        script_dir = os.path.dirname(wikifile.__file__) + "/.."
-        loader.append(jinja2.FileSystemLoader(script_dir + template_dir))
-        loader.append(jinja2.ModuleLoader(get_python_lib() + template_dir))
-        templateLoader = jinja2.ChoiceLoader(loader)
-        templateEnv = jinja2.Environment(loader=templateLoader)
-        return WikiRender.extend_template_env(templateEnv)
+    def getBytecodeCache():
+        """
+        get a bytecode cache for the templates in the cache directory
+
+        Returns:
+            jinja2.FileSystemBytecodeCache or None if the cache directory is not writable
+        """
+        cacheDir=f"{WikiRender.getCacheDir()}/bytecode"
+        try:
+            os.makedirs(cacheDir, exist_ok=True)
+        except OSError as ex:
+            warnings.warn(f"template bytecode cache disabled: {ex}")
+            return None
+        return jinja2.FileSystemBytecodeCache(directory=cacheDir)
+
+    @staticmethod
+    def getTemplatesFingerprint(template_path:str) -> str:
+        """
+        get a fingerprint of the template sources located at the given path
+
+        Args:
+            template_path(str): root directory of the templates
+
+        Returns:
+            str: hex digest over the names and contents of all templates
+        """
+        fingerprint=hashlib.sha1()
+        for root, dirs, files in os.walk(template_path):
+            dirs.sort()
+            for fileName in sorted(files):
+                if fileName.endswith(".jinja"):
+                    filePath=os.path.join(root, fileName)
+                    fingerprint.update(os.path.relpath(filePath, template_path).encode())
+                    with open(filePath, mode="rb") as templateFile:
+                        fingerprint.update(templateFile.read())
+        return fingerprint.hexdigest()
+
+    @staticmethod
+    def isCompiledUpToDate(compiled_templates:str, template_path:str) -> bool:
+        """
+        Checks if the compiled templates were created from the current template sources
+
+        Args:
+            compiled_templates(str): path to the compiled templates
+            template_path(str): root directory of the template sources
+
+        Returns:
+            True if the compiled templates can be used
+        """
+        fingerprintFile=os.path.join(compiled_templates, WikiRender.COMPILED_FINGERPRINT_FILE)
+        if not os.path.isfile(fingerprintFile):
+            return False
+        with open(fingerprintFile) as file:
+            return file.read().strip() == WikiRender.getTemplatesFingerprint(template_path)
+
+    @staticmethod
+    def compileTemplates(target:str=None, template_dir:str='/templates') -> str:
+        """
+        precompile the bundled templates (including the macros) into python modules that are loaded instead of the
+        template sources see getTemplateEnv(compiled_templates=...)
+
+        Args:
+            target(str): directory the compiled templates are stored in - default is the compiled folder of the cache directory
+            template_dir(str): directory of the bundled templates relative to the package root
+
+        Returns:
+            str: the path of the compiled templates
+        """
+        if target is None:
+            target=f"{WikiRender.getCacheDir()}/compiled"
+        template_path=os.path.dirname(wikifile.__file__) + "/.." + template_dir
+        templateEnv=WikiRender.extend_template_env(jinja2.Environment(loader=jinja2.FileSystemLoader(template_path)))
+        os.makedirs(target, exist_ok=True)
+        templateEnv.compile_templates(target, zip=None, filter_func=lambda name: name.endswith(".jinja"), ignore_errors=False)
+        with open(os.path.join(target, WikiRender.COMPILED_FINGERPRINT_FILE), mode="w") as file:
+            file.write(WikiRender.getTemplatesFingerprint(template_path))
+        return target
 
     @staticmethod
     def extend_template_env(template_env):
@@ -129,7 +283,9 @@ class WikiRender(CmdLineAble):
         template_env.globals['ListOf'] = ListOf
         template_env.globals['Query'] = Query
         template_env.globals['UML'] = UML
+        template_env.globals['MetaModelGraph'] = MetaModelGraph
         template_env.globals['Property'] = Property
+        template_env.globals['PropertyIndex'] = PropertyIndex
         template_env.globals['Topic'] = Topic
         template_env.globals['Context'] = Context
         template_env.globals['TemplatePage'] = TemplatePage
@@ -161,23 +317,157 @@ class WikiRender(CmdLineAble):
         if exclude_keys is not None:
             data = {x: data[x] for x in data if x not in exclude_keys}
         try:
-            template_template = self.template_env.get_template("template.jinja")
-            return template_template.render(name=template_name, properties=data)
+            with Stats.getInstance().timer("render.template.jinja"):
+                template_template = self.template_env.get_template("template.jinja")
+                return template_template.render(name=template_name, properties=data)
         except Exception as e:
             print(e)
         return None
 
-    def generateTopic(self, topic: Topic, path: str, overwrite:bool=False, withProperties:bool=True, **templates):
+    def generateTopic(self, topic: Topic, path: str, overwrite:bool=False, withProperties:bool=True,
+                      manifest:BuildManifest=None, **templates):
         """
         Generate all technical pages of the given topic and save them as wiki page at the given path
         Args:
             topic: topic for which the pages should be generated
             path: path to the location where the pages should be stored
             overwrite: If true the generated pages will overwrite existing pages. Otherwise only missing pages will be stored
+            manifest: If given only pages whose inputs changed since the recorded build are regenerated
             template: widgets to overwrite the jinja templates
         """
+        if templates:
+            # the widgets can not be fingerprinted
+            manifest=None
+        jobs=[topic]
+        if withProperties:
+            jobs.extend(topic.properties)
+        # fingerprint all jobs before the rendering (as in generateTopics)
+        fingerprints={id(job):self.getJobFingerprint(job) for job in jobs} if manifest is not None else {}
+        for job in jobs:
+            fingerprint=fingerprints.get(id(job))
+            if isinstance(job, (Topic, CompactTopic)):
+                self.generateJob(job, path, overwrite, manifest, lambda: self.renderTopic(topic, **templates), fingerprint=fingerprint)
+            else:
+                self.generateJob(job, path, overwrite, manifest, fingerprint=fingerprint)
+        if manifest is not None:
+            manifest.save()
+
+    def generateJob(self, job, path:str, overwrite:bool=False, manifest:BuildManifest=None, render=None,
+                    fingerprint:str=None) -> int:
+        """
+        Generate the pages of the given topic or property unless the manifest records them as up to date
+        Args:
+            job: Topic or Property for which the pages should be generated
+            path: path to the location where the pages should be stored
+            overwrite: If true the generated pages will overwrite existing pages
+            manifest: the build manifest of the path
+            render: function rendering the pages - default is renderJob()
+            fingerprint: the fingerprint of the job - default is getJobFingerprint(job)
+
+        Returns:
+            int: number of rendered pages
+        """
+        if manifest is not None:
+            if fingerprint is None:
+                fingerprint=self.getJobFingerprint(job)
+            if manifest.isUpToDate(self.getJobPageTitles(job), fingerprint, overwrite=overwrite):
+                if self.debug:
+                    print(f"pages of {job.name} are up to date")
+                return 0
+        pages=render() if render is not None else WikiRender.renderJob(job, self)
+        self.savePages(pages, path, overwrite, manifest, fingerprint)
+        return len(pages)
+
+    def savePages(self, pages:dict, path:str, overwrite:bool=False, manifest:BuildManifest=None, fingerprint:str=None):
+        """
+        save the given pages and record them in the given manifest.
+        Existing pages that are kept (overwrite=False) are recorded as kept so that they are only generated again
+        by a run with overwrite (see BuildManifest.isUpToDate)
+        """
+        for pageTitle, page in pages.items():
+            saved=WikiFile.write_to_file(path, pageTitle, page, overwrite=overwrite)
+            if manifest is not None:
+                manifest.update([pageTitle], fingerprint, kept=not saved)
+
+    def getRenderFingerprint(self) -> str:
+        """
+        get the fingerprint of the template sources of my template environment and the python code used by the templates
+
+        Returns:
+            str: hex digest of the sources
+        """
+        if getattr(self.template_env, "renderFingerprint", None) is None:
+            sources=[]
+            loaders=getattr(self.template_env.loader, "loaders", [self.template_env.loader])
+            for loader in loaders:
+                try:
+                    templateNames=loader.list_templates()
+                except TypeError:
+                    # e.g. ModuleLoader of the compiled templates - these match the bundled template sources
+                    continue
+                for templateName in templateNames:
+                    source, _filename, _uptodate=loader.get_source(self.template_env, templateName)
+                    sources.append((templateName, source))
+            for module in [wikifile.smw, wikifile.metamodel, wikifile.utils, sys.modules[__name__]]:
+                with open(module.__file__) as file:
+                    sources.append((module.__name__, file.read()))
+            self.template_env.renderFingerprint=BuildManifest.getFingerprint(sources)
+        return self.template_env.renderFingerprint
+
+    # attributes the rendering completes (see Form.get_form_field) with the value they are completed with
+    RENDER_DEFAULTS={"inputType":"text"}
+
+    @staticmethod
+    def getJobInputs(job) -> dict:
+        """
+        get the declared fields (propList) of the given topic (with the fields of its properties) or property.
+        Fields that are completed by the rendering are normalized with RENDER_DEFAULTS so that the inputs of a job
+        do not change by rendering it.
+
+        Returns:
+            dict: the field values by name
+        """
+        inputs={}
+        for name in list(job.propList)+["template"]:
+            value=getattr(job, name, None)
+            if value is None:
+                value=WikiRender.RENDER_DEFAULTS.get(name)
+            inputs[name]=value
+        if isinstance(job, (Topic, CompactTopic)):
+            inputs["templateParamMapping"]=job.templateParamMapping
+            inputs["properties"]=[WikiRender.getJobInputs(property) for property in job.properties or []]
+        return inputs
+
+    def getJobFingerprint(self, job) -> str:
+        """
+        get the fingerprint of the inputs of the pages of the given topic (with its properties) or property
+        """
+        return BuildManifest.getFingerprint(self.getRenderFingerprint(), job.__class__.__name__, WikiRender.getJobInputs(job))
+
+    @staticmethod
+    def getJobPageTitles(job) -> list:
+        """
+        get the titles of the pages that are generated for the given topic or property
+        """
+        if isinstance(job, (Topic, CompactTopic)):
+            return [smwPart.get_page_name(job) for smwPart in SMWPart.getAll(None).values()]
+        return [job.get_pageTitle(withNamespace=True)]
+
+    def renderTopic(self, topic: Topic, **templates) -> dict:
+        """
+        Render all technical pages of the given topic
+        Args:
+            topic: topic for which the pages should be rendered
+            template: widgets to overwrite the jinja templates
+
+        Returns:
+            dict: rendered pages by pageTitle
+        """
         if self.debug:
             print(f"generating topic {topic.name}")
+        pages={}
+        # the properties of the topic are indexed once for all pages
+        propertyIndex=PropertyIndex(topic.properties)
         for part, smwPart in SMWPart.getAll(self).items():
             if self.debug:
                 print(f"generating {smwPart.get_page_name(topic)}")
@@ -187,19 +477,134 @@ class WikiRender(CmdLineAble):
                 if issubclass(templateWidget, Widget) and callable(templateWidget):   # update to intermediate widget class
                     page=templateWidget(topic)
             else:
-                page = smwPart.render_page(topic)
-            WikiFile.write_to_file(path, smwPart.get_page_name(topic),page, overwrite=overwrite)
-        if withProperties:
-            for prop in topic.properties:
-                self.generateProperty(prop, path=path, overwrite=overwrite)
+                page = smwPart.render_page(topic, property_index=propertyIndex)
+            pages[smwPart.get_page_name(topic)]=page
+        return pages
+
+    def generateProperty(self, property:Property, path:str, overwrite:bool=False, manifest:BuildManifest=None):
+        self.generateJob(property, path, overwrite, manifest)
+        if manifest is not None:
+            manifest.save()
+
+    def renderProperty(self, property:Property):
+        """
+        Render the page of the given property
+        Args:
+            property: property for which the page should be rendered
 
-    def generateProperty(self, property:Property, path:str, overwrite:bool=False):
+        Returns:
+            tuple: pageTitle and rendered page
+        """
         if self.debug:
             print(f"generating property {property.name}")
-        # generate property page
-        template_template = self.template_env.get_template(property.template)
-        page = template_template.render(property=property)
-        WikiFile.write_to_file(path, property.get_pageTitle(withNamespace=True), page, overwrite=overwrite)
+        with Stats.getInstance().timer(f"render.{property.template}"):
+            template_template = self.template_env.get_template(property.template)
+            page = template_template.render(property=property)
+        return property.get_pageTitle(withNamespace=True), page
+
+    def generateTopics(self, topics: list, path: str, overwrite:bool=False, withProperties:bool=True, workers:int=1,
+                       manifest:BuildManifest=None) -> int:
+        """
+        Generate the technical pages of all given topics (e.g. of a complete context) and save them as wiki pages at
+        the given path. Properties that are used by multiple topics are only generated once.
+        Args:
+            topics: topics for which the pages should be generated
+            path: path to the location where the pages should be stored
+            overwrite: If true the generated pages will overwrite existing pages. Otherwise only missing pages will be stored
+            withProperties: If true the property pages are also generated
+            workers: number of processes that render the pages in parallel
+            manifest: If given only pages whose inputs changed since the recorded build are regenerated
+
+        Returns:
+            int: number of generated pages
+        """
+        jobs=[topic for topic in topics]
+        if withProperties:
+            properties={}
+            for topic in topics:
+                for prop in topic.properties or []:
+                    properties.setdefault(prop.get_pageTitle(withNamespace=True), prop)
+            jobs.extend(properties.values())
+        fingerprints={}
+        if manifest is not None:
+            outdatedJobs=[]
+            for job in jobs:
+                fingerprint=self.getJobFingerprint(job)
+                if not manifest.isUpToDate(self.getJobPageTitles(job), fingerprint, overwrite=overwrite):
+                    fingerprints[id(job)]=fingerprint
+                    outdatedJobs.append(job)
+            if self.debug:
+                print(f"{len(jobs)-len(outdatedJobs)} of {len(jobs)} topics/properties are up to date")
+            jobs=outdatedJobs
+        templateEnvKey=None
+        if workers > 1:
+            templateEnvKey=next((key for key, env in WikiRender.templateEnvs.items() if env is self.template_env), None)
+            if templateEnvKey is None:
+                warnings.warn("the template environment can not be recreated in worker processes - rendering serially")
+        if workers > 1 and templateEnvKey is not None and len(jobs) > 1:
+            chunksize=max(1, len(jobs)//(workers*4))
+            stats=Stats.getInstance()
+            task=WikiRender.renderJobWithStats if stats.enabled else WikiRender.renderJob
+            with ProcessPoolExecutor(max_workers=workers, initializer=WikiRender.initWorker, initargs=(templateEnvKey, self.debug)) as executor:
+                renderedJobs=list(executor.map(task, jobs, chunksize=chunksize))
+            if stats.enabled:
+                # merge the statistics of the worker processes
+                for _pages, workerStats in renderedJobs:
+                    stats.merge(workerStats)
+                renderedJobs=[pages for pages, _workerStats in renderedJobs]
+        else:
+            renderedJobs=[WikiRender.renderJob(job, self) for job in jobs]
+        pageCount=0
+        for job, pages in zip(jobs, renderedJobs):
+            self.savePages(pages, path, overwrite, manifest, fingerprints.get(id(job)))
+            pageCount+=len(pages)
+        if manifest is not None:
+            manifest.save()
+        return pageCount
+
+    # WikiRender of a worker process see initWorker()
+    workerRender=None
+
+    @staticmethod
+    def initWorker(templateEnvKey:tuple, debug:bool=False):
+        """
+        initialize the WikiRender of a worker process with the template environment of the given key
+        """
+        template_dir, additional_loader, compiled_templates, bytecode_cache=templateEnvKey
+        templateEnv=WikiRender.getTemplateEnv(template_dir, additional_loader, compiled_templates, bytecode_cache)
+        WikiRender.workerRender=WikiRender(template_env=templateEnv, debug=debug)
+
+    @staticmethod
+    def renderJob(job, wikiRender:'WikiRender'=None) -> dict:
+        """
+        render the pages of the given topic or property
+        Args:
+            job: Topic or Property that should be rendered
+            wikiRender: WikiRender to use - default is the WikiRender of the worker process
+
+        Returns:
+            dict: rendered pages by pageTitle
+        """
+        if wikiRender is None:
+            wikiRender=WikiRender.workerRender
+        if isinstance(job, (Topic, CompactTopic)):
+            return wikiRender.renderTopic(job)
+        pageTitle, page=wikiRender.renderProperty(job)
+        return {pageTitle:page}
+
+    @staticmethod
+    def renderJobWithStats(job) -> tuple:
+        """
+        task of a worker process - renders the pages of the given topic or property (see renderJob) and returns the statistics of the rendering
+
+        Returns:
+            tuple: rendered pages by pageTitle and the statistics (see Stats.asDict())
+        """
+        stats=Stats.getInstance()
+        stats.enable()
+        stats.reset()
+        pages=WikiRender.renderJob(job)
+        return pages, stats.asDict()
 
     def update_or_create_templates(self,
                                    data: list,